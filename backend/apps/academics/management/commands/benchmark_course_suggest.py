@@ -0,0 +1,90 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from apps.academics.models import Course, Department
+from apps.academics.suggest import DEFAULT_LIMIT, CourseIndex, words
+
+SUBJECTS = ['Introduction to', 'Advanced', 'Topics in', 'Applied', 'Principles of', 'Seminar in']
+FIELDS = [
+    'Algorithms', 'Organic Chemistry', 'Microeconomics', 'Painting', 'Statistics', 'Thermodynamics',
+    'Linguistics', 'Ethics', 'Databases', 'Genetics', 'Accounting', 'Sculpture', 'Robotics', 'Poetry',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare course type-ahead through the in-process prefix index with the '
+        'icontains search of the course list. Synthetic courses are created in '
+        'a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--courses',
+            type=int,
+            default=5000,
+            help='Number of synthetic courses added to the catalog (default: 5000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=200,
+            help='Times each query is run (default: 200)'
+        )
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        with transaction.atomic():
+            self.create_courses(max(0, options['courses']))
+            index = CourseIndex()
+            start = time.perf_counter()
+            index.build()
+            courses = len(index.data[0])
+            self.stdout.write(f'Built the index of {courses:,} courses in {(time.perf_counter() - start) * 1000:.1f}ms')
+
+            self.stdout.write(self.style.SUCCESS(
+                f'=== Top {DEFAULT_LIMIT} suggestions, {repeat} runs each '
+                f'(median ms: first ranking / repeated query / icontains) ==='
+            ))
+            for query in ['a', 'al', 'alg', 'bench1', 'bench 12', 'intro alg', 'fine arts', 'zzyzx']:
+                prefixes = tuple(sorted(set(words(query))))
+                rank_ms = self.time(repeat, lambda: index.rank(index.data, prefixes))
+                cached_ms = self.time(repeat, lambda: index.search(query, DEFAULT_LIMIT))
+                database_ms = self.time(max(1, repeat // 10), lambda: self.icontains(query))
+                self.stdout.write(f'{query!r:<14} {rank_ms:8.3f} / {cached_ms:8.3f} / {database_ms:8.3f}')
+            transaction.set_rollback(True)
+
+    def create_courses(self, count):
+        rng = random.Random(count)
+        departments = list(Department.objects.all()) or [None]
+        Course.objects.bulk_create([
+            Course(
+                course_id=f'BENCH{number}',
+                course_name=f'{rng.choice(SUBJECTS)} {rng.choice(FIELDS)}',
+                department=rng.choice(departments),
+                description=' '.join(rng.choices(FIELDS, k=12)),
+                level=rng.choice(['Undergraduate', 'Graduate']),
+            )
+            for number in range(count)
+        ], batch_size=1000)
+
+    def icontains(self, query):
+        """What ?search= on the course list runs for the first page"""
+        condition = Q()
+        for word in query.split():
+            condition &= (
+                Q(course_id__icontains=word) | Q(course_name__icontains=word) | Q(description__icontains=word)
+            )
+        return list(Course.objects.select_related('department').filter(condition)[:DEFAULT_LIMIT])
+
+    def time(self, repeat, function):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,221 @@
+import multiprocessing
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.users.models import User, StudentProfile
+from apps.academics.models import Course, Section, Enrollment, WaitlistEntry
+
+PREFIX = 'BENCHREG'
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulate registration opening: thousands of students enroll in one popular '
+        'section at once through the enroll/drop endpoints, from concurrent worker '
+        'processes. Checks that the section is never oversold. The synthetic students '
+        'and section are committed, since every worker uses its own connection, and '
+        'deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--students',
+            type=int,
+            default=2000,
+            help='Number of students trying to register (default: 2000)'
+        )
+        parser.add_argument(
+            '--capacity',
+            type=int,
+            default=100,
+            help='Seats in the section (default: 100)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent client processes, each like one application worker (default: 8)'
+        )
+        parser.add_argument(
+            '--drop-rate',
+            type=float,
+            default=0.1,
+            help='Share of successful students who drop again right away (default: 0.1)'
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=2,
+            help='Times a student turned away by a full section tries again (default: 2)'
+        )
+        parser.add_argument(
+            '--waitlist',
+            action='store_true',
+            help='Students turned away join the waitlist instead of retrying, and drops promote from it'
+        )
+
+    def handle(self, *args, **options):
+        students = max(1, options['students'])
+        capacity = max(1, options['capacity'])
+        workers = max(1, options['workers'])
+        self.drop_rate = options['drop_rate']
+        self.retries = max(0, options['retries'])
+        self.waitlist = options['waitlist']
+
+        self.cleanup()
+        try:
+            self.section = self.create_section(capacity)
+            users = self.create_students(students)
+            # Workers are forked and must open their own connections
+            connections.close_all()
+
+            context = multiprocessing.get_context('fork')
+            # Everyone waits for registration to open, then all workers start together
+            opening = context.Barrier(workers)
+            results = context.SimpleQueue()
+            processes = [
+                context.Process(target=self.run_client, args=(users[number::workers], number, opening, results))
+                for number in range(workers)
+            ]
+            started = time.perf_counter()
+            for process in processes:
+                process.start()
+            collected = [results.get() for _ in processes]
+            elapsed = time.perf_counter() - started
+            for process in processes:
+                process.join()
+
+            outcomes, timings = Counter(), {'enroll': [], 'waitlist': [], 'drop': []}
+            for worker_outcomes, worker_timings in collected:
+                outcomes.update(worker_outcomes)
+                for kind, values in worker_timings.items():
+                    timings[kind].extend(values)
+            self.report(students, capacity, workers, elapsed, outcomes, timings)
+        finally:
+            self.cleanup()
+
+    def create_section(self, capacity):
+        course = Course.objects.create(
+            course_id=f'{PREFIX}101',
+            course_name='Registration Load Test',
+            description='Synthetic course created by load_test_registration',
+            level='Undergraduate',
+        )
+        return Section.objects.create(
+            section_id=f'{PREFIX}SEC',
+            course=course,
+            section_number='001',
+            semester='Fall 2025',
+            year=2025,
+            instructor_name='Load Test',
+            instructor_rank='Lecturer',
+            meeting_days='MWF',
+            meeting_time='09:00-10:00',
+            capacity=capacity,
+        )
+
+    def create_students(self, count):
+        emails = [f'{PREFIX.lower()}-{number}@example.invalid' for number in range(count)]
+        User.objects.bulk_create([
+            User(username=email, email=email, password='!', first_name='Student', last_name=str(number),
+                 role='student')
+            for number, email in enumerate(emails)
+        ], batch_size=1000)
+        users = list(User.objects.filter(email__in=emails))
+        StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=user,
+                student_id=f'{PREFIX}{number:06d}',
+                enrollment_date=date.today(),
+                major='Load Test',
+                year_level='Freshman',
+                emergency_contact='Load Test',
+                emergency_phone='000-000-0000',
+            )
+            for number, user in enumerate(users)
+        ], batch_size=1000)
+        return users
+
+    def run_client(self, users, number, opening, results):
+        """One worker process: register ``users`` one after another"""
+        rng = random.Random(number)
+        url = f'/api/academics/sections/{self.section.section_id}/'
+        client = APIClient()
+        outcomes, timings = Counter(), {'enroll': [], 'waitlist': [], 'drop': []}
+        pending = [(user, self.retries) for user in users]
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                opening.wait()
+                while pending:
+                    user, retries = pending.pop(0)
+                    client.force_authenticate(user)
+                    response = self.post(client, url + 'enroll/', 'enroll', outcomes, timings)
+                    if response.status_code == 201:
+                        if rng.random() < self.drop_rate:
+                            self.post(client, url + 'drop/', 'drop', outcomes, timings)
+                    elif response.status_code == 409 and self.waitlist:
+                        self.post(client, url + 'waitlist/', 'waitlist', outcomes, timings)
+                    elif response.status_code == 409 and retries:
+                        # Turned away: try again later in case someone drops
+                        pending.append((user, retries - 1))
+        finally:
+            results.put((outcomes, timings))
+            connections.close_all()
+
+    def post(self, client, url, kind, outcomes, timings):
+        started = time.perf_counter()
+        response = client.post(url)
+        timings[kind].append((time.perf_counter() - started) * 1000)
+        outcomes[f'{kind} {response.status_code}'] += 1
+        return response
+
+    def report(self, students, capacity, workers, elapsed, outcomes, timings):
+        section = Section.objects.get(pk=self.section.pk)
+        active = Enrollment.objects.filter(section=section, status='Enrolled').count()
+        requests = sum(len(values) for values in timings.values())
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {students} students, {capacity} seats, {workers} workers: '
+            f'{requests} requests in {elapsed:.2f}s ({requests / elapsed:,.0f} requests/sec) ==='
+        ))
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f'{outcome:<12} {count:>7}')
+        for kind, values in timings.items():
+            if values:
+                values.sort()
+                p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+                self.stdout.write(
+                    f'{kind:<6} median {statistics.median(values):7.2f} ms, p95 {p95:7.2f} ms, '
+                    f'max {values[-1]:7.2f} ms'
+                )
+        self.stdout.write(f'Seats taken: enrolled counter {section.enrolled}, active enrollments {active}')
+
+        if section.enrolled != active or active > capacity:
+            raise CommandError(f'Seat accounting broken: counter {section.enrolled}, '
+                               f'{active} active enrollments, capacity {capacity}')
+        tickets = list(WaitlistEntry.objects.filter(section=section).order_by('ticket').values_list('ticket', flat=True))
+        self.stdout.write(f'Waitlist: {len(tickets)} waiting, {section.waitlist_offset} promoted or skipped')
+        if tickets != list(range(section.waitlist_offset + 1, section.waitlist_offset + len(tickets) + 1)):
+            raise CommandError('Waitlist positions are not contiguous from 1')
+        if WaitlistEntry.objects.filter(section=section, student__enrollments__section=section,
+                                        student__enrollments__status='Enrolled').exists():
+            raise CommandError('A student is both enrolled and waitlisted')
+        errors = sum(count for outcome, count in outcomes.items() if outcome.endswith(('500', '503')))
+        if errors:
+            raise CommandError(f'{errors} requests failed with a server error')
+        self.stdout.write(self.style.SUCCESS('No section was oversold'))
+
+    def cleanup(self):
+        """Delete the synthetic data, including what an interrupted run left behind"""
+        WaitlistEntry.objects.filter(section__section_id__startswith=PREFIX).delete()
+        Enrollment.objects.filter(section__section_id__startswith=PREFIX).delete()
+        Section.objects.filter(section_id__startswith=PREFIX).delete()
+        Course.objects.filter(course_id__startswith=PREFIX).delete()
+        User.objects.filter(email__startswith=f'{PREFIX.lower()}-', email__endswith='@example.invalid').delete()
@@ -0,0 +1,14 @@
+import time
+from django.core.management.base import BaseCommand
+
+from apps.academics.models import TermGPA
+
+
+class Command(BaseCommand):
+    help = 'Recompute term and cumulative GPAs of every student from their graded enrollments'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = TermGPA.refresh()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Recomputed GPAs for {count} students in {elapsed:.2f}s'))
@@ -0,0 +1,14 @@
+import time
+from django.core.management.base import BaseCommand
+
+from apps.academics.models import Section
+
+
+class Command(BaseCommand):
+    help = 'Reset the enrolled count of every section to its number of active enrollments'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = Section.recount_enrolled()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Recounted seats of {count} sections in {elapsed:.2f}s'))
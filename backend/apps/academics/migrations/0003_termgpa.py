@@ -0,0 +1,78 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:01
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+
+def grade_point_average(quality_points, gpa_credits):
+    average = Cast(
+        Cast(quality_points, models.FloatField()) / NullIf(gpa_credits, 0),
+        models.DecimalField(max_digits=12, decimal_places=6)
+    )
+    return Coalesce(
+        Round(average, 2),
+        Decimal('0.00'),
+        output_field=models.DecimalField(max_digits=3, decimal_places=2)
+    )
+
+
+def compute_gpas(apps, schema_editor):
+    Enrollment = apps.get_model('academics', 'Enrollment')
+    TermGPA = apps.get_model('academics', 'TermGPA')
+    StudentProfile = apps.get_model('users', 'StudentProfile')
+
+    totals = Enrollment.objects.exclude(grade='').values('student_id', 'semester').annotate(
+        quality_points=Coalesce(
+            Sum(F('grade_points') * F('course__credits'),
+                output_field=models.DecimalField(max_digits=8, decimal_places=2)),
+            Decimal('0.00')
+        ),
+        gpa_credits=Coalesce(Sum('course__credits', filter=~Q(grade__in=['W', 'I'])), 0),
+        credits_earned=Coalesce(Sum('credits_earned'), 0),
+    ).annotate(
+        gpa=grade_point_average(F('quality_points'), F('gpa_credits'))
+    ).order_by()
+    TermGPA.objects.bulk_create([TermGPA(**row) for row in totals], batch_size=1000)
+
+    student_terms = TermGPA.objects.filter(student=OuterRef('pk')).values('student')
+    StudentProfile.objects.update(
+        gpa_credits=Coalesce(Subquery(
+            student_terms.annotate(total=Sum('gpa_credits')).values('total')
+        ), 0),
+        gpa=Coalesce(Subquery(
+            student_terms.annotate(
+                total=grade_point_average(Sum('quality_points'), Sum('gpa_credits'))
+            ).values('total')
+        ), Decimal('0.00')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0002_initial'),
+        ('users', '0003_studentprofile_gpa_credits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermGPA',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=20)),
+                ('quality_points', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('gpa_credits', models.IntegerField(default=0)),
+                ('credits_earned', models.IntegerField(default=0)),
+                ('gpa', models.DecimalField(decimal_places=2, default=0.0, max_digits=3)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_gpas', to='users.studentprofile')),
+            ],
+            options={
+                'ordering': ['student', 'semester'],
+                'unique_together': {('student', 'semester')},
+            },
+        ),
+        migrations.RunPython(compute_gpas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0003_termgpa'),
+        ('users', '0003_studentprofile_gpa_credits'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['-enrollment_date', '-enrollment_id'], name='enrollment_date_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', '-enrollment_date', '-enrollment_id'], name='enrollment_student_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['section', '-enrollment_date', '-enrollment_id'], name='enrollment_section_keyset'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0004_enrollment_enrollment_date_keyset_and_more'),
+        ('facilities', '0001_initial'),
+        ('users', '0004_statelessuser_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['course', '-enrollment_date', '-enrollment_id'], name='enrollment_course_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['semester', '-enrollment_date', '-enrollment_id'], name='enrollment_semester_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['status', '-enrollment_date', '-enrollment_id'], name='enrollment_status_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['semester', 'enrollment_id'], name='enrollment_semester_order'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['semester', 'course'], name='section_semester_course'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['year', 'semester', 'course'], name='section_year_order'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['status', 'semester', 'course'], name='section_status_order'),
+        ),
+    ]
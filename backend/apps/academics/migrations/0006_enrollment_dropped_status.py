@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_enrollment_enrollment_course_keyset_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enrollment',
+            name='status',
+            field=models.CharField(choices=[('Enrolled', 'Enrolled'), ('Dropped', 'Dropped'), ('Withdrawn', 'Withdrawn'), ('Completed', 'Completed')], default='Enrolled', max_length=20),
+        ),
+    ]
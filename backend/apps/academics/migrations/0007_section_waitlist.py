@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-18 00:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0006_enrollment_dropped_status'),
+        ('users', '0005_user_user_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='waitlist_offset',
+            field=models.IntegerField(default=0, help_text="Waitlist tickets served so far; a waiting student's position is their ticket minus this"),
+        ),
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket', models.IntegerField()),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='academics.section')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='users.studentprofile')),
+            ],
+            options={
+                'ordering': ['section', 'ticket'],
+                'indexes': [models.Index(fields=['section', 'ticket'], name='waitlist_section_ticket')],
+                'unique_together': {('section', 'student')},
+            },
+        ),
+    ]
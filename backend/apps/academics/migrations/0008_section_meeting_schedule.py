@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-18 00:48
+
+from django.db import migrations, models
+from apps.academics.schedule import parse_meeting
+
+
+def parse_schedules(apps, schema_editor):
+    Section = apps.get_model('academics', 'Section')
+    sections = list(Section.objects.only('meeting_days', 'meeting_time'))
+    for section in sections:
+        section.meeting_day_mask, section.meeting_start, section.meeting_end = parse_meeting(
+            section.meeting_days, section.meeting_time
+        )
+    Section.objects.bulk_update(sections, ['meeting_day_mask', 'meeting_start', 'meeting_end'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0007_section_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='meeting_day_mask',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Meeting weekdays, bit 0 for Monday; 0 when unscheduled'),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='meeting_end',
+            field=models.PositiveSmallIntegerField(editable=False, help_text='Minutes after midnight', null=True),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='meeting_start',
+            field=models.PositiveSmallIntegerField(editable=False, help_text='Minutes after midnight', null=True),
+        ),
+        migrations.RunPython(parse_schedules, migrations.RunPython.noop),
+    ]
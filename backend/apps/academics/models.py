@@ -1,6 +1,13 @@
-from django.db import models
+from decimal import Decimal
+from django.db import connection, models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
 from apps.users.models import User, StudentProfile, FacultyProfile
 from apps.facilities.models import Room
+from apps.core.models import TableVersion
+from .schedule import parse_meeting
 
 
 class Department(models.Model):
@@ -74,21 +81,65 @@ class Section(models.Model):
     instructor_rank = models.CharField(max_length=50)
     meeting_days = models.CharField(max_length=20)
     meeting_time = models.CharField(max_length=50)
+    # Parsed from meeting_days and meeting_time for clash checks (see schedule.py)
+    meeting_day_mask = models.PositiveSmallIntegerField(
+        default=0, editable=False, help_text='Meeting weekdays, bit 0 for Monday; 0 when unscheduled'
+    )
+    meeting_start = models.PositiveSmallIntegerField(null=True, editable=False, help_text='Minutes after midnight')
+    meeting_end = models.PositiveSmallIntegerField(null=True, editable=False, help_text='Minutes after midnight')
     room = models.ForeignKey(Room, on_delete=models.SET_NULL, null=True, blank=True, related_name='sections')
     capacity = models.IntegerField(default=30)
     enrolled = models.IntegerField(default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Open')
+    waitlist_offset = models.IntegerField(
+        default=0,
+        help_text="Waitlist tickets served so far; a waiting student's position is their ticket minus this"
+    )
 
     class Meta:
         ordering = ['semester', 'course']
+        # Filters of the sections endpoint, each followed by the default ordering
+        indexes = [
+            models.Index(fields=['semester', 'course'], name='section_semester_course'),
+            models.Index(fields=['year', 'semester', 'course'], name='section_year_order'),
+            models.Index(fields=['status', 'semester', 'course'], name='section_status_order'),
+        ]
 
     def __str__(self):
         return f"{self.course.course_id} - {self.section_number} ({self.semester})"
 
+    def apply_schedule(self):
+        """Derive the parsed meeting days and times from their text"""
+        self.meeting_day_mask, self.meeting_start, self.meeting_end = parse_meeting(
+            self.meeting_days, self.meeting_time
+        )
+
+    def save(self, *args, **kwargs):
+        self.apply_schedule()
+        super().save(*args, **kwargs)
+
     @property
     def is_full(self):
         return self.enrolled >= self.capacity
 
+    @classmethod
+    def recount_enrolled(cls, section_ids=None):
+        """
+        Reset ``enrolled`` to the number of active enrollments, for the given
+        sections or for all of them. Registration keeps the counter current;
+        this repairs it after bulk writes such as an import.
+        """
+        sections = cls.objects.all()
+        if section_ids is not None:
+            sections = sections.filter(pk__in=section_ids)
+        active = Enrollment.objects.filter(
+            section=OuterRef('pk'), status='Enrolled'
+        ).order_by().values('section').annotate(total=Count('pk')).values('total')
+        with transaction.atomic():
+            updated = sections.update(enrolled=Coalesce(Subquery(active), 0))
+            TableVersion.bump(cls)
+        return updated
+
     @property
     def available_seats(self):
         return self.capacity - self.enrolled
@@ -98,6 +149,7 @@ class Enrollment(models.Model):
     """Student enrollments in course sections"""
     STATUS_CHOICES = [
         ('Enrolled', 'Enrolled'),
+        ('Dropped', 'Dropped'),
         ('Withdrawn', 'Withdrawn'),
         ('Completed', 'Completed'),
     ]
@@ -135,13 +187,200 @@ class Enrollment(models.Model):
     class Meta:
         ordering = ['-enrollment_date']
         unique_together = ['student', 'section']
+        # Keyset pagination walks these in (enrollment_date, enrollment_id) order
+        indexes = [
+            models.Index(fields=['-enrollment_date', '-enrollment_id'], name='enrollment_date_keyset'),
+            models.Index(fields=['student', '-enrollment_date', '-enrollment_id'], name='enrollment_student_keyset'),
+            models.Index(fields=['section', '-enrollment_date', '-enrollment_id'], name='enrollment_section_keyset'),
+            models.Index(fields=['course', '-enrollment_date', '-enrollment_id'], name='enrollment_course_keyset'),
+            models.Index(fields=['semester', '-enrollment_date', '-enrollment_id'], name='enrollment_semester_keyset'),
+            models.Index(fields=['status', '-enrollment_date', '-enrollment_id'], name='enrollment_status_keyset'),
+            # ?ordering=semester
+            models.Index(fields=['semester', 'enrollment_id'], name='enrollment_semester_order'),
+        ]
 
     def __str__(self):
         return f"{self.student.student_id} - {self.section}"
 
-    def save(self, *args, **kwargs):
+    def apply_grade(self):
+        """Derive grade points and earned credits from the letter grade"""
         if self.grade and self.grade in self.GRADE_POINTS:
             self.grade_points = self.GRADE_POINTS[self.grade]
             if self.grade not in ['F', 'W', 'I']:
                 self.credits_earned = self.course.credits
+
+    def save(self, *args, **kwargs):
+        self.apply_grade()
         super().save(*args, **kwargs)
+
+
+class WaitlistEntry(models.Model):
+    """
+    A student queued for a full section.
+
+    Tickets of the waiting entries of a section run without gaps from
+    ``section.waitlist_offset + 1``, so a position is one subtraction and
+    never a count of the queue. Promoting the head only advances the
+    offset; leaving from the middle renumbers the entries behind it.
+    Changes take the section row lock (see apps/academics/registration.py).
+    """
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='waitlist')
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='waitlist_entries')
+    ticket = models.IntegerField()
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['section', 'ticket']
+        unique_together = ['section', 'student']
+        indexes = [
+            models.Index(fields=['section', 'ticket'], name='waitlist_section_ticket'),
+        ]
+
+    def __str__(self):
+        return f"{self.student.student_id} - {self.section} #{self.position}"
+
+    @property
+    def position(self):
+        return self.ticket - self.section.waitlist_offset
+
+
+class TermGPA(models.Model):
+    """A student's GPA and credit totals for one semester, maintained from graded enrollments"""
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='term_gpas')
+    semester = models.CharField(max_length=20)
+    quality_points = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    gpa_credits = models.IntegerField(default=0)
+    credits_earned = models.IntegerField(default=0)
+    gpa = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+
+    class Meta:
+        ordering = ['student', 'semester']
+        unique_together = ['student', 'semester']
+
+    def __str__(self):
+        return f"{self.student.student_id} - {self.semester}: {self.gpa}"
+
+    @staticmethod
+    def grade_point_average(quality_points, gpa_credits):
+        """SQL expression for a GPA rounded half up to two places, 0 when no credits count"""
+        # Divide as floating point: SQLite stores whole decimals as integers
+        # and would otherwise truncate the quotient
+        average = Cast(
+            Cast(quality_points, models.FloatField()) / NullIf(gpa_credits, 0),
+            models.DecimalField(max_digits=12, decimal_places=6)
+        )
+        return Coalesce(
+            Round(average, 2),
+            Decimal('0.00'),
+            output_field=models.DecimalField(max_digits=3, decimal_places=2)
+        )
+
+    @classmethod
+    def refresh(cls, student_ids=None):
+        """
+        Recompute term and cumulative GPAs from graded enrollments, for the
+        given students or for every student when ``student_ids`` is None.
+
+        Everything happens in the database: term totals are written with one
+        INSERT ... SELECT and profiles are updated with one UPDATE, so a full
+        recompute costs the same number of queries as a single student.
+        W and I grades do not count towards ``gpa_credits``. Students left
+        with no graded enrollment get a GPA of 0.00 over 0 credits; the
+        imported GPA is kept apart in ``StudentProfile.imported_gpa``.
+        """
+        enrollments = Enrollment.objects.exclude(grade='')
+        terms = cls.objects.all()
+        profiles = StudentProfile.objects.all()
+        if student_ids is not None:
+            student_ids = set(student_ids)
+            if not student_ids:
+                return 0
+            enrollments = enrollments.filter(student_id__in=student_ids)
+            terms = terms.filter(student_id__in=student_ids)
+            profiles = profiles.filter(pk__in=student_ids)
+
+        totals = enrollments.values('student_id', 'semester').annotate(
+            quality_points=Coalesce(
+                Sum(F('grade_points') * F('course__credits'),
+                    output_field=models.DecimalField(max_digits=8, decimal_places=2)),
+                Decimal('0.00')
+            ),
+            gpa_credits=Coalesce(Sum('course__credits', filter=~Q(grade__in=['W', 'I'])), 0),
+            credits_earned=Coalesce(Sum('credits_earned'), 0),
+        ).annotate(
+            gpa=cls.grade_point_average(F('quality_points'), F('gpa_credits'))
+        ).order_by()
+        select_sql, params = totals.query.sql_with_params()
+
+        student_terms = cls.objects.filter(student_id=OuterRef('pk')).values('student_id')
+        qn = connection.ops.quote_name
+        columns = ', '.join(qn(cls._meta.get_field(name).column) for name in
+                            ['student', 'semester', 'quality_points', 'gpa_credits', 'credits_earned', 'gpa'])
+
+        with transaction.atomic():
+            terms.delete()
+            with connection.cursor() as cursor:
+                cursor.execute(f'INSERT INTO {qn(cls._meta.db_table)} ({columns}) {select_sql}', params)
+            TableVersion.bump(cls, StudentProfile)
+            return profiles.update(
+                gpa_credits=Coalesce(Subquery(
+                    student_terms.annotate(total=Sum('gpa_credits')).values('total')
+                ), 0),
+                gpa=Coalesce(Subquery(
+                    student_terms.annotate(
+                        total=cls.grade_point_average(Sum('quality_points'), Sum('gpa_credits'))
+                    ).values('total')
+                ), Decimal('0.00')),
+            )
+
+
+# Enrollment fields that term and cumulative GPAs are computed from
+GPA_FIELDS = ('student', 'course', 'semester', 'grade', 'grade_points', 'credits_earned')
+GPA_ATTNAMES = tuple(Enrollment._meta.get_field(name).attname for name in GPA_FIELDS)
+
+
+def gpa_values(values):
+    # to_python turns the float grade points set by apply_grade into the stored Decimal
+    return tuple(Enrollment._meta.get_field(name).to_python(value) for name, value in zip(GPA_FIELDS, values))
+
+
+@receiver(pre_save, sender=Enrollment)
+def remember_enrollment_grade(sender, instance, update_fields=None, **kwargs):
+    """Remember what an existing enrollment counted towards GPAs before it changes"""
+    if update_fields is not None and not set(update_fields) & {*GPA_FIELDS, *GPA_ATTNAMES}:
+        instance._previous_gpa_values = gpa_values(getattr(instance, attname) for attname in GPA_ATTNAMES)
+    elif instance._state.adding:
+        instance._previous_gpa_values = None
+    else:
+        previous = Enrollment.objects.filter(pk=instance.pk).values_list(*GPA_ATTNAMES).first()
+        instance._previous_gpa_values = previous and gpa_values(previous)
+
+
+@receiver(post_save, sender=Enrollment)
+def update_student_gpa(sender, instance, created, **kwargs):
+    """Recompute GPAs when a save changed a graded enrollment or added one"""
+    previous = getattr(instance, '_previous_gpa_values', None)
+    current = gpa_values(getattr(instance, attname) for attname in GPA_ATTNAMES)
+    if previous is None:
+        # A new row; a save over a row that was not loaded counts as changed
+        changed = bool(instance.grade) if created else True
+    else:
+        changed = previous != current and bool(previous[GPA_FIELDS.index('grade')] or instance.grade)
+    if changed:
+        student_ids = {instance.student_id, previous[GPA_FIELDS.index('student')] if previous else None} - {None}
+        TermGPA.refresh(student_ids)
+
+
+@receiver(post_delete, sender=Enrollment)
+def remove_student_gpa(sender, instance, **kwargs):
+    if instance.grade:
+        TermGPA.refresh({instance.student_id})
+
+
+@receiver(post_save, sender=Course)
+def update_course_student_gpas(sender, instance, created, **kwargs):
+    """Course credits weight every grade earned in the course"""
+    if not created:
+        TermGPA.refresh(set(
+            Enrollment.objects.filter(course=instance).exclude(grade='').values_list('student_id', flat=True)
+        ))
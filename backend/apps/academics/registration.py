@@ -0,0 +1,293 @@
+"""
+Course registration: enrolling in and dropping sections, and their waitlists.
+
+Seats are counted in ``Section.enrolled``. A seat is taken with a single
+conditional ``UPDATE ... SET enrolled = enrolled + 1 WHERE enrolled <
+capacity``, which the database evaluates against the current row under its
+write lock, so concurrent requests for the last seats can never oversell a
+section. The enrollment row is written in the same transaction, before the
+seat is taken: the section row, which every registration for that section
+contends on, stays locked only from the UPDATE to the commit, and a failure
+anywhere rolls back both.
+
+Registration also rejects a section that meets at the same time as one the
+student is already enrolled in that semester (see schedule.py). These
+checks run in the registering transaction after locking the student's
+profile row, so two concurrent registrations by the same student (two
+sections of one course, or two sections that clash) cannot both pass them.
+
+Students turned away by a full section can join its waitlist. A drop
+promotes the head of the waitlist in the same transaction that releases the
+seat, so the seat never becomes visible to other registrations. The
+promoted student's profile row is locked for the eligibility checks too,
+but a drop already holds the section lock, the reverse of the order
+``enroll`` takes them in. Rather than wait for a student who is registering
+at that moment, and risk a deadlock, promotion skips them: they keep their
+place and the next student in line gets the seat.
+"""
+import uuid
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, ExpressionWrapper, F, IntegerField, OuterRef, Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+from apps.core.models import TableVersion
+from apps.users.models import StudentProfile
+from .models import Enrollment, Section, TermGPA, WaitlistEntry
+from .schedule import Meeting, Timetable
+
+# Earlier enrollments in these states are reactivated by a new registration
+REOPENABLE_STATUSES = ('Withdrawn', 'Dropped')
+
+
+class RegistrationConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The registration could not be completed'
+    default_code = 'registration_conflict'
+
+
+def generate_enrollment_id():
+    return f"ENR{uuid.uuid4().hex[:16].upper()}"
+
+
+def seats_changed():
+    """Bulk writes skip the signals that track section, enrollment and waitlist changes"""
+    TableVersion.bump(Section, Enrollment, WaitlistEntry)
+
+
+def get_section(section_id):
+    section = Section.objects.select_related('course').filter(pk=section_id).first()
+    if section is None:
+        raise NotFound('Section not found')
+    return section
+
+
+def lock_section(section_id):
+    """
+    Lock a section row until the transaction ends and return it. A no-op
+    UPDATE takes the row lock on PostgreSQL and the database write lock on
+    SQLite, where SELECT ... FOR UPDATE is ignored.
+    """
+    if not Section.objects.filter(pk=section_id).update(waitlist_offset=F('waitlist_offset')):
+        raise NotFound('Section not found')
+    return Section.objects.select_related('course').get(pk=section_id)
+
+
+def lock_student(student):
+    """Lock a student's profile row until the transaction ends, in the same way as lock_section"""
+    StudentProfile.objects.filter(pk=student.pk).update(gpa_credits=F('gpa_credits'))
+
+
+def try_lock_student(student):
+    """
+    Lock a student's profile row like lock_student, but return False
+    instead of waiting if another transaction holds it. On SQLite the
+    caller already holds the database write lock, so this always succeeds.
+    """
+    return StudentProfile.objects.select_for_update(skip_locked=True).filter(pk=student.pk).exists()
+
+
+def check_eligible(student, section):
+    """
+    The student's earlier enrollment in ``section`` that a registration
+    would reactivate, if any. Raises RegistrationConflict if they may not
+    register for it.
+    """
+    existing, others = None, []
+    for enrollment in Enrollment.objects.select_related('section').filter(
+        Q(section=section) | Q(semester=section.semester, status='Enrolled'),
+        student=student,
+    ):
+        if enrollment.section_id == section.pk:
+            existing = enrollment
+        elif enrollment.course_id == section.course_id:
+            raise RegistrationConflict('Already enrolled in another section of this course')
+        else:
+            others.append(Meeting.of(enrollment.section))
+    if existing is not None and existing.status not in REOPENABLE_STATUSES:
+        raise RegistrationConflict(f'Already {existing.status.lower()} in this section')
+    clashes = Timetable(others).conflicts(Meeting.of(section))
+    if clashes:
+        raise RegistrationConflict(f'Meets at the same time as {", ".join(clashes)}')
+    return existing
+
+
+def timetable(student):
+    """Timetable of the sections ``student`` is enrolled in, keyed by section_id"""
+    enrollments = Enrollment.objects.filter(student=student, status='Enrolled').values_list(
+        'section_id', 'section__semester', 'section__meeting_day_mask', 'section__meeting_start', 'section__meeting_end'
+    )
+    return Timetable(Meeting(*row) for row in enrollments)
+
+
+def without_conflicts(sections, student):
+    """``sections`` that meet at no time ``student`` is already in class that semester"""
+    clashing = Enrollment.objects.filter(
+        student=student,
+        status='Enrolled',
+        section__semester=OuterRef('semester'),
+        section__meeting_start__lt=OuterRef('meeting_end'),
+        section__meeting_end__gt=OuterRef('meeting_start'),
+    ).exclude(section=OuterRef('pk')).annotate(
+        shared_days=ExpressionWrapper(
+            F('section__meeting_day_mask').bitand(OuterRef('meeting_day_mask')), output_field=IntegerField()
+        )
+    ).filter(shared_days__gt=0)
+    return sections.filter(~Exists(clashing))
+
+
+def write_enrollment(student, section, existing):
+    """Create the enrollment, or reactivate ``existing``; the caller takes the seat"""
+    today = timezone.localdate()
+    if existing is None:
+        enrollment = Enrollment(
+            enrollment_id=generate_enrollment_id(),
+            student=student,
+            student_name=student.user.get_full_name(),
+            section=section,
+            course=section.course,
+            semester=section.semester,
+            enrollment_date=today,
+            credits_attempted=section.course.credits,
+        )
+        # An ungraded enrollment leaves GPAs as they are, so the save()
+        # signals that recompute them are skipped
+        Enrollment.objects.bulk_create([enrollment])
+        return enrollment
+
+    reopened = Enrollment.objects.filter(pk=existing.pk, status=existing.status).update(
+        status='Enrolled', enrollment_date=today, grade='', grade_points=0, credits_earned=0
+    )
+    if not reopened:
+        raise RegistrationConflict('The enrollment changed, try again')
+    if existing.grade:
+        TermGPA.refresh({student.pk})
+    existing.status, existing.enrollment_date = 'Enrolled', today
+    existing.grade, existing.grade_points, existing.credits_earned = '', 0, 0
+    return existing
+
+
+def enroll(student, section_id):
+    """Enroll ``student`` in a section, taking one of its seats"""
+    section = get_section(section_id)
+    if section.status != 'Open':
+        raise RegistrationConflict('Section is not open for registration')
+    # Turn most requests for a full section away without a transaction;
+    # the seat UPDATE below is what actually guarantees the capacity
+    if section.is_full:
+        raise RegistrationConflict('Section is full')
+
+    try:
+        with transaction.atomic():
+            lock_student(student)
+            enrollment = write_enrollment(student, section, check_eligible(student, section))
+            taken = Section.objects.filter(
+                pk=section.pk, status='Open', enrolled__lt=F('capacity')
+            ).update(enrolled=F('enrolled') + 1)
+            if not taken:
+                raise RegistrationConflict('Section is full')
+            seats_changed()
+    except IntegrityError:
+        # A concurrent request registered the same student first
+        raise RegistrationConflict('Already enrolled in this section')
+    return enrollment
+
+
+def drop(student, section_id):
+    """Drop ``student``'s enrollment in a section, handing the seat to the waitlist"""
+    with transaction.atomic():
+        dropped = Enrollment.objects.filter(
+            student=student, section_id=section_id, status='Enrolled'
+        ).update(status='Dropped')
+        if not dropped:
+            raise NotFound('Not enrolled in this section')
+        Section.objects.filter(pk=section_id, enrolled__gt=0).update(enrolled=F('enrolled') - 1)
+        promote_waitlist(section_id)
+        seats_changed()
+    return Enrollment.objects.select_related('section', 'course').get(student=student, section_id=section_id)
+
+
+def promote_waitlist(section_id):
+    """
+    Fill the free seats of a section from the head of its waitlist and
+    return the new enrollments. Students who can no longer register (they
+    enrolled in another section of the course meanwhile) leave the queue;
+    students whose profile row is locked are passed over for now.
+    Must run in a transaction that holds the section row lock.
+    """
+    promoted, passed_over = [], []
+    while True:
+        section = Section.objects.select_related('course').get(pk=section_id)
+        if section.status != 'Open' or section.is_full:
+            return promoted
+        entry = WaitlistEntry.objects.select_related('student__user').filter(
+            section_id=section_id
+        ).exclude(pk__in=passed_over).order_by('ticket').first()
+        if entry is None:
+            return promoted
+        if not try_lock_student(entry.student):
+            passed_over.append(entry.pk)
+            continue
+
+        WaitlistEntry.objects.filter(pk=entry.pk).delete()
+        if passed_over:
+            # Served out of turn, so the entries behind it move up as in leave_waitlist
+            WaitlistEntry.objects.filter(section_id=section_id, ticket__gt=entry.ticket).update(
+                ticket=F('ticket') - 1
+            )
+            served = 0
+        else:
+            served = 1
+        try:
+            with transaction.atomic():
+                enrollment = write_enrollment(entry.student, section, check_eligible(entry.student, section))
+                Section.objects.filter(pk=section_id).update(
+                    enrolled=F('enrolled') + 1, waitlist_offset=F('waitlist_offset') + served
+                )
+            promoted.append(enrollment)
+        except (RegistrationConflict, IntegrityError):
+            Section.objects.filter(pk=section_id).update(waitlist_offset=F('waitlist_offset') + served)
+
+
+def join_waitlist(student, section_id):
+    """Queue ``student`` for a full section; returns the entry"""
+    section = get_section(section_id)
+    if section.status != 'Open':
+        raise RegistrationConflict('Section is not open for registration')
+
+    try:
+        with transaction.atomic():
+            lock_student(student)
+            check_eligible(student, section)
+            section = lock_section(section_id)
+            if not section.is_full:
+                raise RegistrationConflict('Section has free seats, enroll instead')
+            last_ticket = WaitlistEntry.objects.filter(section=section).order_by('-ticket').values_list(
+                'ticket', flat=True
+            ).first()
+            entry = WaitlistEntry.objects.create(
+                section=section, student=student, ticket=(last_ticket or section.waitlist_offset) + 1
+            )
+    except IntegrityError:
+        raise RegistrationConflict('Already on the waitlist of this section')
+    return entry
+
+
+def leave_waitlist(student, section_id):
+    """Take ``student`` off a section's waitlist; the students behind move up"""
+    with transaction.atomic():
+        section = lock_section(section_id)
+        entry = WaitlistEntry.objects.filter(section=section, student=student).first()
+        if entry is None:
+            raise NotFound('Not on the waitlist of this section')
+        WaitlistEntry.objects.filter(pk=entry.pk).delete()
+        WaitlistEntry.objects.filter(section=section, ticket__gt=entry.ticket).update(ticket=F('ticket') - 1)
+        TableVersion.bump(WaitlistEntry)
+
+
+def waitlist_length(section):
+    """Students waiting for ``section``, read from the last ticket"""
+    last_ticket = WaitlistEntry.objects.filter(section=section).order_by('-ticket').values_list(
+        'ticket', flat=True
+    ).first()
+    return last_ticket - section.waitlist_offset if last_ticket else 0
@@ -0,0 +1,134 @@
+"""
+Section meeting times as weekday bitmasks and minute intervals.
+
+``Section.meeting_days`` and ``meeting_time`` are free text ("MWF",
+"10:00-10:50"). They are parsed once when a section is saved or imported
+into ``meeting_day_mask``, ``meeting_start`` and ``meeting_end``, so clash
+checks compare integers: two meetings clash when their masks share a bit
+and their intervals overlap. Text that cannot be parsed (TBA, online) leaves
+an empty mask, which clashes with nothing.
+"""
+import re
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import accumulate
+
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Day abbreviations, longest first so "TTH" reads as Tuesday, Thursday
+DAY_TOKENS = {
+    'MONDAY': 0, 'MON': 0, 'M': 0,
+    'TUESDAY': 1, 'TUES': 1, 'TUE': 1, 'TU': 1, 'T': 1,
+    'WEDNESDAY': 2, 'WED': 2, 'W': 2,
+    'THURSDAY': 3, 'THURS': 3, 'THUR': 3, 'THU': 3, 'TH': 3, 'R': 3,
+    'FRIDAY': 4, 'FRI': 4, 'F': 4,
+    'SATURDAY': 5, 'SAT': 5, 'SA': 5, 'S': 5,
+    'SUNDAY': 6, 'SUN': 6, 'SU': 6, 'U': 6,
+}
+DAY_TOKEN = re.compile('|'.join(sorted(DAY_TOKENS, key=len, reverse=True)))
+DAYS_TEXT = re.compile(rf'(?:{DAY_TOKEN.pattern}|[^A-Z])*')
+TIME = r'(\d{1,2})(?::(\d{2}))?\s*([AP])?\.?M?\.?'
+TIME_RANGE = re.compile(rf'^\s*{TIME}\s*(?:-|–|TO)\s*{TIME}\s*$')
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_days(text):
+    """Bitmask of the weekdays in ``text``, bit 0 for Monday; 0 if it names no days"""
+    text = (text or '').upper()
+    if not DAYS_TEXT.fullmatch(text):
+        return 0
+    mask = 0
+    for token in DAY_TOKEN.findall(text):
+        mask |= 1 << DAY_TOKENS[token]
+    return mask
+
+
+def to_minutes(hour, minute, meridiem):
+    hour, minute = int(hour), int(minute or 0)
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem == 'P' else 0)
+    return hour * 60 + minute
+
+
+def parse_time(text):
+    """``(start, end)`` in minutes after midnight, or ``(None, None)``"""
+    match = TIME_RANGE.match((text or '').upper())
+    if not match:
+        return None, None
+    start_hour, start_minute, start_meridiem, end_hour, end_minute, end_meridiem = match.groups()
+    end = to_minutes(end_hour, end_minute, end_meridiem)
+    # "1:00-2:15 PM": the start shares the end's meridiem unless that puts it after the end
+    start = to_minutes(start_hour, start_minute, start_meridiem or end_meridiem)
+    if start > end and not start_meridiem:
+        start = to_minutes(start_hour, start_minute, 'A')
+    if not 0 <= start < end <= MINUTES_PER_DAY:
+        return None, None
+    return start, end
+
+
+def parse_meeting(days, time):
+    """``(day_mask, start, end)`` of a section; an empty mask when either part is unreadable"""
+    mask = parse_days(days)
+    start, end = parse_time(time)
+    if not mask or start is None:
+        return 0, None, None
+    return mask, start, end
+
+
+class Meeting(namedtuple('Meeting', 'key semester days start end')):
+    """The weekly meeting of one section, as stored on Section"""
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, section):
+        return cls(section.pk, section.semester, section.meeting_day_mask, section.meeting_start, section.meeting_end)
+
+
+class Timetable:
+    """
+    Meetings indexed by semester and weekday.
+
+    The meetings of each day are sorted by start, next to the running
+    maximum of their ends. A lookup bisects to the meetings that start
+    before the queried one ends and walks back only while an earlier one can
+    still reach into it.
+    """
+
+    def __init__(self, meetings=()):
+        by_day = {}
+        for meeting in meetings:
+            if not meeting.days or meeting.start is None:
+                continue
+            for day in range(len(DAYS)):
+                if meeting.days & (1 << day):
+                    by_day.setdefault((meeting.semester, day), []).append(meeting)
+        self.days = {}
+        for key, day_meetings in by_day.items():
+            day_meetings.sort(key=lambda meeting: (meeting.start, meeting.end))
+            self.days[key] = (
+                [meeting.start for meeting in day_meetings],
+                list(accumulate((meeting.end for meeting in day_meetings), max)),
+                day_meetings,
+            )
+
+    def __bool__(self):
+        return bool(self.days)
+
+    def conflicts(self, meeting):
+        """Keys of the meetings that clash with ``meeting``, other than its own"""
+        found = []
+        if not meeting.days or meeting.start is None:
+            return found
+        for day in range(len(DAYS)):
+            entry = self.days.get((meeting.semester, day)) if meeting.days & (1 << day) else None
+            if entry is None:
+                continue
+            starts, reach, day_meetings = entry
+            position = bisect_left(starts, meeting.end)
+            while position and reach[position - 1] > meeting.start:
+                position -= 1
+                other = day_meetings[position]
+                if other.end > meeting.start and other.key != meeting.key and other.key not in found:
+                    found.append(other.key)
+        return sorted(found)
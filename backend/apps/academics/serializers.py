@@ -1,6 +1,8 @@
 from rest_framework import serializers
-from .models import Department, Course, Section, Enrollment
+from .models import Department, Course, Section, Enrollment, TermGPA, WaitlistEntry
+from .schedule import Meeting
 from apps.facilities.models import Room
+from apps.core.values import ValuesSerializer
 
 
 class DepartmentSerializer(serializers.ModelSerializer):
@@ -24,6 +26,7 @@ class SectionSerializer(serializers.ModelSerializer):
     room_name = serializers.SerializerMethodField()
     is_full = serializers.ReadOnlyField()
     available_seats = serializers.ReadOnlyField()
+    conflicts = serializers.SerializerMethodField()
 
     class Meta:
         model = Section
@@ -31,11 +34,23 @@ class SectionSerializer(serializers.ModelSerializer):
                   'section_number', 'semester', 'year', 'instructor_name',
                   'instructor_rank', 'meeting_days', 'meeting_time',
                   'room', 'room_name', 'capacity', 'enrolled', 'status',
-                  'is_full', 'available_seats']
+                  'is_full', 'available_seats', 'conflicts']
+        # Columns read by computed fields, for ?fields= projections
+        field_columns = {
+            'room_name': ['room__room_number', 'room__building__name'],
+            'is_full': ['capacity', 'enrolled'],
+            'available_seats': ['capacity', 'enrolled'],
+            'conflicts': ['semester', 'meeting_day_mask', 'meeting_start', 'meeting_end'],
+        }
 
     def get_room_name(self, obj):
         return str(obj.room) if obj.room else None
 
+    def get_conflicts(self, obj):
+        """Enrolled sections of the student in ``timetable`` that meet at the same time"""
+        timetable = self.context.get('timetable')
+        return timetable.conflicts(Meeting.of(obj)) if timetable is not None else None
+
 
 class EnrollmentSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
@@ -69,3 +84,34 @@ class StudentEnrollmentSerializer(serializers.ModelSerializer):
                   'section', 'section_number', 'instructor_name',
                   'meeting_days', 'meeting_time', 'semester', 'enrollment_date',
                   'status', 'grade', 'grade_points', 'credits_attempted', 'credits_earned']
+
+
+class EnrollmentValuesSerializer(ValuesSerializer):
+    serializer_class = EnrollmentSerializer
+    extra_values = ('student__user__first_name', 'student__user__last_name',
+                    'section__course', 'section__section_number')
+
+    def get_student_name(self, row):
+        return self.full_name(row['student__user__first_name'], row['student__user__last_name'])
+
+    def get_section_info(self, row):
+        return f"{row['section__course']} - {row['section__section_number']}"
+
+
+class StudentEnrollmentValuesSerializer(ValuesSerializer):
+    serializer_class = StudentEnrollmentSerializer
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
+    position = serializers.ReadOnlyField()
+
+    class Meta:
+        model = WaitlistEntry
+        fields = ['section', 'student', 'student_name', 'position', 'joined_at']
+
+
+class TermGPASerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TermGPA
+        fields = ['semester', 'gpa', 'gpa_credits', 'credits_earned', 'quality_points']
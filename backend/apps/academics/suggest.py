@@ -0,0 +1,190 @@
+"""
+In-process prefix index for course type-ahead (/api/academics/courses/suggest/).
+
+Every word of a course's id, name and department name is kept in one sorted
+list, so the courses matching a prefix are a contiguous run found by
+bisection. The index lives in each worker process. It is rebuilt when the
+TableVersion stamps of Course or Department change, which happens on every
+save, delete and import_data run in any process. The stamps are read at most
+once every COURSE_SUGGEST_CHECK_INTERVAL seconds, and straight away after a
+change committed in this process, so between checks suggestions never touch
+the database.
+"""
+import heapq
+import re
+import time
+from bisect import bisect_left
+from collections import namedtuple
+from functools import partial
+from itertools import accumulate
+from threading import Lock
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models.signals import post_delete, post_save
+from apps.core.models import TableVersion
+from .models import Course, Department
+
+WORD = re.compile(r'[0-9a-z]+')
+# Letter and digit runs of a course id, so "cs 101" finds CS101
+ID_PARTS = re.compile(r'[a-z]+|[0-9]+')
+
+# Weight of a prefix match on each field; a whole-word match counts double
+ID_WEIGHT = 4
+NAME_WEIGHT = 2
+DEPARTMENT_WEIGHT = 1
+
+MODELS = (Course, Department)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# Ranked results kept per index for repeated queries, such as the first
+# letters of popular course ids during registration
+RESULTS_CACHE_SIZE = 4096
+# Sorts after every character a word can contain
+LAST_CHARACTER = '~'
+
+# One build of the index, replaced as a whole so concurrent searches never
+# see a half-built one. ``offsets`` are running totals of posting lengths,
+# used to pick the most selective prefix of a query.
+IndexData = namedtuple('IndexData', 'courses words postings offsets course_words results')
+
+
+def words(text):
+    return WORD.findall(text.lower())
+
+
+class CourseIndex:
+    """Sorted words of every course, each with the courses it occurs in"""
+
+    def __init__(self):
+        self.versions = None
+        self.next_check = 0
+        self.data = IndexData([], [], [], [0], [], {})
+        self.lock = Lock()
+
+    def build(self, versions=None):
+        rows = Course.objects.order_by('course_id').values_list(
+            'course_id', 'course_name', 'department_id', 'department__name', 'level', 'status'
+        )
+        courses, course_words, weights = [], [], {}
+        for position, (course_id, name, department_id, department_name, level, status) in enumerate(rows):
+            courses.append({
+                'course_id': course_id,
+                'course_name': name,
+                'department': department_id,
+                'department_name': department_name,
+                'level': level,
+                'status': status,
+            })
+            compact = ''.join(words(course_id))
+            fields = (
+                (ID_WEIGHT, [compact, *words(course_id), *ID_PARTS.findall(compact)]),
+                (NAME_WEIGHT, words(name)),
+                (DEPARTMENT_WEIGHT, words(department_name or '')),
+            )
+            best = {}
+            for weight, field_words in fields:
+                for word in field_words:
+                    best[word] = max(best.get(word, 0), weight)
+            for word, weight in best.items():
+                weights.setdefault(word, []).append((position, weight))
+            course_words.append(tuple(best.items()))
+
+        sorted_words = sorted(weights)
+        postings = [tuple(weights[word]) for word in sorted_words]
+        self.data = IndexData(
+            courses, sorted_words, postings, list(accumulate((len(p) for p in postings), initial=0)),
+            course_words, {},
+        )
+        self.versions = versions
+
+    def refresh(self):
+        """Rebuild the index if a course or department changed since it was built"""
+        now = time.monotonic()
+        if now < self.next_check:
+            return
+        self.next_check = now + settings.COURSE_SUGGEST_CHECK_INTERVAL
+        versions = TableVersion.stamps(MODELS)
+        if versions != self.versions:
+            with self.lock:
+                if versions != self.versions:
+                    # Versions are read before the rows, so a change made
+                    # during the build is picked up by the next refresh
+                    self.build(versions)
+
+    def expire(self, **kwargs):
+        """Check the stamps on the next search, once the current transaction commits"""
+        transaction.on_commit(partial(setattr, self, 'next_check', 0))
+
+    def warm(self):
+        """Build the index at startup; before migrations have run it is built on first use"""
+        try:
+            self.refresh()
+        except DatabaseError:
+            pass
+        finally:
+            # Forked workers must not share the connection the build used
+            connections.close_all()
+
+    def search(self, text, limit):
+        """Up to ``limit`` courses with a word starting with every word of ``text``, best first"""
+        prefixes = tuple(sorted(set(words(text))))
+        if not prefixes:
+            return []
+        data = self.data
+        results = data.results.get(prefixes)
+        if results is None:
+            results = self.rank(data, prefixes)
+            if len(data.results) < RESULTS_CACHE_SIZE:
+                data.results[prefixes] = results
+        return results[:limit]
+
+    def rank(self, data, prefixes):
+        """The best MAX_LIMIT courses matching every prefix"""
+        ranges = []
+        for prefix in prefixes:
+            low = bisect_left(data.words, prefix)
+            high = bisect_left(data.words, prefix + LAST_CHARACTER, low)
+            ranges.append((data.offsets[high] - data.offsets[low], prefix, low, high))
+        ranges.sort()
+
+        # Start from the most selective prefix
+        _, prefix, low, high = ranges[0]
+        totals = {}
+        for position in range(low, high):
+            exact = data.words[position] == prefix
+            for course, weight in data.postings[position]:
+                score = weight * 2 if exact else weight
+                if score > totals.get(course, 0):
+                    totals[course] = score
+
+        # and check the others against the remaining courses' own words
+        for _, prefix, _, _ in ranges[1:]:
+            if not totals:
+                break
+            narrowed = {}
+            for course, total in totals.items():
+                score = max(
+                    (weight * 2 if word == prefix else weight
+                     for word, weight in data.course_words[course] if word.startswith(prefix)),
+                    default=0,
+                )
+                if score:
+                    narrowed[course] = total + score
+            totals = narrowed
+
+        # Ties keep course_id order
+        best = heapq.nsmallest(MAX_LIMIT, totals.items(), key=lambda item: (-item[1], item[0]))
+        return [data.courses[course] for course, _ in best]
+
+
+course_index = CourseIndex()
+
+for model in MODELS:
+    post_save.connect(course_index.expire, sender=model, weak=False)
+    post_delete.connect(course_index.expire, sender=model, weak=False)
+
+
+def suggest_courses(text, limit):
+    course_index.refresh()
+    return course_index.search(text, limit)
@@ -0,0 +1,157 @@
+import threading
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from apps.core.testing import ValuesSerializerTestMixin, api_client, create_section, create_student, create_user
+from . import registration
+from .models import Enrollment, Section, WaitlistEntry
+from .views import EnrollmentViewSet
+
+
+class EnrollmentValuesSerializerTest(ValuesSerializerTestMixin, TestCase):
+    """The enrollment list renders the same through its ValuesSerializers"""
+    viewset = EnrollmentViewSet
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('values.admin', 'admin')
+        cls.students = [create_student(1, last_name='Ng'), create_student(2, first_name='Zoë', last_name='')]
+        rows = [
+            ('Fall 2024', 'Completed', 'A-', Decimal('3.70'), 3),
+            ('Fall 2024', 'Withdrawn', 'W', Decimal('0.00'), 0),
+            ('Spring 2025', 'Enrolled', '', Decimal('0.00'), 0),
+        ]
+        for number, (semester, status, grade, grade_points, credits_earned) in enumerate(rows):
+            section = create_section(number, semester)
+            for student in cls.students:
+                Enrollment.objects.create(
+                    enrollment_id=f'ENR{student.pk:04d}{number:02d}', student=student,
+                    student_name=student.user.get_full_name(), section=section, course=section.course,
+                    semester=semester, enrollment_date=date(2024, 8, 20 + number), status=status, grade=grade,
+                    grade_points=grade_points, credits_attempted=3, credits_earned=credits_earned,
+                )
+        cls.url = reverse('enrollment-list')
+
+    def test_staff_list(self):
+        self.assertMatchesModelSerializer(api_client(self.admin), self.url)
+
+    def test_filtered_and_ordered(self):
+        self.assertMatchesModelSerializer(
+            api_client(self.admin), self.url, {'semester': 'Fall 2024', 'ordering': 'semester'}
+        )
+
+    def test_student_list(self):
+        self.assertMatchesModelSerializer(api_client(self.students[1].user), self.url)
+
+
+class RegistrationTest(TestCase):
+    """Enrolling in, dropping and waiting for sections through the sections endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [create_student(number) for number in range(1, 4)]
+        cls.section = create_section(1, capacity=2)
+
+    def post(self, student, action, method='post'):
+        url = reverse(f'section-{action}', args=[self.section.pk])
+        return getattr(api_client(student.user), method)(url)
+
+    def enrolled(self):
+        return Section.objects.get(pk=self.section.pk).enrolled
+
+    def test_enroll(self):
+        response = self.post(self.students[0], 'enroll')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], 'Enrolled')
+        enrollment = Enrollment.objects.get(student=self.students[0], section=self.section)
+        self.assertEqual((enrollment.status, enrollment.credits_attempted), ('Enrolled', 3))
+        self.assertEqual(self.enrolled(), 1)
+
+    def test_enroll_twice(self):
+        self.post(self.students[0], 'enroll')
+        response = self.post(self.students[0], 'enroll')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Enrollment.objects.filter(section=self.section).count(), 1)
+        self.assertEqual(self.enrolled(), 1)
+
+    def test_full_section(self):
+        self.post(self.students[0], 'enroll')
+        self.post(self.students[1], 'enroll')
+        response = self.post(self.students[2], 'enroll')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.enrolled(), 2)
+
+    def test_drop_and_enroll_again(self):
+        self.post(self.students[0], 'enroll')
+        response = self.post(self.students[0], 'drop')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'Dropped')
+        self.assertEqual(self.enrolled(), 0)
+        self.assertEqual(self.post(self.students[0], 'drop').status_code, 404)
+        # The dropped enrollment is reactivated rather than duplicated
+        self.assertEqual(self.post(self.students[0], 'enroll').status_code, 201)
+        self.assertEqual(Enrollment.objects.get(student=self.students[0], section=self.section).status, 'Enrolled')
+
+    def test_drop_promotes_the_waitlist(self):
+        self.post(self.students[0], 'enroll')
+        self.post(self.students[1], 'enroll')
+        response = self.post(self.students[2], 'waitlist')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['position'], response.data['waitlist_length']), (1, 1))
+
+        self.post(self.students[0], 'drop')
+        self.assertTrue(Enrollment.objects.filter(
+            student=self.students[2], section=self.section, status='Enrolled'
+        ).exists())
+        self.assertFalse(WaitlistEntry.objects.filter(section=self.section).exists())
+        self.assertEqual(self.enrolled(), 2)
+
+
+class ConcurrentRegistrationTest(TransactionTestCase):
+    """Registrations racing from separate connections"""
+
+    def race(self, attempts):
+        """Run the ``attempts`` callables at once, each on its own connection; returns their outcomes"""
+        barrier = threading.Barrier(len(attempts))
+        outcomes = [None] * len(attempts)
+
+        def run(index, attempt):
+            try:
+                barrier.wait()
+                attempt()
+                outcomes[index] = 'ok'
+            except registration.RegistrationConflict:
+                outcomes[index] = 'conflict'
+            except Exception as error:
+                outcomes[index] = repr(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=item) for item in enumerate(attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_last_seats(self):
+        section = create_section(1, capacity=3)
+        students = [create_student(number) for number in range(1, 13)]
+        outcomes = self.race([
+            lambda student=student: registration.enroll(student, section.pk) for student in students
+        ])
+        self.assertEqual(sorted(outcomes), ['conflict'] * 9 + ['ok'] * 3)
+        self.assertEqual(Enrollment.objects.filter(section=section, status='Enrolled').count(), 3)
+        self.assertEqual(Section.objects.get(pk=section.pk).enrolled, 3)
+
+    def test_one_student_two_sections_of_a_course(self):
+        student = create_student(1)
+        first = create_section(1)
+        second = create_section(2, course=first.course)
+        outcomes = self.race([
+            lambda section=section: registration.enroll(student, section.pk) for section in (first, second)
+        ])
+        self.assertEqual(sorted(outcomes), ['conflict', 'ok'])
+        self.assertEqual(Enrollment.objects.filter(student=student, status='Enrolled').count(), 1)
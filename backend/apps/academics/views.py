@@ -1,16 +1,26 @@
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Department, Course, Section, Enrollment
+from .models import Department, Course, Section, Enrollment, TermGPA, WaitlistEntry
+from .suggest import DEFAULT_LIMIT, MAX_LIMIT, suggest_courses
+from . import registration
 from .serializers import (
     DepartmentSerializer, CourseSerializer, SectionSerializer,
-    EnrollmentSerializer, StudentEnrollmentSerializer
+    EnrollmentSerializer, StudentEnrollmentSerializer, TermGPASerializer,
+    EnrollmentValuesSerializer, StudentEnrollmentValuesSerializer, WaitlistEntrySerializer
 )
+from apps.facilities.models import Building, Room
 from apps.users.models import StudentProfile
+from apps.core.cache import CachedCatalogMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPagination
+from apps.core.sparse import SparseFieldsetMixin
+from apps.core.values import ValuesListMixin
 
 
-class DepartmentViewSet(viewsets.ReadOnlyModelViewSet):
+class DepartmentViewSet(ConditionalGetMixin, CachedCatalogMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for departments"""
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
@@ -18,9 +28,10 @@ class DepartmentViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'head']
     ordering_fields = ['name']
+    cache_models = [Department]
 
 
-class CourseViewSet(viewsets.ReadOnlyModelViewSet):
+class CourseViewSet(ConditionalGetMixin, CachedCatalogMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for courses"""
     queryset = Course.objects.select_related('department').all()
     serializer_class = CourseSerializer
@@ -29,17 +40,63 @@ class CourseViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['department', 'level', 'status']
     search_fields = ['course_id', 'course_name', 'description']
     ordering_fields = ['course_id', 'course_name']
+    cache_models = [Course, Department]
+
+    @action(detail=False, methods=['get'], conditional=False)
+    def suggest(self, request):
+        """
+        Type-ahead: courses whose id, name or department name has a word
+        starting with each word of ``q``, best match first. Served from an
+        in-process index, so no query reaches the database.
+        """
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        limit = max(1, min(limit, MAX_LIMIT))
+        return Response(suggest_courses(request.query_params.get('q', ''), limit))
 
 
-class SectionViewSet(viewsets.ReadOnlyModelViewSet):
+class SectionViewSet(ConditionalGetMixin, CachedCatalogMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for sections"""
-    queryset = Section.objects.select_related('course', 'instructor', 'room').all()
+    queryset = Section.objects.select_related('course', 'instructor', 'room__building').all()
     serializer_class = SectionSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['course', 'semester', 'year', 'status', 'instructor']
     search_fields = ['course__course_name', 'instructor_name']
     ordering_fields = ['semester', 'course__course_id']
+    cache_models = [Section, Course, Room, Building]
+    # Compare sections with a student's timetable: ?conflicts= lists the
+    # clashing enrollments of each section, ?conflict_free= hides clashes
+    schedule_query_params = ('conflicts', 'conflict_free')
+
+    def should_cache(self, request):
+        # A faculty member's own sections differ per user
+        if request.user.role == 'faculty' and request.query_params.get('my_sections'):
+            return False
+        if self.get_schedule_params():
+            return False
+        return super().should_cache(request)
+
+    def get_conditional_models(self):
+        models = super().get_conditional_models()
+        if self.get_schedule_params():
+            models.add(Enrollment)
+        return models
+
+    def get_schedule_params(self):
+        """The schedule query parameters switched on in this request"""
+        if getattr(self, 'action', None) not in ('list', 'retrieve'):
+            return set()
+        params = self.request.query_params
+        return {name for name in self.schedule_query_params if params.get(name, '').lower() in ('1', 'true', 'yes')}
+
+    def get_schedule_student(self):
+        """The student whose timetable the schedule parameters compare against"""
+        if not hasattr(self, '_schedule_student'):
+            self._schedule_student = self.get_registering_student(self.request) if self.get_schedule_params() else None
+        return self._schedule_student
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -50,18 +107,114 @@ class SectionViewSet(viewsets.ReadOnlyModelViewSet):
             if instructor_id:
                 queryset = queryset.filter(instructor__user=self.request.user)
 
+        if 'conflict_free' in self.get_schedule_params():
+            queryset = registration.without_conflicts(queryset, self.get_schedule_student())
+
         return queryset
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if 'conflicts' in self.get_schedule_params():
+            # One query for the student's enrollments; each section is then a lookup
+            context['timetable'] = registration.timetable(self.get_schedule_student())
+        return context
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if 'conflicts' not in self.get_schedule_params():
+            getattr(serializer, 'child', serializer).fields.pop('conflicts', None)
+        return serializer
+
+    def get_registering_student(self, request):
+        """Students register themselves; staff name the student in the request body or query string"""
+        if request.user.role == 'student':
+            if not request.profile:
+                raise NotFound('Student profile not found')
+            return request.profile
+        if request.user.role != 'staff':
+            raise PermissionDenied('Only students and staff can register for sections')
+        student_id = request.data.get('student') or request.query_params.get('student')
+        if not student_id:
+            raise ValidationError({'student': ['This field is required.']})
+        student = StudentProfile.objects.select_related('user').filter(pk=student_id).first()
+        if student is None:
+            raise NotFound('Student not found')
+        return student
+
+    @action(detail=True, methods=['post'])
+    def enroll(self, request, pk=None):
+        """Enroll in this section if a seat is free (409 when it is full)"""
+        enrollment = registration.enroll(self.get_registering_student(request), pk)
+        return Response(StudentEnrollmentSerializer(enrollment).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def drop(self, request, pk=None):
+        """Drop this section; its seat goes to the head of the waitlist"""
+        enrollment = registration.drop(self.get_registering_student(request), pk)
+        return Response(StudentEnrollmentSerializer(enrollment).data)
+
+    @action(detail=True, methods=['get', 'post', 'delete'], conditional_models=[WaitlistEntry])
+    def waitlist(self, request, pk=None):
+        """
+        Waitlist of a full section: GET the caller's position, POST to join,
+        DELETE to leave. Staff act for a named student; their GET without
+        one lists the whole queue.
+        """
+        if request.method == 'GET' and request.user.role == 'staff' and 'student' not in request.query_params:
+            section = registration.get_section(pk)
+            entries = section.waitlist.select_related('section', 'student__user').order_by('ticket')
+            return Response(WaitlistEntrySerializer(entries, many=True).data)
 
-class EnrollmentViewSet(viewsets.ReadOnlyModelViewSet):
+        student = self.get_registering_student(request)
+        if request.method == 'POST':
+            entry = registration.join_waitlist(student, pk)
+            return Response(self.waitlist_position(entry), status=status.HTTP_201_CREATED)
+        if request.method == 'DELETE':
+            registration.leave_waitlist(student, pk)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        entry = WaitlistEntry.objects.select_related('section', 'student__user').filter(
+            section_id=pk, student=student
+        ).first()
+        if entry is None:
+            raise NotFound('Not on the waitlist of this section')
+        return Response(self.waitlist_position(entry))
+
+    def waitlist_position(self, entry):
+        data = WaitlistEntrySerializer(entry).data
+        data['waitlist_length'] = registration.waitlist_length(entry.section)
+        return data
+
+
+def student_enrollments(student_profile):
+    """A student's enrollments, newest first (my_enrollments and the dashboard)"""
+    return Enrollment.objects.filter(
+        student=student_profile
+    ).select_related('section__course', 'course').order_by('-enrollment_date')
+
+
+def grades_payload(student_profile, graded):
+    """The my_grades response for ``graded``, the student's graded enrollments"""
+    return {
+        'enrollments': StudentEnrollmentSerializer(graded, many=True).data,
+        'gpa': float(student_profile.gpa),
+        'total_credits': student_profile.gpa_credits,
+        # GPAs are maintained by TermGPA.refresh whenever grades change
+        'terms': TermGPASerializer(student_profile.term_gpas.all(), many=True).data
+    }
+
+
+class EnrollmentViewSet(ConditionalGetMixin, ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for enrollments"""
     queryset = Enrollment.objects.select_related(
         'student__user', 'section__course', 'course'
     ).all()
     serializer_class = EnrollmentSerializer
+    values_serializers = [EnrollmentValuesSerializer, StudentEnrollmentValuesSerializer]
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['student', 'section', 'course', 'semester', 'status']
+    pagination_class = KeysetPagination
     ordering_fields = ['-enrollment_date', 'semester']
 
     def get_queryset(self):
@@ -70,11 +223,10 @@ class EnrollmentViewSet(viewsets.ReadOnlyModelViewSet):
 
         # Students can only see their own enrollments
         if user.role == 'student':
-            try:
-                student_profile = StudentProfile.objects.get(user=user)
-                queryset = queryset.filter(student=student_profile)
-            except StudentProfile.DoesNotExist:
+            student_profile = self.request.profile
+            if not student_profile:
                 return Enrollment.objects.none()
+            queryset = queryset.filter(student=student_profile)
 
         # Faculty can see enrollments in their sections
         elif user.role == 'faculty':
@@ -101,21 +253,16 @@ class EnrollmentViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            enrollments = Enrollment.objects.filter(
-                student=student_profile
-            ).select_related('section__course', 'course').order_by('-enrollment_date')
-
-            serializer = StudentEnrollmentSerializer(enrollments, many=True)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = StudentEnrollmentSerializer(student_enrollments(student_profile), many=True)
+        return Response(serializer.data)
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], conditional_models=[TermGPA])
     def my_grades(self, request):
         """Get current student's grades"""
         if request.user.role != 'student':
@@ -124,27 +271,11 @@ class EnrollmentViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            enrollments = Enrollment.objects.filter(
-                student=student_profile,
-                grade__isnull=False
-            ).exclude(grade='').select_related('section__course', 'course')
-
-            serializer = StudentEnrollmentSerializer(enrollments, many=True)
-
-            # Calculate GPA
-            total_points = sum(e.grade_points * e.course.credits for e in enrollments if e.grade_points)
-            total_credits = sum(e.course.credits for e in enrollments if e.grade and e.grade not in ['W', 'I'])
-            gpa = total_points / total_credits if total_credits > 0 else 0
-
-            return Response({
-                'enrollments': serializer.data,
-                'gpa': round(float(gpa), 2),
-                'total_credits': total_credits
-            })
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        graded = student_enrollments(student_profile).exclude(grade='')
+        return Response(grades_payload(student_profile, graded))
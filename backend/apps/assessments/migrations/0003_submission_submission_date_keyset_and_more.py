@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_initial'),
+        ('users', '0003_studentprofile_gpa_credits'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['-submission_date', '-submission_id'], name='submission_date_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['student', '-submission_date', '-submission_id'], name='submission_student_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['assignment', '-submission_date', '-submission_id'], name='submission_assignment_keyset'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_enrollment_enrollment_course_keyset_and_more'),
+        ('assessments', '0003_submission_submission_date_keyset_and_more'),
+        ('users', '0004_statelessuser_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['-due_date'], name='assignment_due_date'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['status', '-due_date'], name='assignment_status_due_date'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['type', '-due_date'], name='assignment_type_due_date'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['status', '-submission_date', '-submission_id'], name='submission_status_keyset'),
+        ),
+    ]
@@ -35,6 +35,12 @@ class Assignment(models.Model):
 
     class Meta:
         ordering = ['-due_date']
+        # Filters of the assignments endpoint, each followed by the default ordering
+        indexes = [
+            models.Index(fields=['-due_date'], name='assignment_due_date'),
+            models.Index(fields=['status', '-due_date'], name='assignment_status_due_date'),
+            models.Index(fields=['type', '-due_date'], name='assignment_type_due_date'),
+        ]
 
     def __str__(self):
         return f"{self.course.course_id} - {self.title}"
@@ -68,19 +74,34 @@ class Submission(models.Model):
     class Meta:
         ordering = ['-submission_date']
         unique_together = ['assignment', 'student']
+        # Keyset pagination walks these in (submission_date, submission_id) order
+        indexes = [
+            models.Index(fields=['-submission_date', '-submission_id'], name='submission_date_keyset'),
+            models.Index(fields=['student', '-submission_date', '-submission_id'], name='submission_student_keyset'),
+            models.Index(fields=['assignment', '-submission_date', '-submission_id'],
+                         name='submission_assignment_keyset'),
+            models.Index(fields=['status', '-submission_date', '-submission_id'], name='submission_status_keyset'),
+        ]
 
     def __str__(self):
         return f"{self.student.student_id} - {self.assignment.title}"
 
     @property
     def percentage_score(self):
-        if self.points_earned and self.assignment.total_points:
-            return (self.points_earned / self.assignment.total_points) * 100
-        return None
+        return self.score_percentage(self.points_earned, self.assignment.total_points)
 
     @property
     def letter_grade(self):
-        score = self.percentage_score
+        return self.letter_for_percentage(self.percentage_score)
+
+    @staticmethod
+    def score_percentage(points_earned, total_points):
+        if points_earned and total_points:
+            return (points_earned / total_points) * 100
+        return None
+
+    @staticmethod
+    def letter_for_percentage(score):
         if score is None:
             return None
         if score >= 93: return 'A'
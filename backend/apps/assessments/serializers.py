@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Assignment, Submission
+from apps.core.values import ValuesSerializer
 
 
 class AssignmentSerializer(serializers.ModelSerializer):
@@ -50,3 +51,22 @@ class StudentSubmissionSerializer(serializers.ModelSerializer):
                   'content', 'points_earned', 'percentage_score', 'letter_grade',
                   'feedback', 'graded_date', 'status']
         read_only_fields = ['submission_id']
+
+
+class SubmissionValuesMixin:
+    """Computes the Submission properties from columns"""
+    extra_values = ('points_earned', 'assignment__total_points')
+
+    def get_percentage_score(self, row):
+        return Submission.score_percentage(row['points_earned'], row['assignment__total_points'])
+
+    def get_letter_grade(self, row):
+        return Submission.letter_for_percentage(self.get_percentage_score(row))
+
+
+class SubmissionValuesSerializer(SubmissionValuesMixin, ValuesSerializer):
+    serializer_class = SubmissionSerializer
+
+
+class StudentSubmissionValuesSerializer(SubmissionValuesMixin, ValuesSerializer):
+    serializer_class = StudentSubmissionSerializer
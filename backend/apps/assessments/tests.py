@@ -0,0 +1,43 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from apps.core.testing import ValuesSerializerTestMixin, api_client, create_section, create_student, create_user
+from .models import Assignment, Submission
+from .views import SubmissionViewSet
+
+
+class SubmissionValuesSerializerTest(ValuesSerializerTestMixin, TestCase):
+    """The submission list renders the same through its ValuesSerializers"""
+    viewset = SubmissionViewSet
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('values.admin', 'admin')
+        cls.student = create_student(1)
+        section = create_section(1)
+        rows = [
+            # Graded, ungraded, missing with no date, and a zero-point assignment
+            (100, datetime(2024, 9, 10, 14, 30, tzinfo=timezone.utc), Decimal('87.50'), 'Graded'),
+            (50, datetime(2024, 9, 17, 9, 5, 12, tzinfo=timezone.utc), None, 'Submitted'),
+            (20, None, None, 'Missing'),
+            (0, datetime(2024, 10, 1, tzinfo=timezone.utc), Decimal('0.00'), 'Graded'),
+        ]
+        for number, (total_points, submitted, points_earned, status) in enumerate(rows):
+            assignment = Assignment.objects.create(
+                assignment_id=f'ASN{number:04d}', section=section, course=section.course, title=f'Homework {number}',
+                type='Homework', description='', total_points=total_points, due_date=date(2024, 9, 10 + number),
+            )
+            Submission.objects.create(
+                submission_id=f'SUB{number:04d}', assignment=assignment, student=cls.student,
+                student_name=cls.student.user.get_full_name(), submission_date=submitted,
+                points_earned=points_earned, status=status,
+                graded_date=submitted if status == 'Graded' else None,
+            )
+        cls.url = reverse('submission-list')
+
+    def test_staff_list(self):
+        self.assertMatchesModelSerializer(api_client(self.admin), self.url)
+
+    def test_student_list(self):
+        self.assertMatchesModelSerializer(api_client(self.student.user), self.url)
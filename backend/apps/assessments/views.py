@@ -4,19 +4,31 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Assignment, Submission
 from .serializers import (
-    AssignmentSerializer, SubmissionSerializer, StudentSubmissionSerializer
+    AssignmentSerializer, SubmissionSerializer, StudentSubmissionSerializer,
+    SubmissionValuesSerializer, StudentSubmissionValuesSerializer
 )
-from apps.users.models import StudentProfile
 from apps.academics.models import Enrollment
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPagination
+from apps.core.values import ValuesListMixin
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+def student_submissions(student_profile):
+    """A student's submissions, newest first (my_submissions and the dashboard)"""
+    return Submission.objects.filter(
+        student=student_profile
+    ).select_related('assignment__course').order_by('-submission_date')
+
+
+class AssignmentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for assignments"""
     queryset = Assignment.objects.select_related('section__course', 'course').all()
     serializer_class = AssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['section', 'course', 'type', 'status']
+    # Students see the assignments of the sections they are enrolled in
+    conditional_models = [Enrollment]
 
     def get_queryset(self):
         user = self.request.user
@@ -24,15 +36,14 @@ class AssignmentViewSet(viewsets.ModelViewSet):
 
         # Students see assignments from their enrolled sections
         if user.role == 'student':
-            try:
-                student_profile = StudentProfile.objects.get(user=user)
-                enrolled_sections = Enrollment.objects.filter(
-                    student=student_profile,
-                    status='Enrolled'
-                ).values_list('section_id', flat=True)
-                queryset = queryset.filter(section_id__in=enrolled_sections)
-            except StudentProfile.DoesNotExist:
+            student_profile = self.request.profile
+            if not student_profile:
                 return Assignment.objects.none()
+            enrolled_sections = Enrollment.objects.filter(
+                student=student_profile,
+                status='Enrolled'
+            ).values_list('section_id', flat=True)
+            queryset = queryset.filter(section_id__in=enrolled_sections)
 
         # Faculty see assignments from their sections
         elif user.role == 'faculty':
@@ -47,15 +58,17 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated()]
 
 
-class SubmissionViewSet(viewsets.ModelViewSet):
+class SubmissionViewSet(ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for submissions"""
     queryset = Submission.objects.select_related(
         'assignment__course', 'student__user'
     ).all()
     serializer_class = SubmissionSerializer
+    values_serializers = [SubmissionValuesSerializer, StudentSubmissionValuesSerializer]
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['assignment', 'student', 'status']
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -63,11 +76,10 @@ class SubmissionViewSet(viewsets.ModelViewSet):
 
         # Students see only their own submissions
         if user.role == 'student':
-            try:
-                student_profile = StudentProfile.objects.get(user=user)
-                queryset = queryset.filter(student=student_profile)
-            except StudentProfile.DoesNotExist:
+            student_profile = self.request.profile
+            if not student_profile:
                 return Submission.objects.none()
+            queryset = queryset.filter(student=student_profile)
 
         # Faculty see submissions for their sections' assignments
         elif user.role == 'faculty':
@@ -89,19 +101,14 @@ class SubmissionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            submissions = Submission.objects.filter(
-                student=student_profile
-            ).select_related('assignment__course').order_by('-submission_date')
-
-            serializer = StudentSubmissionSerializer(submissions, many=True)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = StudentSubmissionSerializer(student_submissions(student_profile), many=True)
+        return Response(serializer.data)
 
     @action(detail=True, methods=['patch'])
     def grade(self, request, pk=None):
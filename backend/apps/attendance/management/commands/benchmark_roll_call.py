@@ -0,0 +1,153 @@
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.users.models import User, StudentProfile, FacultyProfile
+from apps.academics.models import Course, Section, Enrollment
+from apps.attendance.views import AttendanceRecordViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark taking attendance for a large section: one POST per student '
+        'versus a single bulk roll call. All data is created in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--students',
+            type=int,
+            default=200,
+            help='Number of students enrolled in the benchmark section (default: 200)'
+        )
+        parser.add_argument(
+            '--roll-calls',
+            type=int,
+            default=10,
+            help='Number of class days to take attendance for in each mode (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        students = max(1, options['students'])
+        roll_calls = max(1, options['roll_calls'])
+
+        with transaction.atomic():
+            faculty_user, section, student_ids = self.create_section(students)
+            single = self.run_single(faculty_user, section, student_ids, roll_calls)
+            bulk = self.run_bulk(faculty_user, section, student_ids, roll_calls)
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(f'=== Roll call for {students} students x {roll_calls} days ==='))
+        for label, (requests, elapsed) in (('Per-record POST', single), ('Bulk roll call', bulk)):
+            self.stdout.write(self.style.SUCCESS(
+                f'{label}: {requests} requests in {elapsed:.2f}s '
+                f'({requests / elapsed:,.1f} requests/sec, {roll_calls / elapsed:,.2f} roll calls/sec, '
+                f'{students * roll_calls / elapsed:,.0f} records/sec)'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {single[1] / bulk[1]:.1f}x'))
+
+    def create_section(self, students):
+        """Create a faculty member teaching one section with ``students`` enrolled students"""
+        faculty_user = User.objects.create(
+            username='rollcall-bench-faculty',
+            email='rollcall-bench-faculty@example.invalid',
+            password='!',
+            role='faculty',
+        )
+        faculty = FacultyProfile.objects.create(
+            user=faculty_user,
+            faculty_id='BENCHFAC',
+            department='Benchmark',
+            rank='Lecturer',
+            hire_date=date.today(),
+            salary=0,
+            specialization='Benchmark',
+            education='PhD',
+        )
+        course = Course.objects.create(
+            course_id='BENCH100',
+            course_name='Roll Call Benchmark',
+            description='Synthetic course created by benchmark_roll_call',
+            level='Undergraduate',
+        )
+        section = Section.objects.create(
+            section_id='BENCHSEC',
+            course=course,
+            section_number='001',
+            semester='Fall 2025',
+            year=2025,
+            instructor=faculty,
+            instructor_name='Benchmark Faculty',
+            instructor_rank='Lecturer',
+            meeting_days='MWF',
+            meeting_time='09:00-10:00',
+            capacity=students,
+            enrolled=students,
+        )
+
+        emails = [f'rollcall-bench-{i}@example.invalid' for i in range(students)]
+        User.objects.bulk_create([
+            User(username=email, email=email, password='!', first_name='Student', last_name=str(i), role='student')
+            for i, email in enumerate(emails)
+        ], batch_size=1000)
+        user_ids = User.objects.filter(email__in=emails).values_list('id', flat=True)
+        StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user_id=user_id,
+                student_id=f'BENCHSTU{i:06d}',
+                enrollment_date=date.today(),
+                major='Benchmark',
+                year_level='Freshman',
+                emergency_contact='Benchmark',
+                emergency_phone='000-000-0000',
+            )
+            for i, user_id in enumerate(user_ids)
+        ], batch_size=1000)
+        profiles = StudentProfile.objects.filter(user__email__in=emails)
+        Enrollment.objects.bulk_create([
+            Enrollment(
+                enrollment_id=f'BENCHENR{i:06d}',
+                student=profile,
+                student_name=f'Student {i}',
+                section=section,
+                course=course,
+                semester=section.semester,
+                enrollment_date=date.today(),
+            )
+            for i, profile in enumerate(profiles)
+        ], batch_size=1000)
+        return faculty_user, section, [profile.pk for profile in profiles]
+
+    def post(self, view, path, payload, user):
+        request = APIRequestFactory().post(path, payload, format='json')
+        force_authenticate(request, user=user)
+        response = view(request)
+        if response.status_code not in (200, 201):
+            raise CommandError(f'{path} returned {response.status_code}: {response.data}')
+
+    def run_single(self, user, section, student_ids, roll_calls):
+        view = AttendanceRecordViewSet.as_view({'post': 'create'})
+        started = time.perf_counter()
+        for day in range(roll_calls):
+            for student_id in student_ids:
+                self.post(view, '/api/attendance/records/', {
+                    'student': student_id,
+                    'section': section.section_id,
+                    'course_id': section.course_id,
+                    'date': date(2000, 1, 1) + timedelta(days=day),
+                    'status': 'Present',
+                }, user)
+        return roll_calls * len(student_ids), time.perf_counter() - started
+
+    def run_bulk(self, user, section, student_ids, roll_calls):
+        view = AttendanceRecordViewSet.as_view({'post': 'bulk'})
+        started = time.perf_counter()
+        for day in range(roll_calls):
+            self.post(view, '/api/attendance/records/bulk/', {
+                'section': section.section_id,
+                'date': date(2001, 1, 1) + timedelta(days=day),
+                'records': [{'student': student_id, 'status': 'Present'} for student_id in student_ids],
+            }, user)
+        return roll_calls, time.perf_counter() - started
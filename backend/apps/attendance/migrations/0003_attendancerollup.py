@@ -0,0 +1,49 @@
+# Generated by Django 5.0.14 on 2026-10-17 22:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def build_rollups(apps, schema_editor):
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceRollup = apps.get_model('attendance', 'AttendanceRollup')
+    totals = AttendanceRecord.objects.values('student_id', 'section_id').annotate(
+        total_classes=Count('record_id'),
+        present=Count('record_id', filter=Q(status='Present')),
+        absent=Count('record_id', filter=Q(status='Absent')),
+        late=Count('record_id', filter=Q(status='Late')),
+        excused=Count('record_id', filter=Q(status='Excused')),
+        last_date=Max('date'),
+    ).order_by()
+    AttendanceRollup.objects.bulk_create([AttendanceRollup(**row) for row in totals], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0002_initial'),
+        ('attendance', '0002_initial'),
+        ('users', '0002_import_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_classes', models.IntegerField(default=0)),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('late', models.IntegerField(default=0)),
+                ('excused', models.IntegerField(default=0)),
+                ('last_date', models.DateField(blank=True, null=True)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollups', to='academics.section')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollups', to='users.studentprofile')),
+            ],
+            options={
+                'unique_together': {('student', 'section')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0004_enrollment_enrollment_date_keyset_and_more'),
+        ('attendance', '0003_attendancerollup'),
+        ('users', '0003_studentprofile_gpa_credits'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['-date', '-record_id'], name='attendance_date_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['student', '-date', '-record_id'], name='attendance_student_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['section', '-date', '-record_id'], name='attendance_section_keyset'),
+        ),
+    ]
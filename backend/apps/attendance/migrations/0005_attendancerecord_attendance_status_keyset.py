@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_enrollment_enrollment_course_keyset_and_more'),
+        ('attendance', '0004_attendancerecord_attendance_date_keyset_and_more'),
+        ('users', '0004_statelessuser_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['status', '-date', '-record_id'], name='attendance_status_keyset'),
+        ),
+    ]
@@ -1,6 +1,11 @@
-from django.db import models
+import uuid
+from django.db import models, transaction
+from django.db.models import Count, Max, Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
 from apps.users.models import StudentProfile
 from apps.academics.models import Section
+from apps.core.models import TableVersion
 
 
 class AttendanceRecord(models.Model):
@@ -24,6 +29,136 @@ class AttendanceRecord(models.Model):
     class Meta:
         ordering = ['-date']
         unique_together = ['student', 'section', 'date']
+        # Keyset pagination walks these in (date, record_id) order
+        indexes = [
+            models.Index(fields=['-date', '-record_id'], name='attendance_date_keyset'),
+            models.Index(fields=['student', '-date', '-record_id'], name='attendance_student_keyset'),
+            models.Index(fields=['section', '-date', '-record_id'], name='attendance_section_keyset'),
+            models.Index(fields=['status', '-date', '-record_id'], name='attendance_status_keyset'),
+        ]
 
     def __str__(self):
         return f"{self.student.student_id} - {self.section} - {self.date}"
+
+    @staticmethod
+    def generate_record_id():
+        return f"ATT{uuid.uuid4().hex[:16].upper()}"
+
+    def save(self, *args, **kwargs):
+        if not self.record_id:
+            self.record_id = self.generate_record_id()
+        super().save(*args, **kwargs)
+
+
+class AttendanceRollup(models.Model):
+    """Attendance totals per student and section, maintained from AttendanceRecord"""
+    COUNTER_FIELDS = ['total_classes', 'present', 'absent', 'late', 'excused', 'last_date']
+
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='attendance_rollups')
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='attendance_rollups')
+    total_classes = models.IntegerField(default=0)
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+    late = models.IntegerField(default=0)
+    excused = models.IntegerField(default=0)
+    last_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['student', 'section']
+
+    def __str__(self):
+        return f"{self.student.student_id} - {self.section}: {self.attendance_percentage}%"
+
+    @property
+    def attendance_percentage(self):
+        if not self.total_classes:
+            return 0
+        return round((self.present + self.late) / self.total_classes * 100, 2)
+
+    @classmethod
+    def totals(cls, records):
+        """Rollup counters of ``records`` grouped by student and section"""
+        return records.values('student_id', 'section_id').annotate(
+            total_classes=Count('record_id'),
+            present=Count('record_id', filter=Q(status='Present')),
+            absent=Count('record_id', filter=Q(status='Absent')),
+            late=Count('record_id', filter=Q(status='Late')),
+            excused=Count('record_id', filter=Q(status='Excused')),
+            last_date=Max('date'),
+        ).order_by()
+
+    @classmethod
+    def refresh(cls, pairs):
+        """
+        Recompute the rollups of the given (student_id, section_id) pairs.
+        Their rows are locked before the records are counted, so a
+        concurrent refresh of the same pairs waits for this transaction and
+        then counts its records as well.
+        """
+        pairs = set(pairs)
+        if not pairs:
+            return
+        student_ids = {student_id for student_id, _ in pairs}
+        section_ids = {section_id for _, section_id in pairs}
+
+        with transaction.atomic():
+            # A missing rollup is inserted first so that there is a row to
+            # lock; the insert waits for a concurrent one of the same pair
+            cls.objects.bulk_create(
+                [cls(student_id=student_id, section_id=section_id) for student_id, section_id in sorted(pairs)],
+                ignore_conflicts=True,
+            )
+            candidates = cls.objects.select_for_update().filter(
+                student_id__in=student_ids, section_id__in=section_ids
+            ).order_by('student_id', 'section_id').values_list('pk', 'student_id', 'section_id')
+            locked = {(student_id, section_id): pk for pk, student_id, section_id in candidates}
+
+            records = AttendanceRecord.objects.filter(student_id__in=student_ids, section_id__in=section_ids)
+            rollups = [
+                cls(**row) for row in cls.totals(records)
+                if (row['student_id'], row['section_id']) in pairs
+            ]
+            cls.objects.bulk_create(
+                rollups,
+                update_conflicts=True,
+                unique_fields=['student', 'section'],
+                update_fields=cls.COUNTER_FIELDS,
+            )
+
+            # Pairs without any records left no longer have a rollup
+            stale = pairs - {(rollup.student_id, rollup.section_id) for rollup in rollups}
+            if stale:
+                cls.objects.filter(pk__in=[locked[pair] for pair in stale]).delete()
+            TableVersion.bump(cls)
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """Recompute every rollup from the attendance records"""
+        with transaction.atomic():
+            cls.objects.all().delete()
+            rollups = [cls(**row) for row in cls.totals(AttendanceRecord.objects.all()).iterator()]
+            cls.objects.bulk_create(rollups, batch_size=batch_size)
+            TableVersion.bump(cls)
+        return len(rollups)
+
+
+@receiver(pre_save, sender=AttendanceRecord)
+def remember_attendance_rollup(sender, instance, **kwargs):
+    """Remember which rollup an existing record counted towards before it changes"""
+    instance._previous_rollup = AttendanceRecord.objects.filter(
+        pk=instance.pk
+    ).values_list('student_id', 'section_id').first()
+
+
+@receiver(post_save, sender=AttendanceRecord)
+def update_attendance_rollup(sender, instance, **kwargs):
+    pairs = {(instance.student_id, instance.section_id)}
+    previous = getattr(instance, '_previous_rollup', None)
+    if previous:
+        pairs.add(previous)
+    AttendanceRollup.refresh(pairs)
+
+
+@receiver(post_delete, sender=AttendanceRecord)
+def remove_from_attendance_rollup(sender, instance, **kwargs):
+    AttendanceRollup.refresh([(instance.student_id, instance.section_id)])
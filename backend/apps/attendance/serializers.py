@@ -1,7 +1,8 @@
 from rest_framework import serializers
-from .models import AttendanceRecord
+from .models import AttendanceRecord, AttendanceRollup
 from apps.academics.models import Section
 from apps.users.models import StudentProfile
+from apps.core.values import ValuesSerializer
 
 
 class AttendanceRecordSerializer(serializers.ModelSerializer):
@@ -22,13 +23,55 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         return str(obj.section) if obj.section else None
 
 
+class AttendanceRecordValuesSerializer(ValuesSerializer):
+    serializer_class = AttendanceRecordSerializer
+    extra_values = ('student__user__first_name', 'student__user__last_name', 'section__course__course_name',
+                    'section__course', 'section__section_number', 'section__semester')
+
+    def get_student_name(self, row):
+        return self.full_name(row['student__user__first_name'], row['student__user__last_name'])
+
+    def get_course_name(self, row):
+        return row['section__course__course_name']
+
+    def get_section_info(self, row):
+        # Section.__str__
+        return f"{row['section__course']} - {row['section__section_number']} ({row['section__semester']})"
+
+
+class AttendanceRollCallEntrySerializer(serializers.Serializer):
+    """One student's attendance in a roll call"""
+    student = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=AttendanceRecord.STATUS_CHOICES)
+    notes = serializers.CharField(required=False, allow_blank=True)
+
+
+class AttendanceRollCallSerializer(serializers.Serializer):
+    """Attendance for a section roster on one date"""
+    section = serializers.PrimaryKeyRelatedField(queryset=Section.objects.select_related('instructor'))
+    date = serializers.DateField()
+    records = AttendanceRollCallEntrySerializer(many=True, allow_empty=False)
+
+
 class StudentAttendanceSummarySerializer(serializers.Serializer):
     """Summary of student's attendance for a section"""
     section_id = serializers.CharField()
-    course_name = serializers.CharField()
+    course_name = serializers.CharField(source='section.course.course_name')
     total_classes = serializers.IntegerField()
     present = serializers.IntegerField()
     absent = serializers.IntegerField()
     late = serializers.IntegerField()
     excused = serializers.IntegerField()
     attendance_percentage = serializers.FloatField()
+
+
+class AttendanceRollupSerializer(serializers.ModelSerializer):
+    """Attendance totals of one student in a section"""
+    student_id = serializers.CharField(source='student.student_id', read_only=True)
+    student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
+    attendance_percentage = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = AttendanceRollup
+        fields = ['student', 'student_id', 'student_name', 'section', 'total_classes',
+                  'present', 'absent', 'late', 'excused', 'attendance_percentage', 'last_date']
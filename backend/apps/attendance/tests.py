@@ -0,0 +1,190 @@
+from datetime import date, timedelta
+from django.test import TestCase
+from django.urls import reverse
+from apps.academics.models import Course, Enrollment, Section
+from apps.core.testing import (
+    ValuesSerializerTestMixin, api_client, create_faculty, create_section, create_student, create_user,
+)
+from apps.users.models import StudentProfile, User
+from .models import AttendanceRecord, AttendanceRollup
+from .views import AttendanceRecordViewSet
+
+
+class MySummaryQueryCountTest(TestCase):
+    """my_summary reads the rollups in one query, however many sections the student has"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            username='summary.student', email='summary.student@example.edu', password='x',
+            first_name='Summary', last_name='Student', role='student',
+        )
+        cls.student = StudentProfile.objects.create(
+            user=user, student_id='STU900001', enrollment_date=date(2024, 8, 26), major='History',
+            year_level='Junior', emergency_contact='Contact', emergency_phone='555-0100',
+        )
+        for number, semester in enumerate(['Fall 2024', 'Fall 2024', 'Spring 2025', 'Spring 2025', 'Spring 2025']):
+            course = Course.objects.create(course_id=f'HIST9{number:02d}', course_name=f'History {number}')
+            section = Section.objects.create(
+                section_id=f'SEC9000{number:02d}', course=course, section_number='01', semester=semester,
+                year=2024 if semester == 'Fall 2024' else 2025, instructor_name='Instructor',
+                instructor_rank='Lecturer', meeting_days='MWF', meeting_time=f'{8 + number}:00-{8 + number}:50',
+            )
+            Enrollment.objects.create(
+                enrollment_id=f'ENR9000{number:02d}', student=cls.student, student_name='Summary Student',
+                section=section, course=course, semester=semester, enrollment_date=date(2024, 8, 26),
+            )
+            for day, status in enumerate(['Present', 'Absent', 'Late']):
+                AttendanceRecord.objects.create(
+                    record_id=f'ATT9{number:02d}{day:02d}', student=cls.student, student_name='Summary Student',
+                    section=section, course_id=course.course_id, date=date(2024, 9, 2) + timedelta(days=day),
+                    status=status,
+                )
+
+    def setUp(self):
+        self.client = api_client(self.student.user)
+        self.url = reverse('attendance-record-my-summary')
+        # The first request caches the token version
+        self.client.get(self.url)
+
+    def test_all_semesters(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]['total_classes'], 3)
+
+    def test_one_semester(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'semester': 'Fall 2024'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+
+class AttendanceRecordValuesSerializerTest(ValuesSerializerTestMixin, TestCase):
+    """The attendance record list renders the same through its ValuesSerializer"""
+    viewset = AttendanceRecordViewSet
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('values.admin', 'admin')
+        cls.students = [create_student(1), create_student(2, first_name='Zoë', last_name='')]
+        for number in range(2):
+            section = create_section(number, ['Fall 2024', 'Spring 2025'][number])
+            for student in cls.students:
+                for day, status in enumerate(['Present', 'Late', 'Excused']):
+                    AttendanceRecord.objects.create(
+                        student=student, student_name=student.user.get_full_name(), section=section,
+                        course_id=section.course_id, date=date(2024, 9, 2) + timedelta(days=day), status=status,
+                        notes='Doctor\'s note' if status == 'Excused' else '',
+                    )
+        cls.url = reverse('attendance-record-list')
+
+    def test_staff_list(self):
+        self.assertMatchesModelSerializer(api_client(self.admin), self.url)
+
+    def test_filtered(self):
+        self.assertMatchesModelSerializer(api_client(self.admin), self.url, {'status': 'Excused'})
+
+    def test_student_list(self):
+        self.assertMatchesModelSerializer(api_client(self.students[1].user), self.url)
+
+
+class RollCallTest(TestCase):
+    """POST records/bulk/ records a whole section roster on one date"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = create_faculty(1)
+        cls.section = create_section(1, instructor=cls.faculty)
+        cls.students = [create_student(number) for number in range(1, 6)]
+        cls.outsider = create_student(9)
+        for student in cls.students:
+            Enrollment.objects.create(
+                enrollment_id=f'ENR{student.pk:06d}', student=student, student_name=student.user.get_full_name(),
+                section=cls.section, course=cls.section.course, semester=cls.section.semester,
+                enrollment_date=date(2024, 8, 26),
+            )
+        cls.date = date(2024, 9, 2)
+        for student, status in zip(cls.students, ['Absent', 'Present']):
+            AttendanceRecord.objects.create(
+                student=student, student_name=student.user.get_full_name(), section=cls.section,
+                course_id=cls.section.course_id, date=cls.date, status=status,
+            )
+        cls.url = reverse('attendance-record-bulk')
+
+    def setUp(self):
+        self.client = api_client(self.faculty.user)
+
+    def roll_call(self, statuses, day=None):
+        return self.client.post(self.url, {
+            'section': self.section.pk,
+            'date': day or self.date,
+            'records': [{'student': student, 'status': status} for student, status in statuses],
+        }, format='json')
+
+    def statuses(self, day=None):
+        return dict(AttendanceRecord.objects.filter(
+            section=self.section, date=day or self.date
+        ).values_list('student_id', 'status'))
+
+    def test_created_updated_and_unchanged(self):
+        roster = ['Present', 'Present', 'Late', 'Excused', 'Absent']
+        response = self.roll_call(zip([student.pk for student in self.students], roster))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.data['created'], response.data['updated'], response.data['unchanged']), (3, 1, 1)
+        )
+        self.assertEqual(
+            [result['outcome'] for result in response.data['results']],
+            ['updated', 'unchanged', 'created', 'created', 'created'],
+        )
+        self.assertEqual(self.statuses(), {student.pk: status for student, status in zip(self.students, roster)})
+
+    def test_rollups_after_roll_calls(self):
+        ids = [student.pk for student in self.students]
+        self.roll_call(zip(ids, ['Present', 'Late', 'Absent', 'Excused', 'Present']))
+        self.roll_call(zip(ids, ['Late', 'Late', 'Absent', 'Present', 'Absent']), self.date + timedelta(days=2))
+        rollups = {
+            rollup.student_id: rollup
+            for rollup in AttendanceRollup.objects.filter(section=self.section)
+        }
+        self.assertEqual(len(rollups), 5)
+        expected = {
+            ids[0]: (2, 1, 0, 1, 0), ids[1]: (2, 0, 0, 2, 0), ids[2]: (2, 0, 2, 0, 0),
+            ids[3]: (2, 1, 0, 0, 1), ids[4]: (2, 1, 1, 0, 0),
+        }
+        for student_id, (total, present, absent, late, excused) in expected.items():
+            rollup = rollups[student_id]
+            self.assertEqual(
+                (rollup.total_classes, rollup.present, rollup.absent, rollup.late, rollup.excused),
+                (total, present, absent, late, excused),
+            )
+            self.assertEqual(rollup.last_date, self.date + timedelta(days=2))
+
+    def assertRejected(self, statuses, bad_student):
+        before = self.statuses()
+        response = self.roll_call(statuses)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['student'] for error in response.data['errors']], [bad_student])
+        self.assertEqual(self.statuses(), before)
+        self.assertEqual(AttendanceRollup.objects.get(student=self.students[0]).absent, 1)
+
+    def test_unknown_student_rejected(self):
+        self.assertRejected([(self.students[0].pk, 'Present'), (987654, 'Present')], 987654)
+
+    def test_student_not_enrolled_rejected(self):
+        self.assertRejected(
+            [(self.students[0].pk, 'Present'), (self.students[2].pk, 'Late'), (self.outsider.pk, 'Present')],
+            self.outsider.pk,
+        )
+
+    def test_query_count_does_not_grow_with_the_roster(self):
+        # Caches the token version
+        self.roll_call([(self.students[0].pk, 'Absent')])
+        # Section, roster, the day's records and the upsert; the rollup
+        # refresh inserts, locks, counts and upserts; four savepoint queries
+        with self.assertNumQueries(12):
+            self.roll_call([(self.students[0].pk, 'Late')])
+        with self.assertNumQueries(12):
+            self.roll_call(zip([student.pk for student in self.students], ['Present', 'Late', 'Absent'] * 2))
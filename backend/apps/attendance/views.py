@@ -1,23 +1,56 @@
+from collections import Counter
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
-from .models import AttendanceRecord
-from .serializers import AttendanceRecordSerializer, StudentAttendanceSummarySerializer
-from apps.users.models import StudentProfile
-from apps.academics.models import Enrollment
-
-
-class AttendanceRecordViewSet(viewsets.ModelViewSet):
+from django.db import transaction
+from .models import AttendanceRecord, AttendanceRollup
+from .serializers import (
+    AttendanceRecordSerializer, AttendanceRollCallSerializer, AttendanceRollupSerializer,
+    StudentAttendanceSummarySerializer, AttendanceRecordValuesSerializer
+)
+from apps.academics.models import Enrollment, Section
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPagination
+from apps.core.values import ValuesListMixin
+from apps.core.models import TableVersion
+
+
+def student_attendance(student_profile):
+    """A student's attendance records, newest first (my_attendance and the dashboard)"""
+    records = list(AttendanceRecord.objects.filter(
+        student=student_profile
+    ).select_related('section__course').order_by('-date'))
+    for record in records:
+        # The serializer reads the student's name; reuse the loaded profile
+        record.student = student_profile
+    return records
+
+
+def attendance_summaries(student_profile, semester=None):
+    """Attendance totals of each section a student is enrolled in (my_summary and the dashboard)"""
+    # Totals are maintained in AttendanceRollup, one row per section
+    summaries = AttendanceRollup.objects.filter(
+        student=student_profile,
+        section__enrollments__student=student_profile,
+        section__enrollments__status='Enrolled'
+    ).select_related('section__course')
+    if semester:
+        summaries = summaries.filter(section__semester=semester)
+    return summaries.order_by('-section__enrollments__enrollment_date', 'section_id')
+
+
+class AttendanceRecordViewSet(ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for attendance records"""
     queryset = AttendanceRecord.objects.select_related(
         'student__user', 'section__course'
     ).all()
     serializer_class = AttendanceRecordSerializer
+    values_serializers = [AttendanceRecordValuesSerializer]
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['student', 'section', 'date', 'status']
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -25,11 +58,10 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
 
         # Students can only see their own attendance
         if user.role == 'student':
-            try:
-                student_profile = StudentProfile.objects.get(user=user)
-                queryset = queryset.filter(student=student_profile)
-            except StudentProfile.DoesNotExist:
+            student_profile = self.request.profile
+            if not student_profile:
                 return AttendanceRecord.objects.none()
+            queryset = queryset.filter(student=student_profile)
 
         # Faculty can see attendance for their sections
         elif user.role == 'faculty':
@@ -39,10 +71,103 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """Faculty can create/update attendance, students can only read"""
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk']:
             return [permissions.IsAuthenticated(), IsFaculty()]
         return [permissions.IsAuthenticated()]
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Record attendance for a section roster on one date in a single batched write"""
+        serializer = AttendanceRollCallSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        section = serializer.validated_data['section']
+        date = serializer.validated_data['date']
+        entries = serializer.validated_data['records']
+
+        if section.instructor is None or section.instructor.user_id != request.user.id:
+            return Response(
+                {'detail': 'You can only take attendance for your own sections'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # Validate the whole roster and load the day's records in two queries
+        student_ids = {entry['student'] for entry in entries}
+        roster = dict(
+            Enrollment.objects.filter(
+                section=section, student_id__in=student_ids, status__in=['Enrolled', 'Completed']
+            ).values_list('student_id', 'student_name')
+        )
+        existing = {
+            record.student_id: record
+            for record in AttendanceRecord.objects.filter(section=section, date=date, student_id__in=roster)
+        }
+
+        results, changed, seen = [], [], set()
+        for entry in entries:
+            student_id = entry['student']
+            if student_id in seen:
+                results.append({'student': student_id, 'outcome': 'error',
+                                'detail': 'Student appears more than once in the roster'})
+                continue
+            seen.add(student_id)
+            if student_id not in roster:
+                results.append({'student': student_id, 'outcome': 'error',
+                                'detail': 'Student is not enrolled in this section'})
+                continue
+
+            record = existing.get(student_id)
+            if record is None:
+                record = AttendanceRecord(
+                    record_id=AttendanceRecord.generate_record_id(),
+                    student_id=student_id,
+                    student_name=roster[student_id],
+                    section=section,
+                    course_id=section.course_id,
+                    date=date,
+                    status=entry['status'],
+                    notes=entry.get('notes', '')
+                )
+                outcome = 'created'
+            else:
+                notes = entry.get('notes', record.notes)
+                if (record.status, record.notes) == (entry['status'], notes):
+                    outcome = 'unchanged'
+                else:
+                    record.status = entry['status']
+                    record.notes = notes
+                    outcome = 'updated'
+            if outcome != 'unchanged':
+                changed.append(record)
+            results.append({'student': student_id, 'outcome': outcome, 'record_id': record.record_id})
+
+        # A roll call is recorded whole or not at all
+        errors = [result for result in results if result['outcome'] == 'error']
+        if errors:
+            return Response(
+                {'detail': 'No attendance was recorded, fix these entries first', 'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            AttendanceRecord.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=['student', 'section', 'date'],
+                update_fields=['status', 'notes']
+            )
+            TableVersion.bump(AttendanceRecord)
+            AttendanceRollup.refresh({(record.student_id, section.section_id) for record in changed})
+
+        outcomes = Counter(result['outcome'] for result in results)
+        return Response({
+            'section': section.section_id,
+            'date': date,
+            'created': outcomes['created'],
+            'updated': outcomes['updated'],
+            'unchanged': outcomes['unchanged'],
+            'results': results
+        })
+
     @action(detail=False, methods=['get'])
     def my_attendance(self, request):
         """Get current student's attendance records"""
@@ -52,73 +177,57 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            records = AttendanceRecord.objects.filter(
-                student=student_profile
-            ).select_related('section__course').order_by('-date')
-
-            serializer = AttendanceRecordSerializer(records, many=True)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = AttendanceRecordSerializer(student_attendance(student_profile), many=True)
+        return Response(serializer.data)
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], conditional_models=[AttendanceRollup, Enrollment])
     def my_summary(self, request):
-        """Get attendance summary by section for current student"""
+        """Get attendance summary by section for current student, optionally for one ?semester="""
         if request.user.role != 'student':
             return Response(
                 {'detail': 'Only students can access this endpoint'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-
-            # Get all enrolled sections
-            enrollments = Enrollment.objects.filter(
-                student=student_profile,
-                status='Enrolled'
-            ).select_related('section__course')
-
-            summaries = []
-            for enrollment in enrollments:
-                section = enrollment.section
-                records = AttendanceRecord.objects.filter(
-                    student=student_profile,
-                    section=section
-                )
-
-                total = records.count()
-                if total > 0:
-                    present = records.filter(status='Present').count()
-                    absent = records.filter(status='Absent').count()
-                    late = records.filter(status='Late').count()
-                    excused = records.filter(status='Excused').count()
-                    percentage = (present + late) / total * 100
-
-                    summaries.append({
-                        'section_id': section.section_id,
-                        'course_name': section.course.course_name,
-                        'total_classes': total,
-                        'present': present,
-                        'absent': absent,
-                        'late': late,
-                        'excused': excused,
-                        'attendance_percentage': round(percentage, 2)
-                    })
-
-            serializer = StudentAttendanceSummarySerializer(summaries, many=True)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        summaries = attendance_summaries(student_profile, request.query_params.get('semester'))
+        serializer = StudentAttendanceSummarySerializer(summaries, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], conditional_models=[AttendanceRollup])
+    def section_summary(self, request):
+        """Get attendance totals for every student in one of the faculty member's sections"""
+        if request.user.role != 'faculty':
+            return Response(
+                {'detail': 'Only faculty can access this endpoint'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        section_id = request.query_params.get('section')
+        if not Section.objects.filter(section_id=section_id, instructor__user=request.user).exists():
+            return Response(
+                {'detail': 'Section not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        rollups = AttendanceRollup.objects.filter(
+            section_id=section_id
+        ).select_related('student__user').order_by('student__student_id')
+        serializer = AttendanceRollupSerializer(rollups, many=True)
+        return Response(serializer.data)
+
 
 class IsFaculty(permissions.BasePermission):
     """Permission class to check if user is faculty"""
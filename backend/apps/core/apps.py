@@ -0,0 +1,32 @@
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
+
+
+# Tables that are only written in bulk by their own refresh/rebuild methods,
+# which bump their versions directly. Connecting delete receivers would also
+# disable Django's fast queryset deletes for them.
+UNTRACKED_MODELS = {
+    'core.tableversion',
+    'users.importfingerprint',
+    'academics.termgpa',
+    'attendance.attendancerollup',
+}
+
+
+def bump_table_version(sender, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no endpoint returns
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    from .models import TableVersion
+    # Proxy models share their concrete model's table
+    TableVersion.bump(sender._meta.concrete_model)
+
+
+class CoreConfig(AppConfig):
+    name = 'apps.core'
+
+    def ready(self):
+        for model in apps.get_models():
+            if model.__module__.startswith('apps.') and model._meta.label_lower not in UNTRACKED_MODELS:
+                post_save.connect(bump_table_version, sender=model)
+                post_delete.connect(bump_table_version, sender=model)
@@ -0,0 +1,81 @@
+"""
+Response cache for read-only catalog endpoints.
+
+Cached responses are keyed on the request path, the normalized query string
+and the TableVersion counter of every model the response is built from.
+Counters live in the database and are bumped after commit by every save,
+delete and bulk write (see TableVersion.bump), so a change made by any
+worker or management command moves every process to new keys, and a
+response read before the commit can never be stored under the new ones.
+Stale entries are simply never read again and expire.
+"""
+import hashlib
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+from .models import TableVersion
+
+KEY_PREFIX = 'catalog'
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def model_versions(models, stamps=None):
+    """Current TableVersion counter of each model, reusing ``stamps`` when they cover every model"""
+    labels = [model._meta.label_lower for model in models]
+    if stamps is None or not set(labels) <= stamps.keys():
+        stamps = TableVersion.stamps(models)
+    return [str(stamps[label][0]) for label in labels]
+
+
+def normalized_query_string(query_params):
+    """Query string with parameters sorted by name, keeping repeated values in order"""
+    return urlencode(sorted(query_params.lists()), doseq=True)
+
+
+class CachedCatalogMixin:
+    """
+    Cache ``list`` and ``retrieve`` responses of a read-only viewset.
+
+    ``cache_models`` lists every model whose rows appear in the response,
+    including related models rendered by the serializer.
+    """
+    cache_models = ()
+
+    def should_cache(self, request):
+        return request.method == 'GET'
+
+    def get_cache_key(self, request):
+        # ConditionalGetMixin has usually read the counters for this request already
+        versions = ':'.join(model_versions(self.cache_models, getattr(self, 'conditional_stamps', None)))
+        raw = f'{request.get_host()}{request.path}?{normalized_query_string(request.query_params)}'
+        digest = hashlib.md5(f'{versions}|{raw}'.encode()).hexdigest()
+        return f'{KEY_PREFIX}:response:{self.basename}:{digest}'
+
+    def cached(self, handler, request, *args, **kwargs):
+        if not self.should_cache(request):
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
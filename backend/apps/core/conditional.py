@@ -0,0 +1,103 @@
+"""
+Conditional GET support (ETag / Last-Modified) for API views.
+
+Validators are derived from TableVersion counters rather than from the
+response body, so a matching request is answered with 304 Not Modified
+before any queryset or serializer runs.
+"""
+import hashlib
+from datetime import datetime, time
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from .cache import normalized_query_string
+from .models import TableVersion
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def related_models(models):
+    """``models`` plus every model they reach through forward foreign keys"""
+    seen = set()
+    pending = list(models)
+    while pending:
+        model = pending.pop()
+        if model in seen:
+            continue
+        seen.add(model)
+        for field in model._meta.concrete_fields:
+            if field.is_relation and field.related_model is not None:
+                pending.append(field.related_model)
+    return seen
+
+
+class ConditionalGetMixin:
+    """
+    Emit ETag and Last-Modified on successful GET responses and answer
+    conditional requests with 304 Not Modified.
+
+    A response is assumed to depend on the view's queryset model, on
+    ``conditional_models`` and on every model those reference through
+    foreign keys. Views that read other tables (for example through a
+    reverse relation) must list them in ``conditional_models``; a custom
+    action can pass its own list with ``@action(conditional_models=[...])``.
+    Validators also change with the user, the query string, the renderer
+    and the date, since some fields (overdue, expired) depend on today.
+    An action that never reads the database opts out with
+    ``@action(conditional=False)``.
+    """
+    conditional = True
+    conditional_models = ()
+
+    def get_conditional_models(self):
+        models = list(self.conditional_models)
+        queryset = getattr(self, 'queryset', None)
+        if queryset is not None:
+            models.append(queryset.model)
+        return {model for model in related_models(models) if model.__module__.startswith('apps.')}
+
+    def get_validators(self, request):
+        stamps = self.conditional_stamps = TableVersion.stamps(self.get_conditional_models())
+        today = timezone.localdate()
+        key = '|'.join([
+            ','.join(f'{label}:{version}' for label, (version, _) in sorted(stamps.items())),
+            str(request.user.pk),
+            request.path,
+            normalized_query_string(request.query_params),
+            request.accepted_media_type or '',
+            today.isoformat(),
+        ])
+        etag = f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+        midnight = timezone.make_aware(datetime.combine(today, time.min))
+        last_modified = max([updated_at for _, updated_at in stamps.values() if updated_at] + [midnight])
+        return etag, int(last_modified.timestamp())
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = self.conditional_stamps = None
+        if request.method in ('GET', 'HEAD') and self.conditional:
+            etag, last_modified = self.get_validators(request)
+            self.validators = etag, last_modified
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            # Let browsers keep the body but revalidate it on every request
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
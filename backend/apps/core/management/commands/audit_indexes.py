@@ -0,0 +1,213 @@
+import json
+import re
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.filters import OrderingFilter
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+
+# Plain table scans in SQLite's EXPLAIN QUERY PLAN output ("SCAN t", not "SCAN t USING INDEX i")
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)$')
+INDEX_SCANS = ('Index Scan', 'Index Only Scan')
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every list endpoint with each of its filters and orderings, '
+        'EXPLAIN the queries it runs and flag table scans that no index serves.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=1000,
+            help='Ignore scans of tables with fewer rows than this (default: 1000)'
+        )
+        parser.add_argument(
+            '--endpoint',
+            default='',
+            help='Only audit endpoints whose path contains this text'
+        )
+        parser.add_argument(
+            '--show-plans',
+            action='store_true',
+            help='Print the plan of every flagged query'
+        )
+
+    def handle(self, *args, **options):
+        self.min_rows = options['min_rows']
+        self.show_plans = options['show_plans']
+        self.row_counts = {}
+        self.leading_columns = {}
+        self.tables = {model._meta.db_table: model for model in apps.get_models()}
+        clients = self.get_clients()
+
+        explained, flagged = 0, []
+        seen = set()
+        # Requests are made in-process, so accept the test client's host
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for path, view, action in self.get_endpoints(options['endpoint']):
+                for url in self.get_variants(path, view, action):
+                    for role, client in clients.items():
+                        for sql in self.capture(client, url):
+                            if sql in seen:
+                                continue
+                            seen.add(sql)
+                            explained += 1
+                            for scan in self.find_scans(sql):
+                                flagged.append((url, role, scan, sql))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {explained} queries explained on {connection.vendor}, {len(flagged)} unindexed scans ==='
+        ))
+        for url, role, scan, sql in flagged:
+            self.stdout.write(self.style.WARNING(f'GET {url} [{role}]: {scan}'))
+            if self.show_plans:
+                self.stdout.write(f'    {sql}')
+        if flagged:
+            raise CommandError(f'{len(flagged)} queries scan tables without a supporting index')
+
+    def get_clients(self):
+        """One client per role, authenticated as a user that has data to see"""
+        users = {
+            'student': User.objects.filter(role='student', student_profile__enrollments__isnull=False),
+            'faculty': User.objects.filter(role='faculty', faculty_profile__sections_teaching__isnull=False),
+            'staff': User.objects.filter(role='staff'),
+        }
+        clients = {}
+        for role, queryset in users.items():
+            user = queryset.order_by('pk').first()
+            if user is None:
+                continue
+            client = APIClient()
+            client.force_authenticate(user)
+            clients[role] = client
+        return clients
+
+    def get_endpoints(self, text):
+        """(path, view, action) for every collection route of the project's API views"""
+        endpoints = []
+
+        def walk(patterns, prefix):
+            for pattern in patterns:
+                if isinstance(pattern, URLResolver):
+                    walk(pattern.url_patterns, prefix + str(pattern.pattern))
+                    continue
+                if not isinstance(pattern, URLPattern) or pattern.pattern.regex.groups:
+                    continue
+                view = getattr(pattern.callback, 'cls', None)
+                actions = getattr(pattern.callback, 'actions', None) or {'get': 'get'}
+                if view is None or 'get' not in actions or not view.__module__.startswith('apps.'):
+                    continue
+                path = '/' + (prefix + str(pattern.pattern)).replace('^', '').replace('$', '')
+                if text in path:
+                    endpoints.append((path, view, actions['get']))
+
+        walk(get_resolver().url_patterns, '')
+        return endpoints
+
+    def get_variants(self, path, view, action):
+        """The endpoint alone and, for lists, with each filter and each ordering"""
+        variants = [path]
+        queryset = getattr(view, 'queryset', None)
+        if queryset is None or action != 'list':
+            return variants
+        model = queryset.model
+        for name in getattr(view, 'filterset_fields', None) or ():
+            value = model._default_manager.exclude(**{f'{name}__isnull': True}).values_list(
+                name, flat=True
+            ).order_by().first()
+            if value is not None:
+                variants.append(f'{path}?{name}={value}')
+        if OrderingFilter in getattr(view, 'filter_backends', ()):
+            for name in getattr(view, 'ordering_fields', None) or ():
+                variants.append(f'{path}?ordering={name}')
+        return variants
+
+    def capture(self, client, url):
+        # HEAD runs the same queries as GET but skips the catalog response cache
+        with CaptureQueriesContext(connection) as queries:
+            client.head(url)
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and '"core_tableversion"' not in query['sql']
+        ]
+
+    def find_scans(self, sql):
+        if connection.vendor == 'postgresql':
+            return self.postgresql_scans(sql)
+        if connection.vendor == 'sqlite':
+            return self.sqlite_scans(sql)
+        return []
+
+    def postgresql_scans(self, sql):
+        """
+        Scans that read a whole table. Sequential scans are priced out first,
+        so one that remains means no index can serve the query at all.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        scans = []
+        pending = [plan[0]['Plan']]
+        while pending:
+            node = pending.pop()
+            pending.extend(node.get('Plans', ()))
+            table = node.get('Relation Name')
+            if table is None or self.row_count(table) < self.min_rows:
+                continue
+            if node['Node Type'] == 'Seq Scan':
+                scans.append(self.describe('Seq Scan', table, node.get('Filter')))
+            elif node['Node Type'] in INDEX_SCANS and 'Filter' in node and 'Index Cond' not in node:
+                # The index only supplies the order and rows are filtered as they are read.
+                # Fine when the planner passed over an index on the filtered column (the
+                # filter matches most rows), a missing index otherwise.
+                columns = set(re.findall(r'\b(\w+)\b', node['Filter']))
+                if not columns & self.get_leading_columns(table):
+                    scans.append(self.describe(f'Full scan of {node["Index Name"]}', table, node['Filter']))
+        return scans
+
+    def get_leading_columns(self, table):
+        """First column of every index on ``table``"""
+        if table not in self.leading_columns:
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(cursor, table)
+            self.leading_columns[table] = {
+                constraint['columns'][0] for constraint in constraints.values()
+                if (constraint['index'] or constraint['unique']) and constraint['columns']
+            }
+        return self.leading_columns[table]
+
+    def sqlite_scans(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            details = [row[3] for row in cursor.fetchall()]
+        aliases = dict((alias, table) for table, alias in re.findall(r'"(\w+)" (T\d+)', sql))
+        scans = []
+        for detail in details:
+            match = SQLITE_SCAN.match(detail)
+            if match is None:
+                continue
+            table = aliases.get(match.group(1), match.group(1))
+            if self.row_count(table) >= self.min_rows:
+                scans.append(self.describe('SCAN', table, None))
+        return scans
+
+    def row_count(self, table):
+        if table not in self.row_counts:
+            model = self.tables.get(table)
+            self.row_counts[table] = model._default_manager.count() if model else 0
+        return self.row_counts[table]
+
+    def describe(self, scan, table, condition):
+        text = f'{scan} on {table} ({self.row_count(table):,} rows)'
+        return f'{text} filter {condition}' if condition else text
@@ -0,0 +1,81 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.academics.views import EnrollmentViewSet
+from apps.assessments.views import SubmissionViewSet
+from apps.attendance.views import AttendanceRecordViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the same rows with each ModelSerializer and its ValuesSerializer, '
+        'check that the JSON is byte-identical and compare the time taken.'
+    )
+
+    viewsets = [EnrollmentViewSet, SubmissionViewSet, AttendanceRecordViewSet]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000,
+            help='Number of rows rendered per serializer, like one large page (default: 1000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per serializer; the fastest is reported (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        rows = max(1, options['rows'])
+        repeat = max(1, options['repeat'])
+        renderer = JSONRenderer()
+        mismatches = []
+
+        self.stdout.write(self.style.SUCCESS(f'=== {rows} rows per serializer, best of {repeat} ==='))
+        for viewset in self.viewsets:
+            model = viewset.queryset.model
+            ordering = list(model._meta.ordering)
+            # Break ties on the primary key in the leading direction, as the paginator does
+            descending = bool(ordering) and ordering[0].startswith('-')
+            queryset = viewset.queryset.order_by(*ordering, f'{"-" if descending else ""}{model._meta.pk.name}')
+            for values_serializer_class in viewset.values_serializers:
+                serializer_class = values_serializer_class.serializer_class
+                values_serializer = values_serializer_class()
+
+                def render_models():
+                    return renderer.render(serializer_class(list(queryset[:rows]), many=True).data)
+
+                def render_values():
+                    return renderer.render(values_serializer.to_representation(
+                        values_serializer.get_queryset(queryset)[:rows]
+                    ))
+
+                (expected, model_time), (actual, values_time) = (
+                    self.best_of(repeat, render_models), self.best_of(repeat, render_values)
+                )
+                identical = expected == actual
+                if not identical:
+                    mismatches.append(serializer_class.__name__)
+                self.stdout.write(
+                    f'{serializer_class.__name__}: ModelSerializer {model_time * 1000:.1f} ms, '
+                    f'ValuesSerializer {values_time * 1000:.1f} ms '
+                    f'({model_time / values_time:.1f}x), {len(actual):,} bytes, '
+                    + (self.style.SUCCESS('identical') if identical else self.style.ERROR('DIFFERENT'))
+                )
+
+        if mismatches:
+            raise CommandError(f'Output differs for: {", ".join(mismatches)}')
+
+    def best_of(self, repeat, render):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = render()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        return output, best
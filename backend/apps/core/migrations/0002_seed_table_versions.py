@@ -0,0 +1,40 @@
+from django.db import migrations
+from django.utils import timezone
+
+# Apps whose models are tracked (see CoreConfig.ready)
+TRACKED_APPS = ['users', 'academics', 'assessments', 'attendance', 'library', 'services', 'facilities']
+
+
+def seed_table_versions(apps, schema_editor):
+    """
+    One counter row per model, so TableVersion.stamps() only reads. Whatever
+    the tables hold now was written before this migration.
+    """
+    TableVersion = apps.get_model('core', 'TableVersion')
+    now = timezone.now()
+    TableVersion.objects.bulk_create(
+        [
+            TableVersion(label=model._meta.label_lower, updated_at=now)
+            for app_label in TRACKED_APPS
+            for model in apps.get_app_config(app_label).get_models()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('users', '0006_studentprofile_imported_gpa'),
+        ('academics', '0008_section_meeting_schedule'),
+        ('assessments', '0004_assignment_assignment_due_date_and_more'),
+        ('attendance', '0005_attendancerecord_attendance_status_keyset'),
+        ('library', '0004_book_search'),
+        ('services', '0003_event_event_date_event_event_status_date_and_more'),
+        ('facilities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_table_versions, migrations.RunPython.noop),
+    ]
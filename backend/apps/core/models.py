@@ -0,0 +1,74 @@
+from functools import partial
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class TableVersion(models.Model):
+    """Change counter per model, used to build ETag and Last-Modified validators"""
+    label = models.CharField(max_length=100, primary_key=True, help_text="Model label, e.g. academics.section")
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['label']
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
+
+    @classmethod
+    def bump(cls, *models):
+        """
+        Record that rows of ``models`` changed. The counters are bumped once the
+        current transaction commits, one short statement per model, so writers
+        never hold a counter row lock for the length of their transaction.
+        Saves and deletes are tracked automatically (see CoreConfig.ready);
+        bulk writes must call this themselves.
+
+        Labels bumped in the same atomic block share one on_commit callback,
+        so a transaction saving many rows bumps each counter once.
+        """
+        labels = {model._meta.label_lower for model in models}
+        if not labels:
+            return
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            cls.bump_labels(labels)
+            return
+        # Django replaces run_on_commit after a commit or a rollback, which
+        # drops the callbacks of this mapping, so a new one starts then
+        callbacks, pending = getattr(connection, 'table_version_pending', (None, None))
+        if callbacks is not connection.run_on_commit:
+            pending = {}
+            connection.table_version_pending = (connection.run_on_commit, pending)
+        # Keyed on the savepoints of the current block, whose rollback
+        # discards its callback along with its writes
+        block = tuple(connection.savepoint_ids)
+        if block not in pending:
+            pending[block] = set()
+            transaction.on_commit(partial(cls.bump_labels, pending[block]))
+        pending[block].update(labels)
+
+    @classmethod
+    def bump_labels(cls, labels):
+        now = timezone.now()
+        for label in sorted(labels):
+            if not cls.objects.filter(label=label).update(version=F('version') + 1, updated_at=now):
+                cls.objects.bulk_create([cls(label=label, version=1, updated_at=now)], ignore_conflicts=True)
+
+    @classmethod
+    def stamps(cls, models):
+        """
+        Map each model label to its (version, updated_at). Rows are seeded by
+        migration core/0002; a model without one has never been bumped and
+        gets (0, None).
+        """
+        labels = {model._meta.label_lower for model in models}
+        stamps = {
+            label: (version, updated_at)
+            for label, version, updated_at in cls.objects.filter(label__in=labels).values_list(
+                'label', 'version', 'updated_at'
+            )
+        }
+        stamps.update({label: (0, None) for label in labels - stamps.keys()})
+        return stamps
@@ -0,0 +1,197 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by the ordering values of the row they start after, so
+fetching a deep page costs the same as the first one and rows inserted
+while a client is scrolling never shift the pages it has not seen yet.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from types import SimpleNamespace
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on the queryset's ordering plus the primary key as a tie-breaker.
+
+    The ordering is the one applied by OrderingFilter, or the model's default
+    ordering. Only concrete, non-relational fields can be keyed on. NULLs
+    sort where the database puts them (first in descending order on
+    PostgreSQL, last on SQLite), so plain composite indexes serve every
+    page. The total count costs a full COUNT(*) and is only returned when
+    requested with ``?count=true``.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_keys(queryset)
+        self.nulls_largest = connections[queryset.db].features.nulls_order_largest
+        position, reverse = self.decode_cursor(request)
+
+        ordered = queryset.order_by(*self.get_order_by(reverse))
+        if position is not None:
+            ordered = ordered.filter(self.after(position, reverse))
+        rows = list(ordered[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, position is not None
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+
+        self.page = rows
+        self.count = queryset.count() if self.get_include_count(request) else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_include_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_keys(self, queryset):
+        """The (field, descending) pairs rows are ordered and keyed on"""
+        model = queryset.model
+        keys = []
+        for ordering in (queryset.query.order_by, model._meta.ordering):
+            keys = self.parse_ordering(model, ordering)
+            if keys:
+                break
+        keys = keys or []
+        pk = model._meta.pk
+        if pk not in [field for field, _ in keys]:
+            keys.append((pk, keys[0][1] if keys else False))
+        return keys
+
+    def parse_ordering(self, model, ordering):
+        keys = []
+        for term in ordering:
+            if not isinstance(term, str):
+                return None
+            name = term.lstrip('-')
+            try:
+                field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation:
+                return None
+            keys.append((field, term.startswith('-')))
+        return keys
+
+    def get_order_by(self, reverse):
+        return [
+            F(field.attname).desc() if descending != reverse else F(field.attname).asc()
+            for field, descending in self.keys
+        ]
+
+    def after(self, position, reverse):
+        """Filter for the rows that come after ``position`` in the (possibly reversed) ordering"""
+        condition = Q(pk__in=[])
+        tie = Q()
+        for (field, descending), value in zip(self.keys, position):
+            name = field.attname
+            ascending = descending == reverse
+            nulls_after = field.null and ascending == self.nulls_largest
+            if value is None:
+                if not nulls_after:
+                    condition |= tie & Q(**{f'{name}__isnull': False})
+                tie &= Q(**{f'{name}__isnull': True})
+            else:
+                step = Q(**{f'{name}__{"gt" if ascending else "lt"}': value})
+                if nulls_after:
+                    step |= Q(**{f'{name}__isnull': True})
+                condition |= tie & step
+                tie &= Q(**{name: value})
+
+        # Bound the leading key too, so the database can seek the index to the position
+        field, descending = self.keys[0]
+        ascending = descending == reverse
+        if position[0] is not None and not (field.null and ascending == self.nulls_largest):
+            condition &= Q(**{f'{field.attname}__{"gte" if ascending else "lte"}': position[0]})
+        return condition
+
+    def encode_cursor(self, row, reverse):
+        if isinstance(row, dict):
+            # A row of a values() queryset
+            row = SimpleNamespace(**row)
+        position = [field.value_to_string(row) if getattr(row, field.attname) is not None else None
+                    for field, _ in self.keys]
+        token = urlsafe_b64encode(json.dumps({'p': position, 'r': int(reverse)}).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(token.encode()))
+            position = cursor['p']
+            if len(position) != len(self.keys):
+                raise ValueError
+            position = [None if value is None else field.to_python(value)
+                        for (field, _), value in zip(self.keys, position)]
+            return position, bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link(), 'previous': self.get_previous_link()}
+        if self.count is not None:
+            response['count'] = self.count
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'description': f'Only present with ?{self.count_query_param}=true'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': self.cursor_query_param, 'required': False, 'in': 'query',
+             'description': 'The pagination cursor value.', 'schema': {'type': 'string'}},
+            {'name': self.page_size_query_param, 'required': False, 'in': 'query',
+             'description': f'Number of results per page (max {self.max_page_size}).', 'schema': {'type': 'integer'}},
+            {'name': self.count_query_param, 'required': False, 'in': 'query',
+             'description': 'Include the total count (runs COUNT(*)).', 'schema': {'type': 'boolean'}},
+        ]
@@ -0,0 +1,123 @@
+"""
+Sparse fieldsets: ``?fields=`` and ``?omit=`` on read-only endpoints.
+
+The selected fields trim the serializer output, and the columns behind them
+are pushed into the queryset with ``only()``. Joins are rebuilt from the
+relations those columns sit on, so unused tables and large text columns
+never leave the database unless a client asks for them.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients pick the fields of ``list`` and ``retrieve`` responses.
+
+    ``?fields=a,b`` keeps only those fields and ``?omit=c,d`` drops some;
+    both may be combined. Fields sourced from a column, including dotted
+    sources through foreign keys, are mapped to ``only()`` lookups
+    automatically. Computed fields (model properties, method fields) list
+    the lookups they read in the serializer's ``Meta.field_columns``. If a
+    selected field has no known columns the output is still trimmed, but
+    the queryset is left as it is.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    sparse_actions = ('list', 'retrieve')
+
+    def get_sparse_fields(self):
+        """Names of the selected fields, or None when every field is wanted"""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        if getattr(self, 'action', None) not in self.sparse_actions:
+            return None
+        params = self.request.query_params
+        wanted = self.parse_field_names(params, self.fields_query_param)
+        omitted = self.parse_field_names(params, self.omit_query_param)
+        if not wanted and not omitted:
+            return None
+
+        names = list(self.get_serializer_class()().fields)
+        for param, given in ((self.fields_query_param, wanted), (self.omit_query_param, omitted)):
+            unknown = [name for name in given if name not in names]
+            if unknown:
+                raise ValidationError({param: [f'Unknown field(s): {", ".join(unknown)}']})
+        return [name for name in names if (not wanted or name in wanted) and name not in omitted]
+
+    def parse_field_names(self, params, param):
+        return [name.strip() for value in params.getlist(param) for name in value.split(',') if name.strip()]
+
+    def get_sparse_lookups(self, selected):
+        """``only()`` lookups for the selected fields, or None if some are unknown"""
+        serializer = self.get_serializer_class()()
+        model = serializer.Meta.model
+        declared = getattr(serializer.Meta, 'field_columns', {})
+        lookups = [model._meta.pk.name]
+        for name in selected:
+            if name in declared:
+                lookups.extend(declared[name])
+                continue
+            lookup = self.column_lookup(model, serializer.fields[name].source)
+            if lookup is None:
+                return None
+            lookups.append(lookup)
+        return lookups
+
+    def column_lookup(self, model, source):
+        """The lookup for a column reached through foreign keys, or None"""
+        parts = source.split('.')
+        for depth, part in enumerate(parts):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete:
+                return None
+            if depth < len(parts) - 1:
+                if not field.is_relation:
+                    return None
+                model = field.related_model
+        return '__'.join(parts)
+
+    def project(self, queryset, lookups):
+        """``queryset`` reading only ``lookups``, joined on just the relations they cross"""
+        model = queryset.model
+        columns, joins = set(), set()
+        for lookup in lookups:
+            parts = lookup.split('__')
+            current = model
+            for depth, part in enumerate(parts):
+                path = '__'.join(parts[:depth + 1])
+                # The foreign key column itself must be loaded for only() to follow it
+                columns.add(path)
+                field = current._meta.get_field(part)
+                if depth < len(parts) - 1:
+                    joins.add(path)
+                    current = field.related_model
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*sorted(joins))
+        return queryset.only(*sorted(columns))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selected = self.get_sparse_fields()
+        if selected is None:
+            return queryset
+        lookups = self.get_sparse_lookups(selected)
+        if lookups is None:
+            return queryset
+        return self.project(queryset, lookups)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selected = self.get_sparse_fields()
+        if selected is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in [name for name in fields if name not in selected]:
+                fields.pop(name)
+        return serializer
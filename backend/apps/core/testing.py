@@ -0,0 +1,76 @@
+"""
+Fixtures shared by the apps' tests: users, student profiles, sections and
+an API client authenticated as a user.
+"""
+from datetime import date
+from unittest import mock
+from rest_framework.test import APIClient
+from apps.academics.models import Course, Section
+from apps.users.models import FacultyProfile, StudentProfile, User
+from apps.users.serializers import ClaimsTokenObtainPairSerializer
+from apps.users.tokens import forget_token_version
+
+
+def create_user(username, role, first_name='Test', last_name='User'):
+    return User.objects.create_user(
+        username=username, email=f'{username}@example.edu', password='x',
+        first_name=first_name, last_name=last_name, role=role,
+    )
+
+
+def create_student(number, first_name='Test', last_name=None):
+    user = create_user(f'student{number}', 'student', first_name, last_name or f'Student{number}')
+    return StudentProfile.objects.create(
+        user=user, student_id=f'STU{number:06d}', enrollment_date=date(2024, 8, 26), major='History',
+        year_level='Junior', emergency_contact='Contact', emergency_phone='555-0100',
+    )
+
+
+def create_faculty(number):
+    user = create_user(f'faculty{number}', 'faculty', 'Test', f'Faculty{number}')
+    return FacultyProfile.objects.create(
+        user=user, faculty_id=f'FAC{number:06d}', department='History', rank='Lecturer',
+        hire_date=date(2020, 8, 1), salary=60000, specialization='History', education='PhD',
+    )
+
+
+def create_section(number, semester='Fall 2024', course=None, meeting_time=None, **fields):
+    """A section of a new course unless ``course`` is given, meeting MWF at a time set by ``number``"""
+    if course is None:
+        course = Course.objects.create(
+            course_id=f'TST{number:03d}', course_name=f'Test Course {number}', description='', level='Undergraduate',
+        )
+    hour = 8 + number % 12
+    return Section.objects.create(
+        section_id=f'SEC{number:06d}', course=course, section_number=f'{number % 100:02d}', semester=semester,
+        year=int(semester.split()[-1]), instructor_name='Instructor', instructor_rank='Lecturer',
+        meeting_days=fields.pop('meeting_days', 'MWF'), meeting_time=meeting_time or f'{hour}:00-{hour}:50',
+        **fields,
+    )
+
+
+def api_client(user):
+    """A client sending an access token for ``user``"""
+    # Creating a profile bumps the user's token version, so load it again;
+    # the cached version may belong to an earlier test's user with this id
+    user = User.objects.get(pk=user.pk)
+    forget_token_version(user.pk)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {ClaimsTokenObtainPairSerializer.get_token(user).access_token}')
+    return client
+
+
+class ValuesSerializerTestMixin:
+    """
+    Checks that a list endpoint served by a ValuesSerializer returns the
+    same bytes as its ModelSerializer. ``viewset`` is the class under test.
+    """
+    viewset = None
+
+    def assertMatchesModelSerializer(self, client, url, params=None):
+        response = client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['results'])
+        with mock.patch.object(self.viewset, 'values_serializers', ()):
+            expected = client.get(url, params)
+        self.assertEqual(response.content, expected.content)
@@ -0,0 +1,139 @@
+"""
+Flattened, read-only serialization for hot list endpoints.
+
+A ValuesSerializer mirrors a ModelSerializer but reads rows with
+``values()`` and emits dicts directly: no model instances are built and no
+attribute chains are walked per row. Output matches the ModelSerializer
+field for field; the tests of each converted endpoint check the bytes.
+"""
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+class ValuesSerializer:
+    """
+    Read-only counterpart of ``serializer_class`` built on ``values()``.
+
+    Fields whose source is a column, including dotted sources through
+    non-null foreign keys, are compiled automatically and formatted with
+    the original field's ``to_representation``. Any other field (method
+    fields, model properties, callables) needs a ``get_<field>(row)``
+    method; the extra columns it reads are listed in ``extra_values`` as
+    ``values()`` lookups and appear in ``row`` under those names.
+    """
+    serializer_class = None
+    extra_values = ()
+
+    @classmethod
+    def compile(cls):
+        """The (name, lookup, method, representation) plan, built once per class"""
+        if '_plan' not in cls.__dict__:
+            serializer = cls.serializer_class()
+            model = serializer.Meta.model
+            lookups = list(cls.extra_values)
+            plan = []
+            for name, field in serializer.fields.items():
+                if field.write_only:
+                    continue
+                if isinstance(field, (serializers.RelatedField, serializers.SerializerMethodField,
+                                      serializers.ReadOnlyField)):
+                    # Related fields render the raw key; the others render values as-is
+                    representation = None
+                else:
+                    representation = field.to_representation
+                method = getattr(cls, f'get_{name}', None)
+                if method is not None:
+                    plan.append((name, None, method, representation))
+                    continue
+                lookup = cls.column_lookup(model, name, field)
+                if lookup not in lookups:
+                    lookups.append(lookup)
+                plan.append((name, lookup, None, representation))
+            cls._plan, cls._lookups = plan, lookups
+        return cls._plan
+
+    @classmethod
+    def column_lookup(cls, model, name, field):
+        """The values() lookup for a field sourced from a column"""
+        parts = field.source.split('.')
+        for depth, part in enumerate(parts):
+            try:
+                model_field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                model_field = None
+            last = depth == len(parts) - 1
+            if (
+                model_field is None
+                or not model_field.concrete
+                or (not last and (not model_field.is_relation or model_field.null))
+            ):
+                raise ImproperlyConfigured(
+                    f'{cls.__name__}: {name!r} is not a column reached through non-null '
+                    f'foreign keys; define get_{name}(row).'
+                )
+            if not last:
+                model = model_field.related_model
+        return '__'.join(parts)
+
+    @staticmethod
+    def full_name(first_name, last_name):
+        """Same as AbstractUser.get_full_name"""
+        return f"{first_name} {last_name}".strip()
+
+    def get_queryset(self, queryset):
+        """``queryset`` as a values() queryset with every column the plan needs"""
+        self.compile()
+        lookups = list(self._lookups)
+        model = queryset.model
+        # Paginators key rows on the ordering columns and the primary key
+        ordering = queryset.query.order_by or model._meta.ordering
+        names = [term.lstrip('-') for term in ordering if isinstance(term, str)] + [model._meta.pk.name]
+        for name in names:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.is_relation and field.attname not in lookups:
+                lookups.append(field.attname)
+        return queryset.values(*lookups)
+
+    def to_representation(self, rows):
+        plan = self.compile()
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, method, representation in plan:
+                value = row[lookup] if method is None else method(self, row)
+                if value is not None and representation is not None:
+                    value = representation(value)
+                item[name] = value
+            data.append(item)
+        return data
+
+
+class ValuesListMixin:
+    """
+    Serve ``list`` through a ValuesSerializer when one of ``values_serializers``
+    mirrors the serializer class picked for the request. Other actions, and
+    requests whose serializer has no flattened counterpart, are unchanged.
+    """
+    values_serializers = ()
+
+    def get_values_serializer(self):
+        serializer_class = self.get_serializer_class()
+        for values_serializer in self.values_serializers:
+            if values_serializer.serializer_class is serializer_class:
+                return values_serializer()
+        return None
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = values_serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.to_representation(page))
+        return Response(values_serializer.to_representation(rows))
@@ -0,0 +1,103 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.academics.models import Enrollment, TermGPA
+from apps.academics.serializers import StudentEnrollmentSerializer
+from apps.academics.views import grades_payload, student_enrollments
+from apps.attendance.models import AttendanceRecord, AttendanceRollup
+from apps.attendance.serializers import AttendanceRecordSerializer, StudentAttendanceSummarySerializer
+from apps.attendance.views import attendance_summaries, student_attendance
+from apps.assessments.models import Submission
+from apps.assessments.serializers import StudentSubmissionSerializer
+from apps.assessments.views import student_submissions
+from apps.library.models import Checkout
+from apps.library.serializers import CheckoutSerializer
+from apps.library.views import student_checkouts
+from apps.services.models import FinancialAid, ParkingPermit
+from apps.services.serializers import ParkingPermitSerializer
+from apps.services.views import financial_aid_payload, student_permits
+from apps.core.conditional import ConditionalGetMixin
+
+
+class StudentDashboardView(ConditionalGetMixin, APIView):
+    """
+    Everything the student dashboard shows, in one request.
+
+    ``?include=grades,attendance_summary`` limits the response to the listed
+    sections. Each section is built by the same helper as the endpoint it
+    replaces and costs at most one query; the profile comes with the request.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    conditional_models = [
+        Enrollment, TermGPA, AttendanceRecord, AttendanceRollup,
+        Submission, Checkout, FinancialAid, ParkingPermit,
+    ]
+
+    SECTIONS = [
+        'enrollments', 'grades', 'attendance', 'attendance_summary',
+        'submissions', 'checkouts', 'financial_aid', 'parking_permits',
+    ]
+
+    def get(self, request):
+        if request.user.role != 'student':
+            return Response(
+                {'detail': 'Only students can access this endpoint'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        include = request.query_params.get('include')
+        if include:
+            sections = [name.strip() for name in include.split(',') if name.strip()]
+            unknown = [name for name in sections if name not in self.SECTIONS]
+            if unknown:
+                return Response(
+                    {'detail': f"Unknown sections: {', '.join(unknown)}. "
+                               f"Choose from: {', '.join(self.SECTIONS)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            sections = self.SECTIONS
+
+        student_profile = request.profile
+        if not student_profile:
+            return Response(
+                {'detail': 'Student profile not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        self.enrollments = None
+        return Response({
+            name: getattr(self, f'get_{name}')(student_profile)
+            for name in self.SECTIONS if name in sections
+        })
+
+    def get_enrollment_list(self, student_profile):
+        """Enrollments shared by the enrollments and grades sections"""
+        if self.enrollments is None:
+            self.enrollments = list(student_enrollments(student_profile))
+        return self.enrollments
+
+    def get_enrollments(self, student_profile):
+        return StudentEnrollmentSerializer(self.get_enrollment_list(student_profile), many=True).data
+
+    def get_grades(self, student_profile):
+        graded = [enrollment for enrollment in self.get_enrollment_list(student_profile) if enrollment.grade]
+        return grades_payload(student_profile, graded)
+
+    def get_attendance(self, student_profile):
+        return AttendanceRecordSerializer(student_attendance(student_profile), many=True).data
+
+    def get_attendance_summary(self, student_profile):
+        return StudentAttendanceSummarySerializer(attendance_summaries(student_profile), many=True).data
+
+    def get_submissions(self, student_profile):
+        return StudentSubmissionSerializer(student_submissions(student_profile), many=True).data
+
+    def get_checkouts(self, student_profile):
+        return CheckoutSerializer(student_checkouts(student_profile), many=True).data
+
+    def get_financial_aid(self, student_profile):
+        return financial_aid_payload(student_profile)
+
+    def get_parking_permits(self, student_profile):
+        return ParkingPermitSerializer(student_permits(student_profile), many=True).data
@@ -0,0 +1,213 @@
+"""
+Room assignment for sections that have no room.
+
+Sections are placed one semester at a time, most constrained first (most
+seats, then most weekly minutes), each into the smallest free room that
+holds them. A repair pass then retries the sections left over: it may move
+one section that was just placed out of a room, if that section fits into
+another free room. Sections that already have a room stay where they are
+and block their times. Every choice breaks ties by id, so the same data
+always gives the same assignment.
+"""
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict, namedtuple
+from django.db import transaction
+from apps.academics.models import Section
+from apps.academics.schedule import DAYS
+from apps.core.models import TableVersion
+from .models import Room
+
+# Room types that host classes; lab sections only go to lab rooms
+TEACHING_ROOM_TYPES = ('Classroom', 'Lecture Hall', 'Auditorium', 'Laboratory', 'Lab')
+LAB_ROOM_TYPES = ('Laboratory', 'Lab')
+LAB_COURSE = re.compile(r'\blab(oratory)?\b', re.IGNORECASE)
+
+# Fixed bookings (sections that already had a room) carry no key and never move
+FIXED = None
+
+Request = namedtuple('Request', 'section_id course_name seats days weekdays start end lab')
+Assignment = namedtuple('Assignment', 'assigned unassigned')
+
+
+def weekdays(mask):
+    return [day for day in range(len(DAYS)) if mask & (1 << day)]
+
+
+class Occupancy:
+    """The booked times of every room, as disjoint intervals per room and day sorted by start"""
+
+    def __init__(self):
+        self.days = defaultdict(list)
+
+    def book_fixed(self, room_id, days, start, end):
+        """Block a time in a room, merging it with the fixed bookings it touches"""
+        for day in weekdays(days):
+            intervals = self.days[room_id, day]
+            position = bisect_left(intervals, (start,))
+            while position and intervals[position - 1][1] > start:
+                position -= 1
+            while position < len(intervals) and intervals[position][0] < end:
+                other_start, other_end, _ = intervals.pop(position)
+                start, end = min(start, other_start), max(end, other_end)
+            intervals.insert(position, (start, end, FIXED))
+
+    def blockers(self, room_id, request):
+        """Keys of the bookings overlapping ``request`` in a room, FIXED for fixed ones"""
+        found = set()
+        for day in request.weekdays:
+            intervals = self.days.get((room_id, day), ())
+            position = bisect_left(intervals, (request.end,))
+            while position and intervals[position - 1][1] > request.start:
+                position -= 1
+                found.add(intervals[position][2])
+        return found
+
+    def is_free(self, room_id, request):
+        for day in request.weekdays:
+            intervals = self.days.get((room_id, day))
+            if intervals:
+                position = bisect_left(intervals, (request.end,))
+                if position and intervals[position - 1][1] > request.start:
+                    return False
+        return True
+
+    def book(self, room_id, request):
+        for day in request.weekdays:
+            insort(self.days[room_id, day], (request.start, request.end, request.section_id))
+
+    def release(self, room_id, request):
+        for day in request.weekdays:
+            self.days[room_id, day].remove((request.start, request.end, request.section_id))
+
+
+class RoomAssigner:
+    """Assign rooms to the unroomed sections of one semester"""
+
+    def __init__(self, semester, room_types=TEACHING_ROOM_TYPES):
+        self.semester = semester
+        rooms = Room.objects.filter(room_type__in=room_types).order_by('capacity', 'room_id')
+        self.rooms = list(rooms.values_list('room_id', 'capacity', 'room_type'))
+        lab_rooms = [room for room in self.rooms if room[2] in LAB_ROOM_TYPES]
+        other_rooms = [room for room in self.rooms if room[2] not in LAB_ROOM_TYPES]
+        # Candidate rooms by capacity; ordinary sections only fall back to labs
+        self.by_kind = {
+            True: (lab_rooms, [capacity for _, capacity, _ in lab_rooms]),
+            False: (other_rooms, [capacity for _, capacity, _ in other_rooms]),
+        }
+        self.occupancy = Occupancy()
+        self.placed = {}
+        self.candidate_lists = {}
+        # Rooms found taken at each meeting time. Placing sections only adds
+        # bookings, so a room stays taken until a repair moves a section.
+        self.taken = defaultdict(set)
+
+    def candidates(self, request):
+        """Ids of the rooms large enough for ``request``, best fit first"""
+        key = (request.lab, request.seats)
+        if key not in self.candidate_lists:
+            found = []
+            for kind in ((True,) if request.lab else (False, True)):
+                rooms, capacities = self.by_kind[kind]
+                found.extend(room_id for room_id, _, _ in rooms[bisect_left(capacities, request.seats):])
+            self.candidate_lists[key] = found
+        return self.candidate_lists[key]
+
+    def free_room(self, request, skip=None):
+        """The best room that is free for ``request``, other than ``skip``, or None"""
+        taken = self.taken[request.days, request.start, request.end]
+        for room_id in self.candidates(request):
+            if room_id in taken or room_id == skip:
+                continue
+            if self.occupancy.is_free(room_id, request):
+                return room_id
+            taken.add(room_id)
+        return None
+
+    def load(self):
+        """The sections to place; sections that already have a room become fixed bookings"""
+        sections = Section.objects.filter(semester=self.semester).exclude(status='Cancelled').order_by('section_id')
+        requests, unscheduled = [], []
+        for section_id, room_id, course_name, seats, days, start, end in sections.values_list(
+            'section_id', 'room_id', 'course__course_name', 'capacity', 'meeting_day_mask', 'meeting_start',
+            'meeting_end',
+        ):
+            if room_id is not None:
+                if days:
+                    self.occupancy.book_fixed(room_id, days, start, end)
+            elif not days:
+                unscheduled.append(section_id)
+            else:
+                requests.append(Request(section_id, course_name, seats, days, tuple(weekdays(days)), start, end,
+                                        bool(LAB_COURSE.search(course_name))))
+        return requests, unscheduled
+
+    def solve(self):
+        requests, unscheduled = self.load()
+        unassigned = {section_id: 'no meeting time' for section_id in unscheduled}
+        # Most constrained first: most seats, then most weekly minutes
+        requests.sort(key=lambda request: (
+            -request.seats, -bin(request.days).count('1') * (request.end - request.start), request.section_id
+        ))
+
+        leftover = []
+        for request in requests:
+            room_id = self.free_room(request)
+            if room_id is None:
+                leftover.append(request)
+            else:
+                self.place(room_id, request)
+
+        # Fewest seats that found no room at each meeting time since the last
+        # move; a section as large at the same time cannot be repaired either
+        failed = {}
+        for request in leftover:
+            key = (request.days, request.start, request.end, request.lab)
+            if not self.candidates(request):
+                unassigned[request.section_id] = 'no room large enough'
+            elif key in failed and request.seats >= failed[key]:
+                unassigned[request.section_id] = 'no free room at this time'
+            elif self.repair(request):
+                failed.clear()
+            else:
+                failed[key] = min(request.seats, failed.get(key, request.seats))
+                unassigned[request.section_id] = 'no free room at this time'
+
+        assigned = {section_id: room_id for section_id, (room_id, _) in self.placed.items()}
+        return Assignment(dict(sorted(assigned.items())), dict(sorted(unassigned.items())))
+
+    def place(self, room_id, request):
+        self.occupancy.book(room_id, request)
+        self.placed[request.section_id] = (room_id, request)
+        self.taken[request.days, request.start, request.end].add(room_id)
+
+    def repair(self, request):
+        """Free a room for ``request`` by moving the one placed section in its way elsewhere"""
+        for room_id in self.candidates(request):
+            blockers = self.occupancy.blockers(room_id, request)
+            if len(blockers) != 1 or FIXED in blockers:
+                continue
+            moved = self.placed[blockers.pop()][1]
+            self.occupancy.release(room_id, moved)
+            other_room = self.free_room(moved, skip=room_id)
+            if other_room is not None:
+                # The move frees time in this room that other meeting times may have found taken
+                self.taken.clear()
+                self.place(other_room, moved)
+                self.place(room_id, request)
+                return True
+            self.occupancy.book(room_id, moved)
+        return False
+
+
+def save_rooms(assigned):
+    """Store ``{section_id: room_id}``; bulk writes skip the signals that track section changes"""
+    by_room = defaultdict(list)
+    for section_id, room_id in assigned.items():
+        by_room[room_id].append(section_id)
+    with transaction.atomic():
+        # One UPDATE per room is much cheaper than a CASE over every section
+        for room_id, section_ids in sorted(by_room.items()):
+            Section.objects.filter(pk__in=section_ids).update(room_id=room_id)
+        TableVersion.bump(Section)
+    return len(assigned)
@@ -0,0 +1,77 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.academics.models import Section
+from apps.academics.schedule import DAYS
+from apps.facilities.assignment import TEACHING_ROOM_TYPES, RoomAssigner, save_rooms, weekdays
+from apps.facilities.models import Room
+from apps.facilities.utilization import clock
+
+
+class Command(BaseCommand):
+    help = (
+        'Assign rooms to sections that have none. Each section gets a teaching room that '
+        'holds its capacity and is free at its meeting times; sections that already have '
+        'a room keep it. The result is deterministic. Use --dry-run to review it first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--semester',
+            action='append',
+            help='Semester to assign, may be repeated (default: every semester with unroomed sections)'
+        )
+        parser.add_argument(
+            '--room-types',
+            default=','.join(TEACHING_ROOM_TYPES),
+            help=f'Comma-separated room types that may be assigned (default: {",".join(TEACHING_ROOM_TYPES)})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the assignment without saving it'
+        )
+
+    def handle(self, *args, **options):
+        room_types = [name.strip() for name in options['room_types'].split(',') if name.strip()]
+        if not room_types:
+            raise CommandError('--room-types names no room types')
+        semesters = options['semester'] or list(
+            Section.objects.filter(room__isnull=True).order_by('semester').values_list('semester', flat=True).distinct()
+        )
+        rooms = {room.pk: room for room in Room.objects.select_related('building')}
+
+        totals = {'assigned': 0, 'unassigned': 0}
+        for semester in semesters:
+            with transaction.atomic():
+                started = time.perf_counter()
+                assigner = RoomAssigner(semester, room_types)
+                result = assigner.solve()
+                elapsed = time.perf_counter() - started
+                self.report(semester, assigner, result, rooms, elapsed)
+                if not options['dry_run'] and result.assigned:
+                    save_rooms(result.assigned)
+            totals['assigned'] += len(result.assigned)
+            totals['unassigned'] += len(result.unassigned)
+
+        verb = 'Would assign' if options['dry_run'] else 'Assigned'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} rooms to {totals["assigned"]} sections; {totals["unassigned"]} left without a room'
+        ))
+
+    def report(self, semester, assigner, result, rooms, elapsed):
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {semester}: {len(result.assigned)} assigned, {len(result.unassigned)} unassigned '
+            f'(solved in {elapsed:.2f}s) ==='
+        ))
+        for section_id, room_id in result.assigned.items():
+            request = assigner.placed[section_id][1]
+            room = rooms[room_id]
+            days = ''.join(DAYS[day][:2] for day in weekdays(request.days))
+            self.stdout.write(
+                f'{section_id:<12} {days:<14} {clock(request.start)}-{clock(request.end)} '
+                f'{request.seats:>4} seats -> {room_id:<10} {str(room):<30} {room.capacity:>4} seats'
+            )
+        for section_id, reason in result.unassigned.items():
+            self.stdout.write(self.style.WARNING(f'{section_id:<12} not assigned: {reason}'))
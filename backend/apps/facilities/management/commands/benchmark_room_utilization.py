@@ -0,0 +1,135 @@
+import random
+import statistics
+import time
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.academics.models import Course, Section
+from apps.facilities.models import Building, Room
+from apps.academics.schedule import DAYS
+from apps.facilities.utilization import analyze, sweep
+
+SEMESTER = 'Benchmark'
+# Common meeting patterns: days and length in minutes
+PATTERNS = [('MWF', 50), ('MW', 75), ('TTH', 75), ('F', 170), ('TH', 170), ('MTWTHF', 50)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the room utilization and double-booking analysis of a semester, and '
+        'compare its interval sweep with checking every pair of sections in a room. '
+        'Synthetic buildings, rooms and sections are created in a transaction that '
+        'is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sections',
+            type=int,
+            default=5000,
+            help='Number of synthetic sections with a room (default: 5000)'
+        )
+        parser.add_argument(
+            '--rooms',
+            type=int,
+            default=400,
+            help='Number of synthetic rooms (default: 400)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Times each check is run (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        with transaction.atomic():
+            self.create_semester(max(1, options['sections']), max(1, options['rooms']))
+            analyze_ms = self.time(repeat, lambda: analyze(SEMESTER))
+            report = analyze(SEMESTER)
+            room_days = self.room_days()
+            transaction.set_rollback(True)
+
+        sweep_ms = self.time(repeat, lambda: [sweep(meetings, 0, 24 * 60) for meetings in room_days])
+        pairwise_ms = self.time(repeat, lambda: [self.pairwise(meetings) for meetings in room_days])
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {options["sections"]} sections in {options["rooms"]} rooms (median of {repeat} runs) ==='
+        ))
+        self.stdout.write(
+            f'Full analysis:  {analyze_ms:8.1f}ms  ({len(report["double_bookings"])} double bookings, '
+            f'{len(report["capacity_mismatches"])} capacity mismatches, '
+            f'{report["utilization"]}% utilization)'
+        )
+        self.stdout.write(f'Clash detection on {len(room_days)} room-days, in memory:')
+        self.stdout.write(f'  interval sweep {sweep_ms:8.1f}ms')
+        self.stdout.write(f'  every pair     {pairwise_ms:8.1f}ms')
+
+    def create_semester(self, sections, rooms):
+        rng = random.Random(sections)
+        course = Course.objects.create(
+            course_id='BENCHROOM', course_name='Room Benchmark', description='', level='Undergraduate'
+        )
+        buildings = Building.objects.bulk_create([
+            Building(building_id=f'BENCHB{number:03d}', name=f'Benchmark Building {number}')
+            for number in range(max(1, rooms // 20))
+        ])
+        created_rooms = Room.objects.bulk_create([
+            Room(
+                room_id=f'BENCHR{number:05d}',
+                building=buildings[number % len(buildings)],
+                room_number=f'{number:05d}',
+                room_type=rng.choice(['Classroom', 'Lecture Hall', 'Laboratory']),
+                capacity=rng.choice([20, 30, 40, 60, 120, 250]),
+            )
+            for number in range(rooms)
+        ])
+        objects = []
+        for number in range(sections):
+            days, length = rng.choice(PATTERNS)
+            start = rng.randrange(8 * 60, 20 * 60, 30)
+            section = Section(
+                section_id=f'BENCHS{number:06d}',
+                course=course,
+                section_number=f'{number % 100:02d}',
+                semester=SEMESTER,
+                year=2025,
+                instructor_name='Benchmark',
+                instructor_rank='Lecturer',
+                meeting_days=days,
+                meeting_time=f'{start // 60:02d}:{start % 60:02d}-{(start + length) // 60:02d}:{(start + length) % 60:02d}',
+                room=rng.choice(created_rooms),
+                capacity=rng.choice([20, 30, 40, 60, 120]),
+            )
+            section.apply_schedule()
+            objects.append(section)
+        Section.objects.bulk_create(objects, batch_size=1000)
+
+    def room_days(self):
+        """The ``(start, end, section_id)`` meetings of each room on each day"""
+        by_room_day = defaultdict(list)
+        for section_id, room_id, mask, start, end in Section.objects.filter(semester=SEMESTER).values_list(
+            'section_id', 'room_id', 'meeting_day_mask', 'meeting_start', 'meeting_end'
+        ):
+            for day in range(len(DAYS)):
+                if mask & (1 << day):
+                    by_room_day[room_id, day].append((start, end, section_id))
+        return list(by_room_day.values())
+
+    def pairwise(self, meetings):
+        """The overlapping pairs of one room-day, comparing every pair"""
+        clashes = []
+        for position, (start, end, section_id) in enumerate(meetings):
+            for other_start, other_end, other_id in meetings[position + 1:]:
+                if start < other_end and other_start < end:
+                    clashes.append((section_id, other_id))
+        return clashes
+
+    def time(self, repeat, function):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
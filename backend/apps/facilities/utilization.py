@@ -0,0 +1,180 @@
+"""
+Room utilization and double bookings for one semester.
+
+Every scheduled section with a room contributes its weekly meetings (see
+apps/academics/schedule.py). The meetings of each room and weekday are
+swept once in order of start, keeping the ends of the meetings in progress
+on a heap: the minutes with at least one section count as booked, and every
+stretch with two or more is a double booking, reported with all the
+sections involved. The cost is a sort per room and day rather than a
+comparison of every pair of sections.
+"""
+from collections import defaultdict
+from heapq import heappop, heappush
+from django.conf import settings
+from apps.academics.models import Section
+from apps.academics.schedule import DAYS, parse_days, parse_time
+from .models import Room
+
+# Rooms that never host classes; they only count once a section is booked into them
+UNSCHEDULED_ROOM_TYPES = ('Office',)
+
+
+def teaching_week():
+    """The weekday mask and daily ``(start, end)`` minutes that count as available"""
+    start, end = parse_time(f'{settings.ROOM_UTILIZATION_DAY_START}-{settings.ROOM_UTILIZATION_DAY_END}')
+    if start is None:
+        start, end = 0, 24 * 60
+    return parse_days(settings.ROOM_UTILIZATION_DAYS), start, end
+
+
+def clock(minutes):
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def percent(part, whole):
+    return round(100 * part / whole, 1) if whole else 0.0
+
+
+def sweep(meetings, window_start, window_end):
+    """
+    Booked minutes within the window and the double bookings of one room on
+    one day. ``meetings`` are ``(start, end, section_id)``; a section ending
+    when another starts does not overlap it.
+    """
+    booked, clashes = 0, []
+    # Ends of the meetings in progress, earliest first
+    ends, clash = [], None
+    block_start = block_end = None
+    for start, end, section_id in sorted(meetings):
+        while ends and ends[0][0] <= start:
+            finished = heappop(ends)[0]
+            if clash is not None and len(ends) == 1:
+                clash['end'] = finished
+                clashes.append(clash)
+                clash = None
+        heappush(ends, (end, section_id))
+        if len(ends) == 2:
+            clash = {'start': start, 'sections': [section for _, section in ends]}
+        elif clash is not None:
+            clash['sections'].append(section_id)
+
+        # Booked time is the union of the meetings, one block of back-to-back or overlapping ones at a time
+        if block_end is None or start > block_end:
+            if block_end is not None:
+                booked += max(0, min(block_end, window_end) - max(block_start, window_start))
+            block_start, block_end = start, end
+        elif end > block_end:
+            block_end = end
+
+    while len(ends) > 1:
+        finished = heappop(ends)[0]
+        if clash is not None and len(ends) == 1:
+            clash['end'] = finished
+            clashes.append(clash)
+    if block_end is not None:
+        booked += max(0, min(block_end, window_end) - max(block_start, window_start))
+    return booked, clashes
+
+
+def analyze(semester, building=None):
+    """Utilization per room and building, double bookings and oversized sections in ``semester``"""
+    days, window_start, window_end = teaching_week()
+    week_minutes = bin(days).count('1') * (window_end - window_start)
+
+    sections = Section.objects.filter(
+        semester=semester, room__isnull=False
+    ).exclude(status='Cancelled').order_by('section_id')
+    rooms = Room.objects.select_related('building').order_by('building__name', 'room_number')
+    if building:
+        sections = sections.filter(room__building=building)
+        rooms = rooms.filter(building=building)
+
+    by_room_day = defaultdict(list)
+    section_counts = defaultdict(int)
+    capacities, unscheduled = [], 0
+    for section_id, room_id, capacity, mask, start, end in sections.values_list(
+        'section_id', 'room_id', 'capacity', 'meeting_day_mask', 'meeting_start', 'meeting_end'
+    ):
+        section_counts[room_id] += 1
+        capacities.append((section_id, room_id, capacity))
+        if not mask:
+            unscheduled += 1
+            continue
+        for day in range(len(DAYS)):
+            if mask & (1 << day):
+                by_room_day[room_id, day].append((start, end, section_id))
+
+    booked = defaultdict(int)
+    double_bookings = []
+    for (room_id, day), meetings in by_room_day.items():
+        minutes, clashes = sweep(meetings, window_start, window_end)
+        if days & (1 << day):
+            booked[room_id] += minutes
+        for clash in clashes:
+            double_bookings.append((room_id, day, clash))
+
+    room_rows, room_names, room_capacities, buildings = [], {}, {}, {}
+    for room in rooms:
+        room_names[room.pk] = str(room)
+        room_capacities[room.pk] = room.capacity
+        if room.room_type in UNSCHEDULED_ROOM_TYPES and not section_counts[room.pk]:
+            continue
+        room_rows.append({
+            'room': room.pk,
+            'room_name': str(room),
+            'building': room.building_id,
+            'room_type': room.room_type,
+            'capacity': room.capacity,
+            'sections': section_counts[room.pk],
+            'booked_minutes': booked[room.pk],
+            'utilization': percent(booked[room.pk], week_minutes),
+        })
+        totals = buildings.setdefault(room.building_id, {
+            'building': room.building_id, 'name': room.building.name, 'rooms': 0, 'booked_minutes': 0,
+        })
+        totals['rooms'] += 1
+        totals['booked_minutes'] += booked[room.pk]
+    for totals in buildings.values():
+        totals['available_minutes'] = totals['rooms'] * week_minutes
+        totals['utilization'] = percent(totals['booked_minutes'], totals['available_minutes'])
+
+    total_booked = sum(totals['booked_minutes'] for totals in buildings.values())
+    total_available = sum(totals['available_minutes'] for totals in buildings.values())
+    return {
+        'semester': semester,
+        'teaching_week': {
+            'days': [name for day, name in enumerate(DAYS) if days & (1 << day)],
+            'start': clock(window_start),
+            'end': clock(window_end),
+            'minutes_per_room': week_minutes,
+        },
+        'utilization': percent(total_booked, total_available),
+        'buildings': sorted(buildings.values(), key=lambda totals: totals['name']),
+        'rooms': room_rows,
+        'double_bookings': [
+            {
+                'room': room_id,
+                'room_name': room_names.get(room_id, room_id),
+                'day': DAYS[day],
+                'start': clock(clash['start']),
+                'end': clock(clash['end']),
+                'sections': sorted(clash['sections']),
+            }
+            for room_id, day, clash in sorted(
+                double_bookings, key=lambda item: (room_names.get(item[0], item[0]), item[1], item[2]['start'])
+            )
+        ],
+        'capacity_mismatches': [
+            {
+                'section': section_id,
+                'room': room_id,
+                'room_name': room_names.get(room_id, room_id),
+                'section_capacity': capacity,
+                'room_capacity': room_capacities[room_id],
+            }
+            for section_id, room_id, capacity in capacities
+            if room_id in room_capacities and capacity > room_capacities[room_id]
+        ],
+        'unscheduled_sections': unscheduled,
+    }
@@ -1,10 +1,17 @@
 from rest_framework import viewsets, permissions, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Building, Room
 from .serializers import BuildingSerializer, RoomSerializer
+from . import utilization
+from apps.academics.models import Section
+from apps.core.cache import CachedCatalogMixin
+from apps.core.conditional import ConditionalGetMixin
 
 
-class BuildingViewSet(viewsets.ReadOnlyModelViewSet):
+class BuildingViewSet(ConditionalGetMixin, CachedCatalogMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for buildings"""
     queryset = Building.objects.all()
     serializer_class = BuildingSerializer
@@ -12,9 +19,10 @@ class BuildingViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'address']
     ordering_fields = ['name']
+    cache_models = [Building]
 
 
-class RoomViewSet(viewsets.ReadOnlyModelViewSet):
+class RoomViewSet(ConditionalGetMixin, CachedCatalogMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for rooms"""
     queryset = Room.objects.select_related('building').all()
     serializer_class = RoomSerializer
@@ -23,3 +31,21 @@ class RoomViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['building', 'room_type']
     search_fields = ['room_number', 'building__name']
     ordering_fields = ['building', 'room_number']
+    cache_models = [Room, Building]
+
+    @action(detail=False, methods=['get'], cache_models=[Room, Building, Section], conditional_models=[Section])
+    def utilization(self, request):
+        """
+        Staff and faculty: weekly utilization of each room and building in
+        ``?semester=``, with double bookings and sections larger than their
+        room. ``?building=`` narrows it to one building.
+        """
+        if request.user.role not in ('staff', 'faculty'):
+            raise PermissionDenied('Only staff and faculty can view room utilization')
+        semester = request.query_params.get('semester')
+        if not semester:
+            raise ValidationError({'semester': ['This field is required.']})
+        return self.cached(self.analyze, request)
+
+    def analyze(self, request):
+        return Response(utilization.analyze(request.query_params['semester'], request.query_params.get('building')))
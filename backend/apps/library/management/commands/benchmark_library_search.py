@@ -0,0 +1,127 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.library.models import Book
+from apps.library.search import engine, matching, ranked, search_books
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'ten', 'sol', 'vor', 'an', 'el', 'is', 'qua', 'dre', 'ni', 'po', 'tur', 'ex']
+FIRST_NAMES = ['Ada', 'Bruno', 'Chen', 'Dana', 'Elif', 'Femi', 'Grace', 'Hugo', 'Ines', 'Jonas', 'Kiri', 'Lena']
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure library search latency on a large synthetic catalog. '
+        'The books are created in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--books',
+            type=int,
+            default=100000,
+            help='Number of synthetic books added to the catalog (default: 100000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Times each query is run (default: 20)'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=50,
+            help='Books fetched for the first result page (default: 50)'
+        )
+
+    def handle(self, *args, **options):
+        if engine() is None:
+            raise CommandError(f'No library search index on {connection.vendor}; run migrate first')
+        books = max(1, options['books'])
+        repeat = max(1, options['repeat'])
+        page_size = max(1, options['page_size'])
+        rng = random.Random(books)
+
+        with transaction.atomic():
+            start = time.perf_counter()
+            sample = self.create_books(rng, books)
+            self.stdout.write(f'Created {books:,} books in {time.perf_counter() - start:.1f}s')
+            self.analyze()
+
+            self.stdout.write(self.style.SUCCESS(
+                f'=== Search over {Book.objects.count():,} books on {connection.vendor}, {repeat} runs each: '
+                f'first list page with its count, and a 10-book type-ahead (median / p95 ms) ==='
+            ))
+            for label, query in self.queries(sample):
+                page, suggest, matches = [], [], 0
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    books = matching(Book.objects.all(), query)
+                    matches = books.count()
+                    list(books[:page_size])
+                    page.append((time.perf_counter() - start) * 1000)
+
+                    start = time.perf_counter()
+                    list(ranked(Book.objects.all(), search_books(query, 10)))
+                    suggest.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f'{label:<22} {query!r:<34} {self.summary(page)}  {self.summary(suggest)}  ({matches} results)'
+                )
+            transaction.set_rollback(True)
+
+    def summary(self, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return f'{statistics.median(timings):7.2f} / {p95:7.2f}'
+
+    def word(self, rng):
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+    def create_books(self, rng, count):
+        """Bulk insert ``count`` books; returns a few of them to search for"""
+        # Zipf-like vocabulary, so common and rare words both occur
+        vocabulary = list({self.word(rng) for _ in range(20000)})
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+        surnames = vocabulary[:3000]
+        sample, batch = [], []
+        for number in range(count):
+            book = Book(
+                book_id=f'BENCH{number:09d}',
+                isbn=f'978-{rng.randrange(10 ** 9, 10 ** 10)}',
+                title=' '.join(rng.choices(vocabulary, weights, k=rng.randint(2, 6))).title(),
+                author=f'{rng.choice(FIRST_NAMES)} {rng.choice(surnames).title()}',
+                publisher=rng.choice(vocabulary[:200]).title(),
+                category=rng.choice(['Science', 'History', 'Literature', 'Business', 'Art']),
+                location='Benchmark',
+                description=' '.join(rng.choices(vocabulary, weights, k=20)),
+            )
+            batch.append(book)
+            if number % max(1, count // 5) == 0:
+                sample.append(book)
+            if len(batch) == 5000:
+                Book.objects.bulk_create(batch)
+                batch = []
+        Book.objects.bulk_create(batch)
+        return sample
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE library_book' if connection.vendor == 'postgresql' else 'ANALYZE')
+
+    def queries(self, sample):
+        book = sample[-1]
+        title_words = book.title.split()
+        yield 'Exact title', book.title
+        yield 'Title words', ' '.join(title_words[-2:])
+        yield 'Author', book.author
+        yield 'Surname', book.author.split()[-1]
+        yield 'Title + author', f'{title_words[0]} {book.author.split()[-1]}'
+        for length in (2, 3, 5):
+            yield f'Type-ahead ({length} chars)', title_words[-1][:length]
+        yield 'ISBN', book.isbn
+        yield 'ISBN without hyphen', book.isbn.replace('-', '')
+        yield 'ISBN prefix', book.isbn[:9]
+        yield 'No match', 'zzyzx qwerty'
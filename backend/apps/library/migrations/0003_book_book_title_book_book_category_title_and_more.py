@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0002_initial'),
+        ('users', '0004_statelessuser_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title'], name='book_title'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['category', 'title'], name='book_category_title'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['status', 'title'], name='book_status_title'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author'], name='book_author'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publication_year'], name='book_publication_year'),
+        ),
+        migrations.AddIndex(
+            model_name='checkout',
+            index=models.Index(fields=['student', 'status', '-checkout_date'], name='checkout_student_status'),
+        ),
+        migrations.AddIndex(
+            model_name='checkout',
+            index=models.Index(fields=['status', '-checkout_date'], name='checkout_status_date'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+"""
+Full-text search structures for the library catalog (see apps/library/search.py).
+
+PostgreSQL gets a weighted tsvector kept in a generated column with a GIN
+index, SQLite an FTS5 table filled by triggers. Other databases get nothing
+and search falls back to ``icontains`` matching.
+"""
+from django.db import migrations
+
+POSTGRESQL_FORWARDS = [
+    """
+    ALTER TABLE library_book ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', regexp_replace(upper(coalesce(isbn, '')), '[^0-9X]', '', 'g')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(author, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(publisher, '') || ' ' || coalesce(category, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+    ) STORED
+    """,
+    'CREATE INDEX book_search_vector ON library_book USING GIN (search_vector)',
+]
+
+POSTGRESQL_BACKWARDS = [
+    'DROP INDEX IF EXISTS book_search_vector',
+    'ALTER TABLE library_book DROP COLUMN IF EXISTS search_vector',
+]
+
+# The FTS row of a book is found through its (tokenized) book_id, since the
+# rowid of a table without an integer primary key may change on VACUUM
+SQLITE_ISBN = "replace(replace(upper({row}.isbn), '-', ''), ' ', '')"
+SQLITE_VALUES = (
+    "{row}.book_id, {row}.title, " + SQLITE_ISBN + ", {row}.author, "
+    "{row}.publisher || ' ' || {row}.category, {row}.description"
+)
+SQLITE_DELETE = (
+    "DELETE FROM library_book_fts WHERE library_book_fts MATCH "
+    "('book_id:\"' || replace(old.book_id, '\"', '\"\"') || '\"') AND book_id = old.book_id;"
+)
+SQLITE_INSERT = (
+    "INSERT INTO library_book_fts (book_id, title, isbn, author, publisher_category, description) "
+    "VALUES (" + SQLITE_VALUES.format(row='new') + ");"
+)
+
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE library_book_fts USING fts5(
+        book_id, title, isbn, author, publisher_category, description,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3 4'
+    )
+    """,
+    "INSERT INTO library_book_fts (book_id, title, isbn, author, publisher_category, description) "
+    "SELECT " + SQLITE_VALUES.format(row='library_book') + " FROM library_book",
+    f"CREATE TRIGGER library_book_fts_insert AFTER INSERT ON library_book BEGIN {SQLITE_INSERT} END",
+    "CREATE TRIGGER library_book_fts_update AFTER UPDATE OF "
+    "book_id, title, isbn, author, publisher, category, description ON library_book "
+    f"BEGIN {SQLITE_DELETE} {SQLITE_INSERT} END",
+    f"CREATE TRIGGER library_book_fts_delete AFTER DELETE ON library_book BEGIN {SQLITE_DELETE} END",
+]
+
+SQLITE_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS library_book_fts_insert',
+    'DROP TRIGGER IF EXISTS library_book_fts_update',
+    'DROP TRIGGER IF EXISTS library_book_fts_delete',
+    'DROP TABLE IF EXISTS library_book_fts',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0003_book_book_title_book_book_category_title_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'postgresql': POSTGRESQL_FORWARDS, 'sqlite': SQLITE_FORWARDS}),
+            run({'postgresql': POSTGRESQL_BACKWARDS, 'sqlite': SQLITE_BACKWARDS}),
+        ),
+    ]
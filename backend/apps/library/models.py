@@ -27,6 +27,14 @@ class Book(models.Model):
 
     class Meta:
         ordering = ['title']
+        # Filters and orderings of the books endpoint
+        indexes = [
+            models.Index(fields=['title'], name='book_title'),
+            models.Index(fields=['category', 'title'], name='book_category_title'),
+            models.Index(fields=['status', 'title'], name='book_status_title'),
+            models.Index(fields=['author'], name='book_author'),
+            models.Index(fields=['publication_year'], name='book_publication_year'),
+        ]
 
     def __str__(self):
         return f"{self.book_id} - {self.title}"
@@ -53,6 +61,11 @@ class Checkout(models.Model):
 
     class Meta:
         ordering = ['-checkout_date']
+        # A student's checkouts (optionally only active ones), and the ?status= filter
+        indexes = [
+            models.Index(fields=['student', 'status', '-checkout_date'], name='checkout_student_status'),
+            models.Index(fields=['status', '-checkout_date'], name='checkout_status_date'),
+        ]
 
     def __str__(self):
         return f"{self.student.student_id} - {self.book.title}"
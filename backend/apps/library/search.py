@@ -0,0 +1,223 @@
+"""
+Full-text search over the library catalog.
+
+PostgreSQL keeps a weighted tsvector of every book in the generated
+``library_book.search_vector`` column behind a GIN index; SQLite keeps an
+FTS5 table filled by triggers (migration 0004_book_search). Both are
+maintained by the database itself, so saves, imports and raw SQL writes are
+searchable at once. Other databases fall back to ``SearchFilter``.
+
+Queries match every word, the last one as a prefix (from MIN_PREFIX
+characters) so the search box can suggest titles while the user types.
+ISBNs match with or without hyphens, and an ISBN-10 also finds its ISBN-13
+form.
+
+``?search=`` on the book list ranks and pages through every match. The
+type-ahead (``/api/library/books/suggest/``) returns at most
+``LIBRARY_SEARCH_MAX_RESULTS`` books and ranks only the first
+``LIBRARY_SEARCH_CANDIDATES`` matches, which bounds its cost for a short
+prefix.
+"""
+import re
+from django.conf import settings
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+WORD = re.compile(r'\w+')
+# Shorter last words match whole words only; their prefixes match too much of the catalog
+MIN_PREFIX = 3
+# Digit groups of an ISBN as typed: "978-0-306-40615-7" or "0 306 40615 X"
+ISBN_GROUPS = re.compile(r'\b\d[\d\s-]*[\dXx]\b')
+ISBN10 = re.compile(r'^\d{9}[\dx]$')
+ISBN13 = re.compile(r'^978\d{10}$')
+
+# bm25() weights for the FTS5 columns: book_id, title, isbn, author, publisher_category, description
+SQLITE_WEIGHTS = '0.0, 10.0, 10.0, 5.0, 2.0, 1.0'
+SQLITE_COLUMNS = '{title isbn author publisher_category description}'
+
+# Search engine of each database, looked up once per process
+engines = {}
+
+
+def normalize_isbns(text):
+    """Join the digit groups of ISBNs typed with separators"""
+    def join(match):
+        digits = re.sub(r'[\s-]', '', match.group())
+        # Spaces only separate ISBN groups when they add up to a whole ISBN
+        if len(digits) in (10, 13) or not re.search(r'\s', match.group()):
+            return digits
+        return match.group()
+    return ISBN_GROUPS.sub(join, text)
+
+
+def isbn13(isbn10):
+    """The ISBN-13 form of a normalized ISBN-10"""
+    digits = '978' + isbn10[:9]
+    check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits)) % 10) % 10
+    return digits + str(check)
+
+
+def isbn10(isbn13):
+    """The ISBN-10 form of a normalized 978 ISBN-13, lowercased like the index"""
+    digits = isbn13[3:12]
+    check = (11 - sum(int(d) * (10 - i) for i, d in enumerate(digits)) % 11) % 11
+    return digits + ('x' if check == 10 else str(check))
+
+
+def query_terms(text):
+    """
+    The words of ``text``, lowercased. Each word is a list of alternatives,
+    any of which may match: a whole ISBN also matches its other form.
+    """
+    terms = []
+    for word in WORD.findall(normalize_isbns(text).lower()):
+        if ISBN10.match(word):
+            terms.append([word, isbn13(word)])
+        elif ISBN13.match(word):
+            terms.append([word, isbn10(word)])
+        else:
+            terms.append([word])
+    return terms
+
+
+def engine(using='default'):
+    """'postgresql' or 'sqlite' when the catalog has a search index there, else None"""
+    connection = connections[using]
+    key = (using, connection.settings_dict['NAME'])
+    if key not in engines:
+        kind = None
+        if connection.vendor == 'postgresql':
+            kind = 'postgresql'
+        elif connection.vendor == 'sqlite':
+            # The FTS5 table is missing when the SQLite build lacks FTS5
+            with connection.cursor() as cursor:
+                if 'library_book_fts' in connection.introspection.table_names(cursor):
+                    kind = 'sqlite'
+        engines[key] = kind
+    return engines[key]
+
+
+def is_prefix(terms, position):
+    return position == len(terms) - 1 and len(terms[position][0]) >= MIN_PREFIX
+
+
+def postgresql_query(terms):
+    """A to_tsquery() string; words are \\w+ only, so nothing needs escaping"""
+    groups = []
+    for position, alternatives in enumerate(terms):
+        suffix = ':*' if is_prefix(terms, position) else ''
+        groups.append('(' + ' | '.join(f'{word}{suffix}' for word in alternatives) + ')')
+    return ' & '.join(groups)
+
+
+def sqlite_query(terms):
+    """An FTS5 MATCH expression over the searchable columns"""
+    groups = []
+    for position, alternatives in enumerate(terms):
+        suffix = '*' if is_prefix(terms, position) else ''
+        groups.append('(' + ' OR '.join(f'"{word}"{suffix}' for word in alternatives) + ')')
+    return f'{SQLITE_COLUMNS} : ({" AND ".join(groups)})'
+
+
+def matching(queryset, text):
+    """
+    ``queryset`` narrowed to every book matching ``text`` and ordered best
+    match first, or None when the database has no search index. The rank is
+    in the ``search_rank`` column, lower first on SQLite and higher first on
+    PostgreSQL.
+    """
+    kind = engine(queryset.db)
+    if kind is None:
+        return None
+    terms = query_terms(text)
+    if not terms:
+        return queryset.none()
+    # extra() because on SQLite bm25() needs the FTS table joined, not in a subquery
+    if kind == 'postgresql':
+        query = postgresql_query(terms)
+        return queryset.extra(
+            select={'search_rank': "ts_rank_cd(library_book.search_vector, to_tsquery('simple', %s))"},
+            select_params=[query],
+            where=["library_book.search_vector @@ to_tsquery('simple', %s)"],
+            params=[query],
+        ).order_by('-search_rank', 'title', 'pk')
+    return queryset.extra(
+        select={'search_rank': f'bm25(library_book_fts, {SQLITE_WEIGHTS})'},
+        tables=['library_book_fts'],
+        where=['library_book_fts.book_id = library_book.book_id', 'library_book_fts MATCH %s'],
+        params=[sqlite_query(terms)],
+    ).order_by('search_rank', 'title', 'pk')
+
+
+def search_books(text, limit=None, using='default', within=None):
+    """
+    Ids of the best ``limit`` books matching ``text`` for the type-ahead,
+    best match first, or None when the database has no search index. Title and ISBN weigh most, then author,
+    publisher and category, then the description. ``within`` is an optional
+    Book queryset the matches are taken from, so filters apply before the
+    results are capped.
+    """
+    kind = engine(using)
+    if kind is None:
+        return None
+    terms = query_terms(text)
+    if not terms:
+        return []
+    limit = limit or settings.LIBRARY_SEARCH_MAX_RESULTS
+    candidates = max(limit, settings.LIBRARY_SEARCH_CANDIDATES)
+    restrict, restrict_params = '', []
+    if within is not None and within.query.where:
+        subquery, restrict_params = within.order_by().values('pk').query.sql_with_params()
+        restrict = f' AND book_id IN ({subquery})'
+
+    with connections[using].cursor() as cursor:
+        if kind == 'postgresql':
+            cursor.execute(
+                "SELECT book_id FROM ("
+                "    SELECT book_id, title, search_vector FROM library_book"
+                f"    WHERE search_vector @@ to_tsquery('simple', %s){restrict} LIMIT %s"
+                ") AS candidates "
+                "ORDER BY ts_rank_cd(search_vector, to_tsquery('simple', %s)) DESC, title LIMIT %s",
+                [postgresql_query(terms), *restrict_params, candidates, postgresql_query(terms), limit],
+            )
+        else:
+            cursor.execute(
+                "SELECT book_id FROM ("
+                f"    SELECT book_id, title, bm25(library_book_fts, {SQLITE_WEIGHTS}) AS score"
+                f"    FROM library_book_fts WHERE library_book_fts MATCH %s{restrict} LIMIT %s"
+                ") AS candidates "
+                "ORDER BY score, title LIMIT %s",
+                [sqlite_query(terms), *restrict_params, candidates, limit],
+            )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def ranked(queryset, book_ids):
+    """``queryset`` narrowed to ``book_ids`` and ordered like them"""
+    if not book_ids:
+        return queryset.none()
+    if connections[queryset.db].vendor == 'postgresql':
+        position = RawSQL('array_position(%s::text[], "library_book"."book_id"::text)', [list(book_ids)])
+    else:
+        # Offset of ",<book_id>," in the comma-joined ids
+        position = RawSQL('instr(%s, \',\' || "library_book"."book_id" || \',\')', [f',{",".join(book_ids)},'])
+    return queryset.filter(pk__in=book_ids).order_by(position)
+
+
+class BookSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` through the catalog's full-text index, ranked by relevance.
+    Every match is kept, so pagination counts and pages through all of them.
+    Falls back to ``search_fields`` matching where there is no index.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        books = matching(queryset, text)
+        if books is None:
+            return super().filter_queryset(request, queryset, view)
+        return books
+
@@ -1,24 +1,62 @@
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
+from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Book, Checkout
 from .serializers import BookSerializer, CheckoutSerializer
-from apps.users.models import StudentProfile
+from apps.core.cache import CachedCatalogMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.sparse import SparseFieldsetMixin
+from .search import BookSearchFilter, ranked, search_books
 
 
-class BookViewSet(viewsets.ReadOnlyModelViewSet):
+def student_checkouts(student_profile):
+    """A student's checkouts, newest first (my_checkouts and the dashboard)"""
+    return Checkout.objects.filter(
+        student=student_profile
+    ).select_related('book').order_by('-checkout_date')
+
+
+class BookViewSet(ConditionalGetMixin, CachedCatalogMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for library books"""
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, BookSearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'status']
     search_fields = ['title', 'author', 'isbn']
     ordering_fields = ['title', 'author', 'publication_year']
+    cache_models = [Book]
+
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Type-ahead: the best ``limit`` books matching ``q``, the last word
+        as a prefix. The ``category`` and ``status`` filters apply first.
+        """
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            limit = 10
+        limit = max(1, min(limit, settings.LIBRARY_SEARCH_MAX_RESULTS))
+        text = request.query_params.get('q', '')
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        if not text.strip():
+            return Response([])
 
+        book_ids = search_books(text, limit, using=queryset.db, within=queryset)
+        if book_ids is None:
+            books = queryset.filter(
+                Q(title__icontains=text) | Q(author__icontains=text) | Q(isbn__icontains=text)
+            ).order_by('title')[:limit]
+        else:
+            books = ranked(queryset, book_ids)
+        return Response(self.get_serializer(books, many=True).data)
 
-class CheckoutViewSet(viewsets.ReadOnlyModelViewSet):
+
+class CheckoutViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for library checkouts"""
     queryset = Checkout.objects.select_related('book', 'student__user').all()
     serializer_class = CheckoutSerializer
@@ -32,11 +70,10 @@ class CheckoutViewSet(viewsets.ReadOnlyModelViewSet):
 
         # Students see only their own checkouts
         if user.role == 'student':
-            try:
-                student_profile = StudentProfile.objects.get(user=user)
-                queryset = queryset.filter(student=student_profile)
-            except StudentProfile.DoesNotExist:
+            student_profile = self.request.profile
+            if not student_profile:
                 return Checkout.objects.none()
+            queryset = queryset.filter(student=student_profile)
 
         return queryset
 
@@ -49,19 +86,14 @@ class CheckoutViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            checkouts = Checkout.objects.filter(
-                student=student_profile
-            ).select_related('book').order_by('-checkout_date')
-
-            serializer = CheckoutSerializer(checkouts, many=True)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = CheckoutSerializer(student_checkouts(student_profile), many=True)
+        return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def active(self, request):
@@ -72,17 +104,16 @@ class CheckoutViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            checkouts = Checkout.objects.filter(
-                student=student_profile,
-                status__in=['Active', 'Overdue']
-            ).select_related('book')
-
-            serializer = CheckoutSerializer(checkouts, many=True)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        checkouts = Checkout.objects.filter(
+            student=student_profile,
+            status__in=['Active', 'Overdue']
+        ).select_related('book')
+
+        serializer = CheckoutSerializer(checkouts, many=True)
+        return Response(serializer.data)
@@ -112,6 +112,12 @@ class Event(models.Model):
 
     class Meta:
         ordering = ['-date']
+        # The default ordering, ?type= / ?status=, and upcoming (status = 'Scheduled' and date >= today)
+        indexes = [
+            models.Index(fields=['date'], name='event_date'),
+            models.Index(fields=['status', 'date'], name='event_status_date'),
+            models.Index(fields=['type', 'date'], name='event_type_date'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.date}"
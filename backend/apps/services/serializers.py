@@ -30,3 +30,8 @@ class EventSerializer(serializers.ModelSerializer):
         fields = ['event_id', 'name', 'type', 'description', 'date',
                   'start_time', 'end_time', 'location', 'organizer',
                   'capacity', 'registered', 'status', 'is_full', 'available_spots']
+        # Columns read by computed fields, for ?fields= projections
+        field_columns = {
+            'is_full': ['capacity', 'registered'],
+            'available_spots': ['capacity', 'registered'],
+        }
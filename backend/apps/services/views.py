@@ -4,10 +4,30 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import FinancialAid, ParkingPermit, Event
 from .serializers import FinancialAidSerializer, ParkingPermitSerializer, EventSerializer
-from apps.users.models import StudentProfile
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.sparse import SparseFieldsetMixin
 
 
-class FinancialAidViewSet(viewsets.ReadOnlyModelViewSet):
+def financial_aid_payload(student_profile):
+    """The my_aid response: a student's aid records with their totals"""
+    aid_records = list(FinancialAid.objects.filter(
+        student=student_profile
+    ).order_by('-disbursement_date'))
+    return {
+        'aid_records': FinancialAidSerializer(aid_records, many=True).data,
+        'total_amount': sum(aid.amount for aid in aid_records),
+        'disbursed_amount': sum(aid.amount for aid in aid_records if aid.status == 'Disbursed')
+    }
+
+
+def student_permits(student_profile):
+    """A student's parking permits, newest first (my_permits and the dashboard)"""
+    return ParkingPermit.objects.filter(
+        student=student_profile
+    ).order_by('-issue_date')
+
+
+class FinancialAidViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for financial aid"""
     queryset = FinancialAid.objects.select_related('student__user').all()
     serializer_class = FinancialAidSerializer
@@ -21,11 +41,10 @@ class FinancialAidViewSet(viewsets.ReadOnlyModelViewSet):
 
         # Students see only their own financial aid
         if user.role == 'student':
-            try:
-                student_profile = StudentProfile.objects.get(user=user)
-                queryset = queryset.filter(student=student_profile)
-            except StudentProfile.DoesNotExist:
+            student_profile = self.request.profile
+            if not student_profile:
                 return FinancialAid.objects.none()
+            queryset = queryset.filter(student=student_profile)
 
         return queryset
 
@@ -38,31 +57,16 @@ class FinancialAidViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            aid_records = FinancialAid.objects.filter(
-                student=student_profile
-            ).order_by('-disbursement_date')
-
-            serializer = FinancialAidSerializer(aid_records, many=True)
-
-            # Calculate totals
-            total_amount = sum(aid.amount for aid in aid_records)
-            disbursed = sum(aid.amount for aid in aid_records if aid.status == 'Disbursed')
-
-            return Response({
-                'aid_records': serializer.data,
-                'total_amount': total_amount,
-                'disbursed_amount': disbursed
-            })
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        return Response(financial_aid_payload(student_profile))
 
 
-class ParkingPermitViewSet(viewsets.ReadOnlyModelViewSet):
+class ParkingPermitViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for parking permits"""
     queryset = ParkingPermit.objects.select_related('student__user').all()
     serializer_class = ParkingPermitSerializer
@@ -76,11 +80,10 @@ class ParkingPermitViewSet(viewsets.ReadOnlyModelViewSet):
 
         # Students see only their own permits
         if user.role == 'student':
-            try:
-                student_profile = StudentProfile.objects.get(user=user)
-                queryset = queryset.filter(student=student_profile)
-            except StudentProfile.DoesNotExist:
+            student_profile = self.request.profile
+            if not student_profile:
                 return ParkingPermit.objects.none()
+            queryset = queryset.filter(student=student_profile)
 
         return queryset
 
@@ -93,22 +96,17 @@ class ParkingPermitViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            student_profile = StudentProfile.objects.get(user=request.user)
-            permits = ParkingPermit.objects.filter(
-                student=student_profile
-            ).order_by('-issue_date')
-
-            serializer = ParkingPermitSerializer(permits, many=True)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        student_profile = request.profile
+        if not student_profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = ParkingPermitSerializer(student_permits(student_profile), many=True)
+        return Response(serializer.data)
 
 
-class EventViewSet(viewsets.ReadOnlyModelViewSet):
+class EventViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for campus events"""
     queryset = Event.objects.all()
     serializer_class = EventSerializer
@@ -117,15 +115,16 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['type', 'status']
     search_fields = ['name', 'description', 'organizer']
     ordering_fields = ['date', 'name']
+    sparse_actions = ('list', 'retrieve', 'upcoming')
 
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming events"""
         from datetime import date
-        events = Event.objects.filter(
+        events = self.get_queryset().filter(
             date__gte=date.today(),
             status='Scheduled'
         ).order_by('date')
 
-        serializer = EventSerializer(events, many=True)
+        serializer = self.get_serializer(events, many=True)
         return Response(serializer.data)
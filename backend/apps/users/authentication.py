@@ -0,0 +1,91 @@
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .models import User, StatelessUser
+from .tokens import CLAIMS, PROFILES_CLAIM, VERSION_CLAIM, token_version
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user's role profile in the same query
+    as the user, so ``request.profile`` costs nothing extra.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = self.user_model.objects.select_related(
+                *User.PROFILE_RELATIONS.values()
+            ).get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+class StatelessJWTAuthentication(ProfileJWTAuthentication):
+    """
+    JWT authentication that builds the user from the token's claims.
+
+    The token's version is checked against the user's current
+    ``token_version`` (cached, see apps.users.tokens), so authenticating a
+    request reads neither the user nor the profile tables. Tokens issued
+    without these claims fall back to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token or any(
+            claim not in validated_token for claim in CLAIMS
+        ):
+            return super().get_user(validated_token)
+
+        # simplejwt stores the id as a string
+        user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        if token_version(user_id) != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return self.user_from_claims(user_id, validated_token)
+
+    def user_from_claims(self, user_id, validated_token):
+        """A StatelessUser whose row and profiles are deferred, except for what the token carries"""
+        db = router.db_for_read(User)
+        known = {
+            User._meta.pk.attname: user_id,
+            'role': validated_token['role'],
+            'is_staff': validated_token['is_staff'],
+            'is_superuser': validated_token['is_superuser'],
+            'is_active': True,
+            'token_version': validated_token[VERSION_CLAIM],
+        }
+        user = self.from_db(StatelessUser, db, known)
+
+        profiles = validated_token[PROFILES_CLAIM]
+        for relation in User.PROFILE_RELATIONS.values():
+            rel = User._meta.get_field(relation)
+            profile = None
+            if profiles.get(relation) is not None:
+                profile = self.from_db(rel.related_model, db, {
+                    rel.related_model._meta.pk.attname: profiles[relation],
+                    rel.field.attname: user.pk,
+                })
+                rel.field.set_cached_value(profile, user)
+            rel.set_cached_value(user, profile)
+        return user
+
+    @staticmethod
+    def from_db(model, db, values):
+        field_names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+        return model.from_db(db, field_names, [values[name] for name in field_names])
@@ -1,29 +1,77 @@
 import csv
+import hashlib
 import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from functools import partial
 from django.core.management.base import BaseCommand
 from django.contrib.auth.hashers import make_password
 from django.utils import timezone
-from django.db import transaction
+from django.db import connection, connections, transaction
 
-from apps.users.models import User, StudentProfile, FacultyProfile, StaffProfile
+from apps.users.models import User, StudentProfile, FacultyProfile, StaffProfile, ImportFingerprint
 from apps.facilities.models import Building, Room
-from apps.academics.models import Department, Course, Section, Enrollment
+from apps.academics.models import Department, Course, Section, Enrollment, TermGPA
 from apps.assessments.models import Assignment, Submission
-from apps.attendance.models import AttendanceRecord
+from apps.attendance.models import AttendanceRecord, AttendanceRollup
 from apps.library.models import Book, Checkout
 from apps.services.models import FinancialAid, ParkingPermit, Event
+from apps.core.models import TableVersion
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
 
 class Command(BaseCommand):
     help = 'Import data from CSV files in the data/ directory'
     DEFAULT_PASSWORD = 'password123'
-
-    def __init__(self):
-        super().__init__()
+    DEFAULT_BATCH_SIZE = 1000
+    # User columns each people file sets; --incremental keeps them current on
+    # existing accounts. Usernames and passwords are never overwritten.
+    USER_FIELDS = ('email', 'first_name', 'last_name', 'phone')
+    STUDENT_USER_FIELDS = USER_FIELDS + ('date_of_birth', 'address', 'city', 'state', 'zip_code')
+
+    # (summary label, importer method, labels of steps it depends on).
+    # Listed in an order that respects foreign keys, which is the order used
+    # by a serial import. Users share one email namespace, so students,
+    # faculty and staff are chained to keep "first file wins" deterministic.
+    IMPORT_STEPS = [
+        ('Departments', 'import_departments', []),
+        ('Buildings', 'import_buildings', []),
+        ('Rooms', 'import_rooms', ['Buildings']),
+        ('Students', 'import_students', []),
+        ('Faculty', 'import_faculty', ['Students']),
+        ('Staff', 'import_staff', ['Faculty']),
+        ('Courses', 'import_courses', ['Departments']),
+        ('Sections', 'import_sections', ['Courses', 'Faculty', 'Rooms']),
+        ('Enrollments', 'import_enrollments', ['Students', 'Sections']),
+        ('Assignments', 'import_assignments', ['Sections']),
+        ('Submissions', 'import_submissions', ['Assignments', 'Students']),
+        ('Attendance Records', 'import_attendance', ['Students', 'Sections']),
+        ('Library Books', 'import_library_books', []),
+        ('Library Checkouts', 'import_library_checkouts', ['Library Books', 'Students']),
+        ('Financial Aid', 'import_financial_aid', ['Students']),
+        ('Parking Permits', 'import_parking', ['Students']),
+        ('Events', 'import_events', []),
+    ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.data_dir = 'data'
+        self.batch_size = self.DEFAULT_BATCH_SIZE
         self.imported_counts = {}
+        self.import_timings = {}
+        self.incremental = False
+        self.change_counts = {}
+        self.lookups = {}
+        self.lookup_lock = threading.Lock()
         self.default_password_hash = None
 
     def add_arguments(self, parser):
@@ -33,9 +81,37 @@ class Command(BaseCommand):
             default='data',
             help='Directory containing CSV files (default: data/)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=self.DEFAULT_BATCH_SIZE,
+            help=f'Rows written per bulk INSERT/UPDATE (default: {self.DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Number of independent tables to import concurrently (default: 1)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only write rows whose content changed since the last incremental run, '
+                 'and delete rows that disappeared from the CSV files'
+        )
 
     def handle(self, *args, **options):
         self.data_dir = options['data_dir']
+        self.batch_size = max(1, options['batch_size'])
+        self.incremental = options['incremental']
+        self.change_counts = {}
+        self.lookups = {}
+        jobs = max(1, options['jobs'])
+        if jobs > 1 and connection.vendor == 'sqlite':
+            # SQLite allows a single writer, so concurrent stages would only
+            # contend for the database lock.
+            self.stdout.write(self.style.WARNING('SQLite does not support concurrent writers; using --jobs 1'))
+            jobs = 1
 
         if not os.path.exists(self.data_dir):
             self.stdout.write(self.style.ERROR(f'Data directory "{self.data_dir}" not found'))
@@ -48,47 +124,117 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Starting data import...'))
 
         try:
-            with transaction.atomic():
-                # Import in correct order respecting dependencies
-                self.import_departments()
-                self.import_buildings()
-                self.import_rooms()
-                self.import_students()
-                self.import_faculty()
-                self.import_staff()
-                self.import_courses()
-                self.import_sections()
-                self.import_enrollments()
-                self.import_assignments()
-                self.import_submissions()
-                self.import_attendance()
-                self.import_library_books()
-                self.import_library_checkouts()
-                self.import_financial_aid()
-                self.import_parking()
-                self.import_events()
+            started = time.perf_counter()
+            if jobs == 1:
+                with transaction.atomic():
+                    for label, method_name, _ in self.IMPORT_STEPS:
+                        self.run_step(label, method_name)
+            else:
+                self.run_steps_concurrently(jobs)
+            wall_clock = time.perf_counter() - started
+            # Bulk writes bypass the model signals that bump the versions
+            # behind ETags and catalog cache keys
+            TableVersion.bump(
+                User, StudentProfile, FacultyProfile, StaffProfile, Building, Room,
+                Department, Course, Section, Enrollment, Assignment, Submission,
+                AttendanceRecord, Book, Checkout, FinancialAid, ParkingPermit, Event,
+            )
 
             self.stdout.write(self.style.SUCCESS('\n=== Import Summary ==='))
-            for model_name, count in self.imported_counts.items():
-                self.stdout.write(self.style.SUCCESS(f'{model_name}: {count} records'))
+            for model_name, _, _ in self.IMPORT_STEPS:
+                count = self.imported_counts[model_name]
+                elapsed = self.import_timings[model_name]
+                rate = count / elapsed if elapsed > 0 else 0
+                self.stdout.write(self.style.SUCCESS(
+                    f'{model_name}: {count} records in {elapsed:.2f}s ({rate:,.0f} rows/sec)'
+                ))
 
             total = sum(self.imported_counts.values())
-            self.stdout.write(self.style.SUCCESS(f'\nTotal records imported: {total}'))
+            stage_time = sum(self.import_timings.values())
+            self.stdout.write(self.style.SUCCESS(
+                f'\nTotal records imported: {total} in {wall_clock:.2f}s '
+                f'({stage_time:.2f}s of stage time, {jobs} job(s))'
+            ))
+            if self.incremental:
+                self.stdout.write(self.style.SUCCESS('\n=== Incremental Changes ==='))
+                for table, (changed, unchanged, unresolved, deleted) in self.change_counts.items():
+                    self.stdout.write(self.style.SUCCESS(
+                        f'{table}: {changed} changed, {unchanged} unchanged, '
+                        f'{unresolved} unresolved, {deleted} deleted'
+                    ))
+
+            peak_memory = self.peak_memory_mb()
+            if peak_memory is not None:
+                self.stdout.write(self.style.SUCCESS(f'Peak memory: {peak_memory:.1f} MB'))
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Import failed: {str(e)}'))
             raise
 
+    def run_step(self, label, method_name):
+        """Run a single importer and record its row count and elapsed time."""
+        started = time.perf_counter()
+        self.imported_counts[label] = getattr(self, method_name)()
+        self.import_timings[label] = time.perf_counter() - started
+
+    def run_concurrent_step(self, label, method_name):
+        """Run a step on a worker thread in its own transaction and connection."""
+        try:
+            with transaction.atomic():
+                self.run_step(label, method_name)
+        finally:
+            connections.close_all()
+
+    def run_steps_concurrently(self, jobs):
+        """
+        Run IMPORT_STEPS on a pool of ``jobs`` threads, starting each step as
+        soon as the steps it depends on have committed.
+
+        Each step commits on its own, so a failure leaves earlier steps in
+        place; re-running the command is safe because every writer is
+        idempotent.
+        """
+        pending = {label: (method_name, set(deps)) for label, method_name, deps in self.IMPORT_STEPS}
+        completed = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            while pending or running:
+                ready = [label for label, (_, deps) in pending.items() if deps <= completed]
+                for label in ready:
+                    method_name, _ = pending.pop(label)
+                    running[executor.submit(self.run_concurrent_step, label, method_name)] = label
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    label = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        pending.clear()
+                        raise
+                    completed.add(label)
+                    self.stdout.write(f'Finished {label.lower()} in {self.import_timings[label]:.2f}s')
+
     def read_csv(self, filename):
-        """Read CSV file and return list of dictionaries"""
+        """Stream rows of a CSV file as dictionaries without loading the whole file"""
         filepath = os.path.join(self.data_dir, filename)
         if not os.path.exists(filepath):
             self.stdout.write(self.style.WARNING(f'File not found: {filepath}'))
-            return []
+            return
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+
+    def batched(self, rows):
+        """Yield lists of at most ``batch_size`` rows."""
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
     def get_value(self, row, *keys, default=''):
         """Return the first non-empty value for the provided keys."""
@@ -173,579 +319,1135 @@ class Command(BaseCommand):
             return value
         return str(value).strip().lower() in {'true', '1', 'yes', 'y'}
 
+    # ------------------------------------------------------------------
+    # Lookup maps
+    # ------------------------------------------------------------------
+
+    def lookup(self, name):
+        """Return the ``name`` lookup map, loading it from the database once per run."""
+        if name not in self.lookups:
+            with self.lookup_lock:
+                if name not in self.lookups:
+                    self.lookups[name] = getattr(self, f'load_{name}_lookup')()
+        return self.lookups[name]
+
+    def reset_lookup(self, name):
+        """Drop a cached lookup map after its table has been written."""
+        self.lookups.pop(name, None)
+
+    def load_departments_by_name_lookup(self):
+        departments = {}
+        for department in Department.objects.all():
+            departments.setdefault(department.name.lower(), department)
+        return departments
+
+    def load_buildings_lookup(self):
+        return {building.building_id: building for building in Building.objects.all()}
+
+    def load_buildings_by_name_lookup(self):
+        buildings = {}
+        for building in Building.objects.all():
+            buildings.setdefault(building.name.lower(), building)
+        return buildings
+
+    def load_rooms_lookup(self):
+        return {room.room_id: room for room in Room.objects.all()}
+
+    def load_rooms_by_number_lookup(self):
+        rooms = {}
+        for room in Room.objects.all():
+            rooms.setdefault((room.building_id, room.room_number), room)
+        return rooms
+
+    def load_students_lookup(self):
+        return {
+            student.student_id: student
+            for student in StudentProfile.objects.select_related('user')
+        }
+
+    def load_faculty_lookup(self):
+        return {faculty.faculty_id: faculty for faculty in FacultyProfile.objects.all()}
+
+    def load_courses_lookup(self):
+        return {course.course_id: course for course in Course.objects.all()}
+
+    def load_sections_lookup(self):
+        return {section.section_id: section for section in Section.objects.all()}
+
+    def load_assignments_lookup(self):
+        return {assignment.assignment_id: assignment for assignment in Assignment.objects.all()}
+
+    def load_books_lookup(self):
+        return {book.book_id: book for book in Book.objects.all()}
+
+    # ------------------------------------------------------------------
+    # Bulk writers
+    # ------------------------------------------------------------------
+
+    def bulk_insert(self, model, objects):
+        """
+        Insert ``objects``, skipping any whose primary key already exists.
+
+        This gives ``get_or_create`` semantics: the first row seen for a key
+        wins and existing rows are left untouched. In incremental mode only
+        changed rows reach the writer, so existing rows are updated instead.
+        """
+        if self.incremental:
+            fields = [
+                field for field in model._meta.concrete_fields
+                if not field.primary_key and not getattr(field, 'auto_now_add', False)
+            ]
+            rows = [(obj.pk, {field.name: getattr(obj, field.name) for field in fields}) for obj in objects]
+            return self.bulk_upsert(model, rows, natural_key=())
+
+        model.objects.bulk_create(objects, batch_size=self.batch_size, ignore_conflicts=True)
+        return len(objects)
+
+    def bulk_upsert(self, model, rows, natural_key, prepare=None):
+        """
+        Insert or update a batch of ``(pk, field_values)`` pairs and return the
+        number of rows processed.
+
+        Each row is matched against an existing record first by primary key and
+        then by ``natural_key`` (the model's ``unique_together`` fields), with
+        later rows overwriting earlier ones, so the result is the same as
+        saving each row in CSV order. Existing records are fetched in two
+        queries per batch.
+        """
+        if not rows:
+            return 0
+
+        pk_name = model._meta.pk.name
+        key_attnames = [model._meta.get_field(name).attname for name in natural_key]
+        fields = list(rows[0][1].keys())
+
+        def key_of(obj):
+            return tuple(getattr(obj, attname) for attname in key_attnames)
+
+        by_pk = model.objects.in_bulk([pk for pk, _ in rows])
+        candidates = [model(**{pk_name: pk}, **values) for pk, values in rows]
+        by_key = {}
+        if key_attnames:
+            existing = model.objects.filter(**{
+                f'{attname}__in': {getattr(obj, attname) for obj in candidates}
+                for attname in key_attnames
+            })
+            for obj in existing:
+                by_pk.setdefault(obj.pk, obj)
+                by_key[key_of(obj)] = obj
+
+        created, updated = {}, {}
+        for candidate, (pk, values) in zip(candidates, rows):
+            obj = by_pk.get(pk)
+            if obj is None and key_attnames:
+                obj = by_key.get(key_of(candidate))
+            if obj is None:
+                obj = candidate
+                by_pk[pk] = obj
+                created[pk] = obj
+            else:
+                old_key = key_of(obj)
+                if by_key.get(old_key) is obj:
+                    del by_key[old_key]
+                for field, value in values.items():
+                    setattr(obj, field, value)
+                if obj.pk not in created:
+                    updated[obj.pk] = obj
+            if prepare:
+                prepare(obj)
+            by_key[key_of(obj)] = obj
+
+        if updated:
+            # INSERT ... ON CONFLICT (pk) DO UPDATE is far cheaper to build and
+            # run than bulk_update()'s per-row CASE expressions
+            model.objects.bulk_create(
+                list(updated.values()),
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=[pk_name],
+                update_fields=[name for name in fields if name != pk_name],
+            )
+        if created:
+            model.objects.bulk_create(list(created.values()), batch_size=self.batch_size)
+        return len(rows)
+
+    def create_users(self, profile_model, key, records, user_fields=USER_FIELDS):
+        """
+        Bulk-create users from ``(user, profile_fields)`` records whose email is
+        not taken yet, along with their role profile. The first record seen for
+        an email wins. In incremental mode, records whose profile ``key``
+        already exists update that user and profile instead. Returns the number
+        of users created or updated.
+        """
+        users, profiles = {}, {}
+        for user, profile_fields in records:
+            if user.email not in users:
+                users[user.email] = user
+                profiles[user.email] = profile_fields
+
+        updated = self.update_users(profile_model, key, users, profiles, user_fields) if self.incremental else 0
+
+        existing = set(User.objects.filter(email__in=users.keys()).values_list('email', flat=True))
+        new_users = [user for email, user in users.items() if email not in existing]
+        if not new_users:
+            return updated
+
+        User.objects.bulk_create(new_users, batch_size=self.batch_size)
+        # Not every backend returns primary keys from bulk_create, so fetch them
+        user_ids = dict(
+            User.objects.filter(email__in=[user.email for user in new_users]).values_list('email', 'id')
+        )
+        profile_objects = []
+        for user in new_users:
+            user.pk = user_ids[user.email]
+            profile_objects.append(profile_model(user=user, **profiles[user.email]))
+        profile_model.objects.bulk_create(profile_objects, batch_size=self.batch_size)
+        return len(new_users) + updated
+
+    def update_users(self, profile_model, key, users, profiles, user_fields):
+        """
+        Write changed records of existing profiles onto the profile and its
+        user, removing them from ``users`` and ``profiles``. A record whose new
+        email belongs to another account is skipped with a warning.
+        """
+        existing = {
+            getattr(profile, key): profile
+            for profile in profile_model.objects.filter(
+                **{f'{key}__in': [fields[key] for fields in profiles.values()]}
+            ).select_related('user')
+        }
+        if not existing:
+            return 0
+
+        renamed = {
+            email for email, fields in profiles.items()
+            if fields[key] in existing and existing[fields[key]].user.email != email
+        }
+        taken = set(User.objects.filter(email__in=renamed).values_list('email', flat=True))
+        changed_users, changed_profiles, profile_fields = [], [], []
+        for email in list(users):
+            fields = profiles[email]
+            profile = existing.get(fields[key])
+            if profile is None:
+                continue
+            user, record = profile.user, users.pop(email)
+            del profiles[email]
+            if email in taken:
+                self.stdout.write(self.style.WARNING(
+                    f'{fields[key]}: email {email} belongs to another user, row skipped'
+                ))
+                continue
+            for field in user_fields:
+                setattr(user, field, getattr(record, field))
+            for field, value in fields.items():
+                setattr(profile, field, value)
+            profile_fields = list(fields)
+            changed_users.append(user)
+            changed_profiles.append(profile)
+
+        if not changed_users:
+            return 0
+        # INSERT ... ON CONFLICT (pk) DO UPDATE, as in bulk_upsert()
+        User.objects.bulk_create(
+            changed_users,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=[*user_fields, 'updated_at'],
+        )
+        profile_model.objects.bulk_create(
+            changed_profiles,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=profile_fields,
+        )
+        return len(changed_users)
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
+    def run_pipeline(self, filename, build, write, key, model=None):
+        """
+        Stream ``filename`` through parse/resolve (``build``), batching and
+        writing (``write``) so that only one batch of rows is held in memory.
+
+        ``build`` turns a CSV row into a record for ``write`` or returns None to
+        skip the row. ``write`` receives a list of records and returns how many
+        it wrote. ``key`` names the CSV column(s) identifying a row; in
+        incremental mode unchanged rows are dropped before ``build`` and rows
+        missing from the file are deleted from ``model``.
+        Returns ``(rows_read, records_written)``.
+        """
+        rows_read = 0
+        records_written = 0
+        changed = unresolved = 0
+        seen_keys = set()
+        for batch in self.batched(self.read_csv(filename)):
+            rows_read += len(batch)
+            digests = {}
+            if self.incremental:
+                batch, digests = self.changed_rows(filename, batch, key, seen_keys)
+                changed += len(batch)
+
+            records, built_keys = [], []
+            for row in batch:
+                record = build(row)
+                if record is not None:
+                    records.append(record)
+                    if self.incremental:
+                        built_keys.append(self.get_value(row, *self.key_columns(key)))
+                else:
+                    unresolved += 1
+            if records:
+                records_written += write(records)
+            if self.incremental:
+                # Rows whose foreign keys did not resolve get no fingerprint,
+                # so they are retried on the next run
+                self.save_fingerprints(filename, {row_key: digests[row_key] for row_key in built_keys})
+
+        if self.incremental:
+            deleted = self.delete_missing_rows(filename, seen_keys, model)
+            self.change_counts[filename] = (changed - unresolved, len(seen_keys) - changed, unresolved, deleted)
+        return rows_read, records_written
+
+    # ------------------------------------------------------------------
+    # Incremental import
+    # ------------------------------------------------------------------
+
+    def key_columns(self, key):
+        return (key,) if isinstance(key, str) else key
+
+    def row_digest(self, row):
+        """Fingerprint of a CSV row's content, independent of how it is imported."""
+        content = '\x1f'.join(f'{column}={value}' for column, value in row.items())
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    def changed_rows(self, table, batch, key, seen_keys):
+        """
+        Return the rows of ``batch`` whose fingerprint differs from the one
+        stored by the previous incremental run, plus their new digests.
+
+        Only the first row for a key is considered, matching the "first row
+        wins" rule of the full import. ``seen_keys`` collects every key in the
+        file so that removed rows can be detected afterwards.
+        """
+        digests, rows = {}, {}
+        for row in batch:
+            row_key = self.get_value(row, *self.key_columns(key))
+            if not row_key or row_key in seen_keys:
+                continue
+            seen_keys.add(row_key)
+            rows[row_key] = row
+            digests[row_key] = self.row_digest(row)
+
+        stored = dict(
+            ImportFingerprint.objects.filter(table=table, key__in=rows.keys()).values_list('key', 'digest')
+        )
+        changed = [row for row_key, row in rows.items() if stored.get(row_key) != digests[row_key]]
+        return changed, digests
+
+    def save_fingerprints(self, table, digests):
+        if not digests:
+            return
+        ImportFingerprint.objects.bulk_create(
+            [ImportFingerprint(table=table, key=row_key, digest=digest) for row_key, digest in digests.items()],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['table', 'key'],
+            update_fields=['digest', 'imported_at'],
+        )
+
+    def delete_missing_rows(self, table, seen_keys, model):
+        """
+        Delete rows recorded by a previous incremental run that are no longer
+        in the CSV file. User accounts (``model`` is None) are never deleted.
+        """
+        missing = [
+            row_key
+            for row_key in ImportFingerprint.objects.filter(table=table).values_list('key', flat=True).iterator()
+            if row_key not in seen_keys
+        ]
+        for batch in self.batched(missing):
+            if model is not None:
+                model.objects.filter(pk__in=batch).delete()
+            ImportFingerprint.objects.filter(table=table, key__in=batch).delete()
+        return len(missing)
+
+    def has_changes(self, *filenames):
+        """Whether this incremental run changed or deleted rows of any of ``filenames``"""
+        for filename in filenames:
+            changed, _, _, deleted = self.change_counts.get(filename, (0, 0, 0, 0))
+            if changed or deleted:
+                return True
+        return False
+
+    def peak_memory_mb(self):
+        """Peak resident set size of this process in MB, or None if unavailable."""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+    # ------------------------------------------------------------------
+    # PostgreSQL COPY fast path
+    # ------------------------------------------------------------------
+
+    def copy_columns(self, filename):
+        """
+        Return the header of ``filename`` if it can be loaded with the COPY
+        fast path, or None to use the ORM batch pipeline instead.
+
+        The fast path needs PostgreSQL and plain column names, and is not used
+        in incremental mode, which has to fingerprint every row.
+        """
+        if connection.vendor != 'postgresql' or self.incremental:
+            return None
+        filepath = os.path.join(self.data_dir, filename)
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            columns = next(csv.reader(f), [])
+        if not columns or not all(re.fullmatch(r'\w+', column) for column in columns):
+            return None
+        return columns
+
+    def copy_upsert(self, filename, columns, model, natural_key, joins, values):
+        """
+        Stage ``filename`` in a temporary table with COPY, then resolve foreign
+        keys and upsert into ``model`` with a single set-based statement.
+        Returns the number of CSV rows read.
+
+        ``joins`` maps each foreign key field to ``(csv column, field on the
+        related model)`` and rows whose foreign keys do not resolve are
+        skipped. ``values`` maps the remaining column names to SQL expressions
+        over the staged ``stage`` row. Duplicate rows are merged the same way
+        as ``bulk_upsert``: the latest row for a ``natural_key`` wins and keeps
+        the primary key of the existing record, or of the first row seen.
+        """
+        qn = connection.ops.quote_name
+        opts = model._meta
+        table = qn(opts.db_table)
+        stage = qn(f'import_stage_{opts.db_table}')
+        pk_column = opts.pk.column
+
+        selects = [f'{expression} AS {qn(column)}' for column, expression in values.items()]
+        from_clause = [f'{stage} AS stage']
+        for name, (csv_column, related_field) in joins.items():
+            field = opts.get_field(name)
+            related = field.related_model._meta
+            alias = qn(name)
+            from_clause.append(
+                f'JOIN {qn(related.db_table)} AS {alias} '
+                f'ON {alias}.{qn(related.get_field(related_field).column)} = stage.{qn(csv_column)}'
+            )
+            selects.append(f'{alias}.{qn(field.target_field.column)} AS {qn(field.column)}')
+
+        key_columns = ', '.join(qn(opts.get_field(name).column) for name in natural_key)
+        existing_match = ' AND '.join(
+            f'existing.{qn(opts.get_field(name).column)} = ranked.{qn(opts.get_field(name).column)}'
+            for name in natural_key
+        )
+        insert_columns = [qn(field.column) for field in opts.concrete_fields]
+        latest_columns = [
+            'latest.target_pk' if field.primary_key else f'latest.{qn(field.column)}'
+            for field in opts.concrete_fields
+        ]
+        updates = [
+            f'{qn(field.column)} = EXCLUDED.{qn(field.column)}'
+            for field in opts.concrete_fields if not field.primary_key
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {stage}')
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {stage} '
+                f'(line bigserial, {", ".join(f"{qn(column)} text" for column in columns)})'
+            )
+            filepath = os.path.join(self.data_dir, filename)
+            with open(filepath, 'r', encoding='utf-8', newline='') as f:
+                cursor.copy_expert(
+                    f'COPY {stage} ({", ".join(qn(column) for column in columns)}) '
+                    f'FROM STDIN WITH (FORMAT csv, HEADER true)',
+                    f,
+                )
+            cursor.execute(f'ANALYZE {stage}')
+            cursor.execute(f'SELECT count(*) FROM {stage}')
+            rows_read = cursor.fetchone()[0]
+
+            cursor.execute(f"""
+                WITH resolved AS (
+                    SELECT stage.line, {', '.join(selects)}
+                    FROM {' '.join(from_clause)}
+                ), ranked AS (
+                    SELECT resolved.*,
+                           first_value({qn(pk_column)}) OVER (PARTITION BY {key_columns} ORDER BY line) AS first_pk,
+                           row_number() OVER (PARTITION BY {key_columns} ORDER BY line DESC) AS recency
+                    FROM resolved
+                    WHERE {qn(pk_column)} <> ''
+                ), latest AS (
+                    SELECT DISTINCT ON (target_pk)
+                           COALESCE(existing.{qn(pk_column)}, ranked.first_pk) AS target_pk, ranked.*
+                    FROM ranked
+                    LEFT JOIN {table} AS existing ON {existing_match}
+                    WHERE ranked.recency = 1
+                    ORDER BY target_pk, ranked.line DESC
+                )
+                INSERT INTO {table} ({', '.join(insert_columns)})
+                SELECT {', '.join(latest_columns)} FROM latest
+                ON CONFLICT ({qn(pk_column)}) DO UPDATE SET {', '.join(updates)}
+            """)
+            cursor.execute(f'DROP TABLE {stage}')
+        return rows_read
+
+    def sql_literal(self, value):
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def sql_value(self, columns, *names, default=''):
+        """SQL counterpart of ``get_value`` over the staged CSV columns."""
+        options = [
+            f"NULLIF(NULLIF(stage.{connection.ops.quote_name(name)}, ''), 'NULL')"
+            for name in names if name in columns
+        ]
+        return f'COALESCE({", ".join(options + [self.sql_literal(default)])})'
+
+    def sql_text(self, columns, name, default=''):
+        """SQL counterpart of ``row.get(name, default)``; COPY reads empty fields as NULL."""
+        if name not in columns:
+            return self.sql_literal(default)
+        return f"COALESCE(stage.{connection.ops.quote_name(name)}, '')"
+
+    def sql_timestamp(self, expression):
+        """Parse the formats accepted by ``parse_datetime``, anything else becomes NULL."""
+        return (
+            f"CASE WHEN {expression} ~ '^\\d{{4}}([-/])\\d{{1,2}}\\1\\d{{1,2}}( \\d{{1,2}}:\\d{{2}}:\\d{{2}})?$' "
+            f"THEN CAST({expression} AS timestamp) END"
+        )
+
+    def sql_date(self, columns, *names):
+        return f'CAST({self.sql_timestamp(self.sql_value(columns, *names))} AS date)'
+
+    def sql_datetime(self, columns, *names):
+        # Naive values are interpreted in the current time zone, like parse_datetime
+        zone = self.sql_literal(timezone.get_current_timezone_name())
+        return f'({self.sql_timestamp(self.sql_value(columns, *names))} AT TIME ZONE {zone})'
+
+    def sql_decimal(self, columns, *names):
+        expression = self.sql_value(columns, *names)
+        return f"CASE WHEN {expression} ~ '^\\s*[-+]?(\\d+\\.?\\d*|\\.\\d+)\\s*$' THEN CAST({expression} AS numeric) END"
+
+    # ------------------------------------------------------------------
+    # Table importers
+    # ------------------------------------------------------------------
+
     def import_departments(self):
         self.stdout.write('Importing departments...')
-        rows = self.read_csv('departments.csv')
-        for row in rows:
-            name = self.get_value(row, 'name', 'department_name')
-            head = self.get_value(row, 'head', 'dean')
-            budget = self.parse_decimal(self.get_value(row, 'budget', 'annual_budget', default='0'))
-            phone = self.get_value(row, 'phone', 'contact_number')
-            email = self.get_value(row, 'email', 'department_email')
-            building = self.get_value(row, 'building', 'building_name', 'location')
-            description = self.get_value(row, 'description', 'details', 'department_description')
-
-            Department.objects.get_or_create(
-                department_id=row['department_id'],
-                defaults={
-                    'name': name,
-                    'head': head,
-                    'budget': budget,
-                    'phone': phone,
-                    'email': email,
-                    'building': building,
-                    'description': description,
-                }
-            )
-        self.imported_counts['Departments'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'departments.csv',
+            self.build_department,
+            partial(self.bulk_insert, Department),
+            key='department_id',
+            model=Department,
+        )
+        self.reset_lookup('departments_by_name')
+        return rows_read
+
+    def build_department(self, row):
+        return Department(
+            department_id=row['department_id'],
+            name=self.get_value(row, 'name', 'department_name'),
+            head=self.get_value(row, 'head', 'dean'),
+            budget=self.parse_decimal(self.get_value(row, 'budget', 'annual_budget', default='0')),
+            phone=self.get_value(row, 'phone', 'contact_number'),
+            email=self.get_value(row, 'email', 'department_email'),
+            building=self.get_value(row, 'building', 'building_name', 'location'),
+            description=self.get_value(row, 'description', 'details', 'department_description'),
+        )
 
     def import_buildings(self):
         self.stdout.write('Importing buildings...')
-        rows = self.read_csv('buildings.csv')
-        for row in rows:
-            name = self.get_value(row, 'name', 'building_name')
-            address = self.get_value(row, 'address', 'building_address', 'location')
-            capacity = self.parse_int(self.get_value(row, 'capacity', default=None), default=None)
-            floors = self.parse_int(self.get_value(row, 'floors', default=1), default=1)
-            year_built = self.parse_int(self.get_value(row, 'year_built', 'built_year'), default=None)
-            facilities = self.get_value(row, 'facilities', 'accessibility')
-            description = self.get_value(row, 'description', 'status', 'notes')
-
-            Building.objects.get_or_create(
-                building_id=row['building_id'],
-                defaults={
-                    'name': name,
-                    'address': address,
-                    'capacity': capacity if capacity is not None else 0,
-                    'floors': floors if floors is not None else 1,
-                    'year_built': year_built,
-                    'facilities': facilities,
-                    'description': description,
-                }
-            )
-        self.imported_counts['Buildings'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'buildings.csv',
+            self.build_building,
+            partial(self.bulk_insert, Building),
+            key='building_id',
+            model=Building,
+        )
+        self.reset_lookup('buildings')
+        self.reset_lookup('buildings_by_name')
+        return rows_read
+
+    def build_building(self, row):
+        capacity = self.parse_int(self.get_value(row, 'capacity', default=None), default=None)
+        floors = self.parse_int(self.get_value(row, 'floors', default=1), default=1)
+        return Building(
+            building_id=row['building_id'],
+            name=self.get_value(row, 'name', 'building_name'),
+            address=self.get_value(row, 'address', 'building_address', 'location'),
+            capacity=capacity if capacity is not None else 0,
+            floors=floors if floors is not None else 1,
+            year_built=self.parse_int(self.get_value(row, 'year_built', 'built_year'), default=None),
+            facilities=self.get_value(row, 'facilities', 'accessibility'),
+            description=self.get_value(row, 'description', 'status', 'notes'),
+        )
 
     def import_rooms(self):
         self.stdout.write('Importing rooms...')
-        rows = self.read_csv('rooms.csv')
-        for row in rows:
-            building = Building.objects.filter(building_id=row['building_id']).first()
-            if building:
-                room_type = self.get_value(row, 'room_type', 'type')
-                equipment = self.get_value(row, 'equipment', 'resources')
-                description = self.get_value(row, 'description', 'status')
-                capacity = self.parse_int(self.get_value(row, 'capacity', default=30), default=30)
-
-                Room.objects.get_or_create(
-                    room_id=row['room_id'],
-                    defaults={
-                        'building': building,
-                        'room_number': row['room_number'],
-                        'room_type': room_type or 'Classroom',
-                        'capacity': capacity,
-                        'equipment': equipment,
-                        'description': description,
-                    }
-                )
-        self.imported_counts['Rooms'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'rooms.csv',
+            self.build_room,
+            partial(self.bulk_insert, Room),
+            key='room_id',
+            model=Room,
+        )
+        self.reset_lookup('rooms')
+        self.reset_lookup('rooms_by_number')
+        return rows_read
+
+    def build_room(self, row):
+        building = self.lookup('buildings').get(row['building_id'])
+        if not building:
+            return None
+        room_type = self.get_value(row, 'room_type', 'type')
+        return Room(
+            room_id=row['room_id'],
+            building=building,
+            room_number=row['room_number'],
+            room_type=room_type or 'Classroom',
+            capacity=self.parse_int(self.get_value(row, 'capacity', default=30), default=30),
+            equipment=self.get_value(row, 'equipment', 'resources'),
+            description=self.get_value(row, 'description', 'status'),
+        )
+
+    def build_user(self, row, role, **extra):
+        email = row['email']
+        return User(
+            email=email,
+            username=email.split('@')[0],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            phone=row.get('phone', ''),
+            role=role,
+            password=self.default_password_hash,  # Default password
+            **extra,
+        )
 
     def import_students(self):
         self.stdout.write('Importing students...')
-        rows = self.read_csv('students.csv')
-        count = 0
-        for row in rows:
-            dob = self.parse_date(self.get_value(row, 'date_of_birth'))
-            enrollment_date = self.parse_date(self.get_value(row, 'enrollment_date'))
-            address = self.get_value(row, 'address', 'street_address')
-            city = self.get_value(row, 'city', 'town')
-            state = self.get_value(row, 'state', 'province')
-            zip_code = self.get_value(row, 'zip_code', 'postal_code')
-            gpa = self.parse_decimal(self.get_value(row, 'gpa', default='0.00'), default=Decimal('0.00'))
-
-            user, created = User.objects.get_or_create(
-                email=row['email'],
-                defaults={
-                    'username': row['email'].split('@')[0],
-                    'first_name': row['first_name'],
-                    'last_name': row['last_name'],
-                    'phone': row.get('phone', ''),
-                    'role': 'student',
-                    'date_of_birth': dob,
-                    'address': address,
-                    'city': city,
-                    'state': state,
-                    'zip_code': zip_code,
-                    'password': self.default_password_hash,  # Default password
-                }
-            )
-
-            if created:
-                StudentProfile.objects.create(
-                    user=user,
-                    student_id=row['student_id'],
-                    enrollment_date=enrollment_date or datetime.today().date(),
-                    major=row['major'],
-                    year_level=row['year_level'],
-                    gpa=gpa,
-                    status=row.get('status', 'Active'),
-                    emergency_contact=row.get('emergency_contact', ''),
-                    emergency_phone=row.get('emergency_phone', ''),
-                )
-                count += 1
-        self.imported_counts['Students'] = count
+        _, created = self.run_pipeline(
+            'students.csv',
+            self.build_student,
+            partial(self.create_users, StudentProfile, 'student_id', user_fields=self.STUDENT_USER_FIELDS),
+            key='student_id',
+        )
+        self.reset_lookup('students')
+        return created
+
+    def build_student(self, row):
+        user = self.build_user(
+            row, 'student',
+            date_of_birth=self.parse_date(self.get_value(row, 'date_of_birth')),
+            address=self.get_value(row, 'address', 'street_address'),
+            city=self.get_value(row, 'city', 'town'),
+            state=self.get_value(row, 'state', 'province'),
+            zip_code=self.get_value(row, 'zip_code', 'postal_code'),
+        )
+        enrollment_date = self.parse_date(self.get_value(row, 'enrollment_date'))
+        return user, {
+            'student_id': row['student_id'],
+            'enrollment_date': enrollment_date or datetime.today().date(),
+            'major': row['major'],
+            'year_level': row['year_level'],
+            'imported_gpa': self.parse_decimal(self.get_value(row, 'gpa'), default=None),
+            'status': row.get('status', 'Active'),
+            'emergency_contact': row.get('emergency_contact', ''),
+            'emergency_phone': row.get('emergency_phone', ''),
+        }
 
     def import_faculty(self):
         self.stdout.write('Importing faculty...')
-        rows = self.read_csv('faculty_professors.csv')
-        count = 0
-        for row in rows:
-            hire_date = self.parse_date(self.get_value(row, 'hire_date'))
-            salary = self.parse_decimal(self.get_value(row, 'salary', default='0.00'))
-            office_building = self.get_value(row, 'office_building', 'building', 'office_location')
-            office_number = self.get_value(row, 'office_number', 'office', 'office_room')
-            specialization = self.get_value(row, 'specialization', 'focus_area')
-            status = self.get_value(row, 'status', 'employment_status', default='Active')
-            education = self.get_value(row, 'education', 'degree', default='PhD')
-            years_experience = self.parse_int(self.get_value(row, 'years_experience', 'experience_years', default=0), default=0)
-            publications = self.parse_int(self.get_value(row, 'publications', default=0), default=0)
-            is_professor = self.parse_bool(self.get_value(row, 'is_professor', 'tenured', default=False))
-
-            user, created = User.objects.get_or_create(
-                email=row['email'],
-                defaults={
-                    'username': row['email'].split('@')[0],
-                    'first_name': row['first_name'],
-                    'last_name': row['last_name'],
-                    'phone': row.get('phone', ''),
-                    'role': 'faculty',
-                    'password': self.default_password_hash,
-                }
-            )
-
-            if created:
-                FacultyProfile.objects.create(
-                    user=user,
-                    faculty_id=row['faculty_id'],
-                    department=row['department'],
-                    rank=row['rank'],
-                    hire_date=hire_date or datetime.today().date(),
-                    salary=salary,
-                    office_building=office_building,
-                    office_number=office_number,
-                    specialization=specialization,
-                    status=status,
-                    education=education,
-                    years_experience=years_experience,
-                    research_areas=row.get('research_areas', ''),
-                    publications=publications,
-                    is_professor=is_professor,
-                )
-                count += 1
-        self.imported_counts['Faculty'] = count
+        _, created = self.run_pipeline(
+            'faculty_professors.csv',
+            self.build_faculty,
+            partial(self.create_users, FacultyProfile, 'faculty_id'),
+            key='faculty_id',
+        )
+        self.reset_lookup('faculty')
+        return created
+
+    def build_faculty(self, row):
+        hire_date = self.parse_date(self.get_value(row, 'hire_date'))
+        return self.build_user(row, 'faculty'), {
+            'faculty_id': row['faculty_id'],
+            'department': row['department'],
+            'rank': row['rank'],
+            'hire_date': hire_date or datetime.today().date(),
+            'salary': self.parse_decimal(self.get_value(row, 'salary', default='0.00')),
+            'office_building': self.get_value(row, 'office_building', 'building', 'office_location'),
+            'office_number': self.get_value(row, 'office_number', 'office', 'office_room'),
+            'specialization': self.get_value(row, 'specialization', 'focus_area'),
+            'status': self.get_value(row, 'status', 'employment_status', default='Active'),
+            'education': self.get_value(row, 'education', 'degree', default='PhD'),
+            'years_experience': self.parse_int(
+                self.get_value(row, 'years_experience', 'experience_years', default=0), default=0
+            ),
+            'research_areas': row.get('research_areas', ''),
+            'publications': self.parse_int(self.get_value(row, 'publications', default=0), default=0),
+            'is_professor': self.parse_bool(self.get_value(row, 'is_professor', 'tenured', default=False)),
+        }
 
     def import_staff(self):
         self.stdout.write('Importing staff...')
-        rows = self.read_csv('staff.csv')
-        count = 0
-        for row in rows:
-            hire_date = self.parse_date(self.get_value(row, 'hire_date'))
-            salary = self.parse_decimal(self.get_value(row, 'salary', default='0.00'))
-            office_building = self.get_value(row, 'office_building', 'building')
-            office_number = self.get_value(row, 'office_number', 'office', 'office_room')
-            status = self.get_value(row, 'status', 'employment_status', default='Active')
-
-            user, created = User.objects.get_or_create(
-                email=row['email'],
-                defaults={
-                    'username': row['email'].split('@')[0],
-                    'first_name': row['first_name'],
-                    'last_name': row['last_name'],
-                    'phone': row.get('phone', ''),
-                    'role': 'staff',
-                    'password': self.default_password_hash,
-                }
-            )
-
-            if created:
-                StaffProfile.objects.create(
-                    user=user,
-                    staff_id=row['staff_id'],
-                    department=row['department'],
-                    position=row['position'],
-                    hire_date=hire_date or datetime.today().date(),
-                    salary=salary,
-                    office_building=office_building,
-                    office_number=office_number,
-                    status=status,
-                )
-                count += 1
-        self.imported_counts['Staff'] = count
+        _, created = self.run_pipeline(
+            'staff.csv',
+            self.build_staff,
+            partial(self.create_users, StaffProfile, 'staff_id'),
+            key='staff_id',
+        )
+        return created
+
+    def build_staff(self, row):
+        hire_date = self.parse_date(self.get_value(row, 'hire_date'))
+        return self.build_user(row, 'staff'), {
+            'staff_id': row['staff_id'],
+            'department': row['department'],
+            'position': row['position'],
+            'hire_date': hire_date or datetime.today().date(),
+            'salary': self.parse_decimal(self.get_value(row, 'salary', default='0.00')),
+            'office_building': self.get_value(row, 'office_building', 'building'),
+            'office_number': self.get_value(row, 'office_number', 'office', 'office_room'),
+            'status': self.get_value(row, 'status', 'employment_status', default='Active'),
+        }
 
     def import_courses(self):
         self.stdout.write('Importing courses...')
-        rows = self.read_csv('courses.csv')
-        for row in rows:
-            department_name = self.get_value(row, 'department', 'department_name')
-            dept = Department.objects.filter(name__iexact=department_name).first()
-            credits = self.parse_int(self.get_value(row, 'credits', default=3), default=3)
-            level = self.get_value(row, 'level', 'course_level', default='Undergraduate')
-            status = self.get_value(row, 'status', 'course_status', default='Active')
-            Course.objects.get_or_create(
-                course_id=row['course_id'],
-                defaults={
-                    'course_name': row['course_name'],
-                    'department': dept,
-                    'credits': credits,
-                    'description': row.get('description', ''),
-                    'prerequisites': row.get('prerequisites', ''),
-                    'level': level,
-                    'status': status,
-                }
-            )
-        self.imported_counts['Courses'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'courses.csv',
+            self.build_course,
+            partial(self.bulk_insert, Course),
+            key='course_id',
+            model=Course,
+        )
+        self.reset_lookup('courses')
+        return rows_read
+
+    def build_course(self, row):
+        department_name = self.get_value(row, 'department', 'department_name')
+        return Course(
+            course_id=row['course_id'],
+            course_name=row['course_name'],
+            department=self.lookup('departments_by_name').get(department_name.lower()),
+            credits=self.parse_int(self.get_value(row, 'credits', default=3), default=3),
+            description=row.get('description', ''),
+            prerequisites=row.get('prerequisites', ''),
+            level=self.get_value(row, 'level', 'course_level', default='Undergraduate'),
+            status=self.get_value(row, 'status', 'course_status', default='Active'),
+        )
+
+    def resolve_room(self, room_identifier):
+        """Match a CSV room reference by room id, then by "<building name> <room number>"."""
+        if not room_identifier:
+            return None
+        room = self.lookup('rooms').get(room_identifier)
+        if not room:
+            building_name, _, room_number = room_identifier.rpartition(' ')
+            if building_name and room_number:
+                building = self.lookup('buildings_by_name').get(building_name.lower())
+                if building:
+                    room = self.lookup('rooms_by_number').get((building.building_id, room_number))
+        return room
 
     def import_sections(self):
         self.stdout.write('Importing sections...')
-        rows = self.read_csv('sections.csv')
-        for row in rows:
-            course = Course.objects.filter(course_id=row['course_id']).first()
-            faculty = FacultyProfile.objects.filter(faculty_id=row['instructor_id']).first()
-            room_identifier = self.get_value(row, 'room', 'room_id')
-            room = Room.objects.filter(room_id=room_identifier).first() if room_identifier else None
-            if not room and room_identifier:
-                building_name, _, room_number = room_identifier.rpartition(' ')
-                if building_name and room_number:
-                    building = Building.objects.filter(name__iexact=building_name).first()
-                    if building:
-                        room = Room.objects.filter(building=building, room_number=room_number).first()
-
-            if course:
-                Section.objects.get_or_create(
-                    section_id=row['section_id'],
-                    defaults={
-                        'course': course,
-                        'section_number': row['section_number'],
-                        'semester': self.get_value(row, 'semester', 'term'),
-                        'year': self.parse_int(self.get_value(row, 'year', default=datetime.today().year), default=datetime.today().year),
-                        'instructor': faculty,
-                        'instructor_name': row['instructor_name'],
-                        'instructor_rank': row.get('instructor_rank', ''),
-                        'meeting_days': row['meeting_days'],
-                        'meeting_time': row['meeting_time'],
-                        'room': room,
-                        'capacity': self.parse_int(self.get_value(row, 'capacity', default=30), default=30),
-                        'enrolled': self.parse_int(self.get_value(row, 'enrolled', default=0), default=0),
-                        'status': self.get_value(row, 'status', 'section_status', default='Open'),
-                    }
-                )
-        self.imported_counts['Sections'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'sections.csv',
+            self.build_section,
+            partial(self.bulk_insert, Section),
+            key='section_id',
+            model=Section,
+        )
+        self.reset_lookup('sections')
+        return rows_read
+
+    def build_section(self, row):
+        course = self.lookup('courses').get(row['course_id'])
+        if not course:
+            return None
+        current_year = datetime.today().year
+        section = Section(
+            section_id=row['section_id'],
+            course=course,
+            section_number=row['section_number'],
+            semester=self.get_value(row, 'semester', 'term'),
+            year=self.parse_int(self.get_value(row, 'year', default=current_year), default=current_year),
+            instructor=self.lookup('faculty').get(row['instructor_id']),
+            instructor_name=row['instructor_name'],
+            instructor_rank=row.get('instructor_rank', ''),
+            meeting_days=row['meeting_days'],
+            meeting_time=row['meeting_time'],
+            room=self.resolve_room(self.get_value(row, 'room', 'room_id')),
+            capacity=self.parse_int(self.get_value(row, 'capacity', default=30), default=30),
+            enrolled=self.parse_int(self.get_value(row, 'enrolled', default=0), default=0),
+            status=self.get_value(row, 'status', 'section_status', default='Open'),
+        )
+        section.apply_schedule()
+        return section
 
     def import_enrollments(self):
         self.stdout.write('Importing enrollments...')
-        rows = self.read_csv('enrollments.csv')
-        for row in rows:
-            student = StudentProfile.objects.filter(student_id=row['student_id']).first()
-            section = Section.objects.filter(section_id=row['section_id']).first()
-            course = Course.objects.filter(course_id=row['course_id']).first()
-
-            if student and section and course:
-                enrollment_date = self.parse_date(self.get_value(row, 'enrollment_date'))
-                grade_points = self.parse_decimal(self.get_value(row, 'grade_points'), default=Decimal('0.00'))
-                credits_attempted = self.parse_int(self.get_value(row, 'credits_attempted', default=0), default=0)
-                credits_earned = self.parse_int(self.get_value(row, 'credits_earned', default=0), default=0)
-                defaults = {
-                    'student': student,
-                    'student_name': row.get('student_name', student.user.get_full_name() if student.user_id else ''),
-                    'section': section,
-                    'course': course,
-                    'semester': self.get_value(row, 'semester', 'term'),
-                    'enrollment_date': enrollment_date or datetime.today().date(),
-                    'status': row.get('status', 'Enrolled'),
-                    'grade': row.get('grade', ''),
-                    'grade_points': grade_points,
-                    'credits_attempted': credits_attempted,
-                    'credits_earned': credits_earned,
-                }
-
-                # Prevent UNIQUE constraint violations when CSV rows contain duplicate
-                # student/section pairs by updating the existing record instead of
-                # attempting a fresh insert.
-                enrollment = Enrollment.objects.filter(enrollment_id=row['enrollment_id']).first()
-                if not enrollment:
-                    enrollment = Enrollment.objects.filter(student=student, section=section).first()
-
-                if enrollment:
-                    for field, value in defaults.items():
-                        setattr(enrollment, field, value)
-                    enrollment.save(update_fields=list(defaults.keys()))
-                else:
-                    Enrollment.objects.create(
-                        enrollment_id=row['enrollment_id'],
-                        **defaults,
-                    )
-        self.imported_counts['Enrollments'] = len(rows)
+        # Duplicate student/section pairs update the existing record
+        # instead of violating the unique constraint.
+        rows_read, _ = self.run_pipeline(
+            'enrollments.csv',
+            self.build_enrollment,
+            partial(self.bulk_upsert, Enrollment, natural_key=('student', 'section'), prepare=Enrollment.apply_grade),
+            key='enrollment_id',
+            model=Enrollment,
+        )
+
+        # Bulk writes bypass the signals that keep GPAs current. Course credits
+        # weight every grade, so a changed course also needs a recompute.
+        if not self.incremental or self.has_changes('courses.csv', 'enrollments.csv'):
+            TermGPA.refresh()
+        # Registration takes seats against Section.enrolled, so it must match the rows
+        if not self.incremental or self.has_changes('sections.csv', 'enrollments.csv'):
+            Section.recount_enrolled()
+        return rows_read
+
+    def build_enrollment(self, row):
+        student = self.lookup('students').get(row['student_id'])
+        section = self.lookup('sections').get(row['section_id'])
+        course = self.lookup('courses').get(row['course_id'])
+        if not (student and section and course):
+            return None
+
+        enrollment_date = self.parse_date(self.get_value(row, 'enrollment_date'))
+        return row['enrollment_id'], {
+            'student': student,
+            'student_name': row.get('student_name', student.user.get_full_name() if student.user_id else ''),
+            'section': section,
+            'course': course,
+            'semester': self.get_value(row, 'semester', 'term'),
+            'enrollment_date': enrollment_date or datetime.today().date(),
+            'status': row.get('status', 'Enrolled'),
+            'grade': row.get('grade', ''),
+            'grade_points': self.parse_decimal(self.get_value(row, 'grade_points'), default=Decimal('0.00')),
+            'credits_attempted': self.parse_int(self.get_value(row, 'credits_attempted', default=0), default=0),
+            'credits_earned': self.parse_int(self.get_value(row, 'credits_earned', default=0), default=0),
+        }
 
     def import_assignments(self):
         self.stdout.write('Importing assignments...')
-        rows = self.read_csv('assignments.csv')
-        for row in rows:
-            section = Section.objects.filter(section_id=row['section_id']).first()
-            course = Course.objects.filter(course_id=row['course_id']).first()
-
-            if section and course:
-                due_date = self.parse_date(self.get_value(row, 'due_date'))
-                Assignment.objects.get_or_create(
-                    assignment_id=row['assignment_id'],
-                    defaults={
-                        'section': section,
-                        'course': course,
-                        'title': row['title'],
-                        'type': row['type'],
-                        'description': row.get('description', ''),
-                        'total_points': self.parse_int(self.get_value(row, 'total_points', default=100), default=100),
-                        'due_date': due_date or datetime.today().date(),
-                        'status': row.get('status', 'Active'),
-                    }
-                )
-        self.imported_counts['Assignments'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'assignments.csv',
+            self.build_assignment,
+            partial(self.bulk_insert, Assignment),
+            key='assignment_id',
+            model=Assignment,
+        )
+        self.reset_lookup('assignments')
+        return rows_read
+
+    def build_assignment(self, row):
+        section = self.lookup('sections').get(row['section_id'])
+        course = self.lookup('courses').get(row['course_id'])
+        if not (section and course):
+            return None
+
+        due_date = self.parse_date(self.get_value(row, 'due_date'))
+        return Assignment(
+            assignment_id=row['assignment_id'],
+            section=section,
+            course=course,
+            title=row['title'],
+            type=row['type'],
+            description=row.get('description', ''),
+            total_points=self.parse_int(self.get_value(row, 'total_points', default=100), default=100),
+            due_date=due_date or datetime.today().date(),
+            status=row.get('status', 'Active'),
+        )
 
     def import_submissions(self):
         self.stdout.write('Importing submissions...')
-        rows = self.read_csv('submissions.csv')
-        for row in rows:
-            assignment = Assignment.objects.filter(assignment_id=row['assignment_id']).first()
-            student = StudentProfile.objects.filter(student_id=row['student_id']).first()
-
-            if assignment and student:
-                submission_dt = self.parse_datetime(self.get_value(row, 'submission_date'))
-                graded_dt = self.parse_datetime(self.get_value(row, 'graded_date'))
-                points_earned = self.parse_decimal(self.get_value(row, 'points_earned'), default=None)
-                defaults = {
-                    'assignment': assignment,
-                    'student': student,
-                    'student_name': row.get('student_name', student.user.get_full_name() if student.user_id else ''),
-                    'submission_date': submission_dt,
-                    'content': row.get('content', ''),
-                    'points_earned': points_earned,
-                    'feedback': row.get('feedback', ''),
-                    'graded_date': graded_dt,
-                    'status': row.get('status', 'Submitted'),
-                }
-
-                # Update existing submissions (matched by ID or assignment/student) to
-                # avoid unique constraint violations when CSV rows contain duplicates.
-                submission = Submission.objects.filter(submission_id=row['submission_id']).first()
-                if not submission:
-                    submission = Submission.objects.filter(assignment=assignment, student=student).first()
-
-                if submission:
-                    for field, value in defaults.items():
-                        setattr(submission, field, value)
-                    submission.save(update_fields=list(defaults.keys()))
-                else:
-                    Submission.objects.create(
-                        submission_id=row['submission_id'],
-                        **defaults,
-                    )
-        self.imported_counts['Submissions'] = len(rows)
+        columns = self.copy_columns('submissions.csv')
+        if columns:
+            return self.copy_upsert(
+                'submissions.csv',
+                columns,
+                Submission,
+                natural_key=('assignment', 'student'),
+                joins={
+                    'assignment': ('assignment_id', 'assignment_id'),
+                    'student': ('student_id', 'student_id'),
+                },
+                values={
+                    'submission_id': self.sql_text(columns, 'submission_id'),
+                    'student_name': self.sql_text(columns, 'student_name'),
+                    'submission_date': self.sql_datetime(columns, 'submission_date'),
+                    'content': self.sql_text(columns, 'content'),
+                    'points_earned': self.sql_decimal(columns, 'points_earned'),
+                    'feedback': self.sql_text(columns, 'feedback'),
+                    'graded_date': self.sql_datetime(columns, 'graded_date'),
+                    'status': self.sql_text(columns, 'status', 'Submitted'),
+                },
+            )
+
+        # Update existing submissions (matched by ID or assignment/student) to
+        # avoid unique constraint violations when CSV rows contain duplicates.
+        rows_read, _ = self.run_pipeline(
+            'submissions.csv',
+            self.build_submission,
+            partial(self.bulk_upsert, Submission, natural_key=('assignment', 'student')),
+            key='submission_id',
+            model=Submission,
+        )
+        return rows_read
+
+    def build_submission(self, row):
+        assignment = self.lookup('assignments').get(row['assignment_id'])
+        student = self.lookup('students').get(row['student_id'])
+        if not (assignment and student):
+            return None
+
+        return row['submission_id'], {
+            'assignment': assignment,
+            'student': student,
+            'student_name': row.get('student_name', student.user.get_full_name() if student.user_id else ''),
+            'submission_date': self.parse_datetime(self.get_value(row, 'submission_date')),
+            'content': row.get('content', ''),
+            'points_earned': self.parse_decimal(self.get_value(row, 'points_earned'), default=None),
+            'feedback': row.get('feedback', ''),
+            'graded_date': self.parse_datetime(self.get_value(row, 'graded_date')),
+            'status': row.get('status', 'Submitted'),
+        }
 
     def import_attendance(self):
         self.stdout.write('Importing attendance records...')
-        rows = self.read_csv('attendance.csv')
-        for row in rows:
-            student = StudentProfile.objects.filter(student_id=row['student_id']).first()
-            section = Section.objects.filter(section_id=row['section_id']).first()
-
-            if student and section:
-                record_id = self.get_value(row, 'record_id', 'attendance_id')
-                attendance_date = self.parse_date(self.get_value(row, 'date'))
-                notes = self.get_value(row, 'notes', 'comments')
-                defaults = {
-                    'student': student,
-                    'student_name': row.get('student_name', student.user.get_full_name() if student.user_id else ''),
-                    'section': section,
-                    'course_id': row['course_id'],
-                    'date': attendance_date or datetime.today().date(),
-                    'status': row.get('status', 'Present'),
-                    'notes': notes,
-                }
-
-                # Update existing attendance (matched by ID or unique triple) so
-                # duplicate CSV rows do not violate the unique constraint.
-                attendance = AttendanceRecord.objects.filter(record_id=record_id).first()
-                if not attendance:
-                    attendance = AttendanceRecord.objects.filter(
-                        student=student,
-                        section=section,
-                        date=defaults['date'],
-                    ).first()
-
-                if attendance:
-                    for field, value in defaults.items():
-                        setattr(attendance, field, value)
-                    attendance.save(update_fields=list(defaults.keys()))
-                else:
-                    AttendanceRecord.objects.create(
-                        record_id=record_id,
-                        **defaults,
-                    )
-        self.imported_counts['Attendance Records'] = len(rows)
+        columns = self.copy_columns('attendance.csv')
+        if columns:
+            rows_read = self.copy_upsert(
+                'attendance.csv',
+                columns,
+                AttendanceRecord,
+                natural_key=('student', 'section', 'date'),
+                joins={
+                    'student': ('student_id', 'student_id'),
+                    'section': ('section_id', 'section_id'),
+                },
+                values={
+                    'record_id': self.sql_value(columns, 'record_id', 'attendance_id'),
+                    'student_name': self.sql_text(columns, 'student_name'),
+                    'course_id': self.sql_text(columns, 'course_id'),
+                    'date': f'COALESCE({self.sql_date(columns, "date")}, CURRENT_DATE)',
+                    'status': self.sql_text(columns, 'status', 'Present'),
+                    'notes': self.sql_value(columns, 'notes', 'comments'),
+                },
+            )
+        else:
+            # Update existing attendance (matched by ID or unique triple) so
+            # duplicate CSV rows do not violate the unique constraint.
+            rows_read, _ = self.run_pipeline(
+                'attendance.csv',
+                self.build_attendance,
+                self.write_attendance,
+                key=('record_id', 'attendance_id'),
+                model=AttendanceRecord,
+            )
+
+        # Bulk writes bypass the signals that keep rollups current. Incremental
+        # runs refresh the rollups they touched in write_attendance.
+        if not self.incremental:
+            AttendanceRollup.rebuild(batch_size=self.batch_size)
+        return rows_read
+
+    def write_attendance(self, rows):
+        if not self.incremental:
+            return self.bulk_upsert(AttendanceRecord, rows, natural_key=('student', 'section', 'date'))
+
+        # Refresh the rollups a record counted towards before and after the update
+        pairs = set(
+            AttendanceRecord.objects.filter(pk__in=[pk for pk, _ in rows]).values_list('student_id', 'section_id')
+        )
+        pairs.update((values['student'].pk, values['section'].pk) for _, values in rows)
+        written = self.bulk_upsert(AttendanceRecord, rows, natural_key=('student', 'section', 'date'))
+        AttendanceRollup.refresh(pairs)
+        return written
+
+    def build_attendance(self, row):
+        student = self.lookup('students').get(row['student_id'])
+        section = self.lookup('sections').get(row['section_id'])
+        if not (student and section):
+            return None
+
+        attendance_date = self.parse_date(self.get_value(row, 'date'))
+        return self.get_value(row, 'record_id', 'attendance_id'), {
+            'student': student,
+            'student_name': row.get('student_name', student.user.get_full_name() if student.user_id else ''),
+            'section': section,
+            'course_id': row['course_id'],
+            'date': attendance_date or datetime.today().date(),
+            'status': row.get('status', 'Present'),
+            'notes': self.get_value(row, 'notes', 'comments'),
+        }
 
     def import_library_books(self):
         self.stdout.write('Importing library books...')
-        rows = self.read_csv('library_books.csv')
-        for row in rows:
-            publication_year = self.parse_int(self.get_value(row, 'publication_year'), default=None)
-            category = self.get_value(row, 'category', 'genre')
-            location = self.get_value(row, 'location', 'shelf_location')
-            copies_total = self.parse_int(self.get_value(row, 'copies_total', default=1), default=1)
-            copies_available = self.parse_int(self.get_value(row, 'copies_available', default=1), default=1)
-            status = self.get_value(row, 'status', 'availability', default='Available')
-            Book.objects.get_or_create(
-                book_id=row['book_id'],
-                defaults={
-                    'isbn': row.get('isbn', ''),
-                    'title': row['title'],
-                    'author': row['author'],
-                    'publisher': row.get('publisher', ''),
-                    'publication_year': publication_year,
-                    'category': category,
-                    'location': location,
-                    'copies_total': copies_total,
-                    'copies_available': copies_available,
-                    'status': status,
-                    'description': row.get('description', '') or category,
-                }
-            )
-        self.imported_counts['Library Books'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'library_books.csv',
+            self.build_book,
+            partial(self.bulk_insert, Book),
+            key='book_id',
+            model=Book,
+        )
+        self.reset_lookup('books')
+        return rows_read
+
+    def build_book(self, row):
+        category = self.get_value(row, 'category', 'genre')
+        return Book(
+            book_id=row['book_id'],
+            isbn=row.get('isbn', ''),
+            title=row['title'],
+            author=row['author'],
+            publisher=row.get('publisher', ''),
+            publication_year=self.parse_int(self.get_value(row, 'publication_year'), default=None),
+            category=category,
+            location=self.get_value(row, 'location', 'shelf_location'),
+            copies_total=self.parse_int(self.get_value(row, 'copies_total', default=1), default=1),
+            copies_available=self.parse_int(self.get_value(row, 'copies_available', default=1), default=1),
+            status=self.get_value(row, 'status', 'availability', default='Available'),
+            description=row.get('description', '') or category,
+        )
 
     def import_library_checkouts(self):
         self.stdout.write('Importing library checkouts...')
-        rows = self.read_csv('library_checkouts.csv')
-        for row in rows:
-            book = Book.objects.filter(book_id=row['book_id']).first()
-            student = StudentProfile.objects.filter(student_id=row['student_id']).first()
-
-            if book and student:
-                checkout_date = self.parse_date(self.get_value(row, 'checkout_date'))
-                due_date = self.parse_date(self.get_value(row, 'due_date'))
-                return_date = self.parse_date(self.get_value(row, 'return_date'))
-                fine_amount = self.parse_decimal(self.get_value(row, 'fine_amount', default='0.00'), default=Decimal('0.00'))
-                Checkout.objects.get_or_create(
-                    checkout_id=row['checkout_id'],
-                    defaults={
-                        'book': book,
-                        'student': student,
-                        'student_name': row['student_name'],
-                        'checkout_date': checkout_date or datetime.today().date(),
-                        'due_date': due_date or datetime.today().date(),
-                        'return_date': return_date,
-                        'status': self.get_value(row, 'status', default='Active'),
-                        'fine_amount': fine_amount,
-                    }
-                )
-        self.imported_counts['Library Checkouts'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'library_checkouts.csv',
+            self.build_checkout,
+            partial(self.bulk_insert, Checkout),
+            key='checkout_id',
+            model=Checkout,
+        )
+        return rows_read
+
+    def build_checkout(self, row):
+        book = self.lookup('books').get(row['book_id'])
+        student = self.lookup('students').get(row['student_id'])
+        if not (book and student):
+            return None
+
+        checkout_date = self.parse_date(self.get_value(row, 'checkout_date'))
+        due_date = self.parse_date(self.get_value(row, 'due_date'))
+        return Checkout(
+            checkout_id=row['checkout_id'],
+            book=book,
+            student=student,
+            student_name=row['student_name'],
+            checkout_date=checkout_date or datetime.today().date(),
+            due_date=due_date or datetime.today().date(),
+            return_date=self.parse_date(self.get_value(row, 'return_date')),
+            status=self.get_value(row, 'status', default='Active'),
+            fine_amount=self.parse_decimal(self.get_value(row, 'fine_amount', default='0.00'), default=Decimal('0.00')),
+        )
 
     def import_financial_aid(self):
         self.stdout.write('Importing financial aid...')
-        rows = self.read_csv('financial_aid.csv')
-        for row in rows:
-            student = StudentProfile.objects.filter(student_id=row['student_id']).first()
-
-            if student:
-                aid_type = self.get_value(row, 'type', 'aid_type')
-                award_name = self.get_value(row, 'name', 'award_name', default=aid_type)
-                amount = self.parse_decimal(self.get_value(row, 'amount', default='0.00'))
-                academic_year = self.get_value(row, 'academic_year', 'year')
-                if academic_year and isinstance(academic_year, (int, float)):
-                    academic_year = str(int(academic_year))
-                semester = self.get_value(row, 'semester', 'term')
-                status = self.get_value(row, 'status', 'award_status', default='Pending')
-                disbursement_date = self.parse_date(self.get_value(row, 'disbursement_date', 'date_awarded'))
-                description = self.get_value(row, 'description', 'requirements', 'notes')
-                FinancialAid.objects.get_or_create(
-                    aid_id=row['aid_id'],
-                    defaults={
-                        'student': student,
-                        'student_name': row['student_name'],
-                        'type': aid_type,
-                        'name': award_name,
-                        'amount': amount,
-                        'academic_year': academic_year or '',
-                        'semester': semester,
-                        'status': status,
-                        'disbursement_date': disbursement_date,
-                        'description': description,
-                    }
-                )
-        self.imported_counts['Financial Aid'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'financial_aid.csv',
+            self.build_financial_aid,
+            partial(self.bulk_insert, FinancialAid),
+            key='aid_id',
+            model=FinancialAid,
+        )
+        return rows_read
+
+    def build_financial_aid(self, row):
+        student = self.lookup('students').get(row['student_id'])
+        if not student:
+            return None
+
+        aid_type = self.get_value(row, 'type', 'aid_type')
+        academic_year = self.get_value(row, 'academic_year', 'year')
+        if academic_year and isinstance(academic_year, (int, float)):
+            academic_year = str(int(academic_year))
+        return FinancialAid(
+            aid_id=row['aid_id'],
+            student=student,
+            student_name=row['student_name'],
+            type=aid_type,
+            name=self.get_value(row, 'name', 'award_name', default=aid_type),
+            amount=self.parse_decimal(self.get_value(row, 'amount', default='0.00')),
+            academic_year=academic_year or '',
+            semester=self.get_value(row, 'semester', 'term'),
+            status=self.get_value(row, 'status', 'award_status', default='Pending'),
+            disbursement_date=self.parse_date(self.get_value(row, 'disbursement_date', 'date_awarded')),
+            description=self.get_value(row, 'description', 'requirements', 'notes'),
+        )
 
     def import_parking(self):
         self.stdout.write('Importing parking permits...')
-        rows = self.read_csv('parking.csv')
-        for row in rows:
-            student_id = self.get_value(row, 'student_id', 'owner_id')
-            student = StudentProfile.objects.filter(student_id=student_id).first()
-
-            if student:
-                student_name = row.get('student_name') or student.user.get_full_name() if student.user_id else ''
-                permit_type = self.get_value(row, 'permit_type', 'permit_category', default='Student')
-                lot_number = self.get_value(row, 'lot_number', 'lot_assigned')
-                vehicle_make = self.get_value(row, 'vehicle_make', 'make')
-                vehicle_model = self.get_value(row, 'vehicle_model', 'model')
-                vehicle_year = self.parse_int(self.get_value(row, 'vehicle_year', default=datetime.today().year), default=datetime.today().year)
-                license_plate = self.get_value(row, 'license_plate', 'plate', '')
-                issue_date = self.parse_date(self.get_value(row, 'issue_date'))
-                expiration_date = self.parse_date(self.get_value(row, 'expiration_date', 'expiry_date'))
-                status = self.get_value(row, 'status', 'permit_status', default='Active')
-                ParkingPermit.objects.get_or_create(
-                    permit_id=row['permit_id'],
-                    defaults={
-                        'student': student,
-                        'student_name': student_name,
-                        'permit_type': permit_type,
-                        'lot_number': lot_number,
-                        'vehicle_make': vehicle_make,
-                        'vehicle_model': vehicle_model,
-                        'vehicle_year': vehicle_year,
-                        'license_plate': license_plate,
-                        'issue_date': issue_date or datetime.today().date(),
-                        'expiration_date': expiration_date or datetime.today().date(),
-                        'status': status,
-                    }
-                )
-        self.imported_counts['Parking Permits'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'parking.csv',
+            self.build_parking_permit,
+            partial(self.bulk_insert, ParkingPermit),
+            key='permit_id',
+            model=ParkingPermit,
+        )
+        return rows_read
+
+    def build_parking_permit(self, row):
+        student = self.lookup('students').get(self.get_value(row, 'student_id', 'owner_id'))
+        if not student:
+            return None
+
+        student_name = row.get('student_name') or student.user.get_full_name() if student.user_id else ''
+        current_year = datetime.today().year
+        issue_date = self.parse_date(self.get_value(row, 'issue_date'))
+        expiration_date = self.parse_date(self.get_value(row, 'expiration_date', 'expiry_date'))
+        return ParkingPermit(
+            permit_id=row['permit_id'],
+            student=student,
+            student_name=student_name,
+            permit_type=self.get_value(row, 'permit_type', 'permit_category', default='Student'),
+            lot_number=self.get_value(row, 'lot_number', 'lot_assigned'),
+            vehicle_make=self.get_value(row, 'vehicle_make', 'make'),
+            vehicle_model=self.get_value(row, 'vehicle_model', 'model'),
+            vehicle_year=self.parse_int(self.get_value(row, 'vehicle_year', default=current_year), default=current_year),
+            license_plate=self.get_value(row, 'license_plate', 'plate', ''),
+            issue_date=issue_date or datetime.today().date(),
+            expiration_date=expiration_date or datetime.today().date(),
+            status=self.get_value(row, 'status', 'permit_status', default='Active'),
+        )
 
     def import_events(self):
         self.stdout.write('Importing events...')
-        rows = self.read_csv('events.csv')
-        for row in rows:
-            name = self.get_value(row, 'name', 'title')
-            event_type = self.get_value(row, 'type', 'event_type')
-            description = self.get_value(row, 'description', 'details')
-            event_date = self.parse_date(self.get_value(row, 'date'))
-            start_time = self.parse_time(self.get_value(row, 'start_time'))
-            end_time = self.parse_time(self.get_value(row, 'end_time'))
-            location = self.get_value(row, 'location', 'venue')
-            capacity = self.parse_int(self.get_value(row, 'capacity', default=0), default=0)
-            registered = self.parse_int(self.get_value(row, 'registered', default=0), default=0)
-            status = self.get_value(row, 'status', 'event_status', default='Scheduled')
-            organizer = self.get_value(row, 'organizer', 'host', 'coordinator', default='')
-            default_time = datetime.strptime('00:00', '%H:%M').time()
-            Event.objects.get_or_create(
-                event_id=row['event_id'],
-                defaults={
-                    'name': name,
-                    'type': event_type,
-                    'description': description,
-                    'date': event_date or datetime.today().date(),
-                    'start_time': start_time or default_time,
-                    'end_time': end_time or default_time,
-                    'location': location,
-                    'organizer': organizer,
-                    'capacity': capacity,
-                    'registered': registered,
-                    'status': status,
-                }
-            )
-        self.imported_counts['Events'] = len(rows)
+        rows_read, _ = self.run_pipeline(
+            'events.csv',
+            self.build_event,
+            partial(self.bulk_insert, Event),
+            key='event_id',
+            model=Event,
+        )
+        return rows_read
+
+    def build_event(self, row):
+        default_time = datetime.strptime('00:00', '%H:%M').time()
+        event_date = self.parse_date(self.get_value(row, 'date'))
+        start_time = self.parse_time(self.get_value(row, 'start_time'))
+        end_time = self.parse_time(self.get_value(row, 'end_time'))
+        return Event(
+            event_id=row['event_id'],
+            name=self.get_value(row, 'name', 'title'),
+            type=self.get_value(row, 'type', 'event_type'),
+            description=self.get_value(row, 'description', 'details'),
+            date=event_date or datetime.today().date(),
+            start_time=start_time or default_time,
+            end_time=end_time or default_time,
+            location=self.get_value(row, 'location', 'venue'),
+            organizer=self.get_value(row, 'organizer', 'host', 'coordinator', default=''),
+            capacity=self.parse_int(self.get_value(row, 'capacity', default=0), default=0),
+            registered=self.parse_int(self.get_value(row, 'registered', default=0), default=0),
+            status=self.get_value(row, 'status', 'event_status', default='Scheduled'),
+        )
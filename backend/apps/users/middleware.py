@@ -0,0 +1,23 @@
+from django.utils.functional import SimpleLazyObject
+
+
+def get_profile(request):
+    return getattr(request.user, 'profile', None)
+
+
+class CurrentProfileMiddleware:
+    """
+    Expose the caller's role profile as ``request.profile``.
+
+    It is resolved on first access and reused for the rest of the request;
+    it is None for anonymous users, admins and users without a profile.
+    DRF authenticates inside the view, so read it from views rather than
+    from earlier middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request))
+        return self.get_response(request)
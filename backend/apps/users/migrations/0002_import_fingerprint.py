@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-17 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(help_text='Source CSV file', max_length=50)),
+                ('key', models.CharField(help_text='Row identifier within the CSV file', max_length=100)),
+                ('digest', models.CharField(max_length=32)),
+                ('imported_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('table', 'key')},
+            },
+        ),
+    ]
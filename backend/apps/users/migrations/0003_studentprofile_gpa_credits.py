@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_import_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='gpa_credits',
+            field=models.IntegerField(default=0, help_text='Credits counted towards the cumulative GPA'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-17 23:37
+
+import django.contrib.auth.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_studentprofile_gpa_credits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatelessUser',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('users.user',),
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped to revoke every token issued to the user so far'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:27
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Exists, F, OuterRef
+
+
+def move_imported_gpas(apps, schema_editor):
+    """Students without graded enrollments still hold the imported GPA in gpa"""
+    StudentProfile = apps.get_model('users', 'StudentProfile')
+    TermGPA = apps.get_model('academics', 'TermGPA')
+    ungraded = StudentProfile.objects.filter(~Exists(TermGPA.objects.filter(student=OuterRef('pk'))))
+    ungraded.update(imported_gpa=F('gpa'))
+    ungraded.update(gpa=Decimal('0.00'), gpa_credits=0)
+
+
+def restore_imported_gpas(apps, schema_editor):
+    StudentProfile = apps.get_model('users', 'StudentProfile')
+    StudentProfile.objects.filter(imported_gpa__isnull=False, gpa_credits=0).update(gpa=F('imported_gpa'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_user_user_created_at'),
+        ('academics', '0003_termgpa'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='imported_gpa',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='GPA from the student records import; gpa is always computed from graded enrollments', max_digits=3, null=True),
+        ),
+        migrations.RunPython(move_imported_gpas, restore_imported_gpas),
+    ]
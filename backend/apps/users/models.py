@@ -1,5 +1,10 @@
+from functools import partial
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from .tokens import forget_token_version, user_rows
 
 
 class User(AbstractUser):
@@ -11,6 +16,13 @@ class User(AbstractUser):
         ('admin', 'Admin'),
     ]
 
+    # Reverse accessor of the profile that goes with each role
+    PROFILE_RELATIONS = {
+        'student': 'student_profile',
+        'faculty': 'faculty_profile',
+        'staff': 'staff_profile',
+    }
+
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=20, blank=True)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='student')
@@ -21,12 +33,18 @@ class User(AbstractUser):
     zip_code = models.CharField(max_length=10, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    token_version = models.PositiveIntegerField(
+        default=0, help_text="Bumped to revoke every token issued to the user so far"
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='user_created_at'),
+        ]
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.email})"
@@ -43,8 +61,63 @@ class User(AbstractUser):
     def is_staff_member(self):
         return self.role == 'staff'
 
+    @property
+    def profile(self):
+        """The student, faculty or staff profile for the user's role, or None"""
+        relation = self.PROFILE_RELATIONS.get(self.role)
+        if relation is None:
+            return None
+        try:
+            # Django caches the related object (or its absence) on the instance
+            return getattr(self, relation)
+        except ObjectDoesNotExist:
+            return None
+
+    def revoke_tokens(self):
+        """Invalidate every access and refresh token issued to the user so far"""
+        User.objects.filter(pk=self.pk).update(token_version=F('token_version') + 1)
+        # Keep a later save() of this instance from writing the old version back
+        version = User.objects.filter(pk=self.pk).values_list('token_version', flat=True).first()
+        if version is not None:
+            self.token_version = version
+        transaction.on_commit(partial(forget_token_version, self.pk))
+
+
+class StatelessUser(User):
+    """
+    A user rebuilt from access-token claims without reading the user table
+    (see StatelessJWTAuthentication). Columns the token does not carry are
+    loaded together on first access, from the in-process row cache when it
+    is enabled.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred = self.get_deferred_fields()
+        if fields is None or not deferred or not set(fields) <= deferred:
+            return super().refresh_from_db(using, fields)
+        row = user_rows.get(self.pk, self.token_version)
+        if row is None:
+            row = User._base_manager.db_manager(using).filter(pk=self.pk).values(*deferred).get()
+            user_rows.set(self.pk, self.token_version, row)
+        # Unlike Model.refresh_from_db, keep the profiles built from the token
+        for attname, value in row.items():
+            setattr(self, attname, value)
 
-class StudentProfile(models.Model):
+
+class LoadDeferredTogetherMixin:
+    """Load every deferred field with one query instead of one query per field"""
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using, fields)
+
+
+class StudentProfile(LoadDeferredTogetherMixin, models.Model):
     """Extended profile for students"""
     STATUS_CHOICES = [
         ('Active', 'Active'),
@@ -67,6 +140,11 @@ class StudentProfile(models.Model):
     major = models.CharField(max_length=100)
     year_level = models.CharField(max_length=20, choices=YEAR_CHOICES)
     gpa = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+    gpa_credits = models.IntegerField(default=0, help_text="Credits counted towards the cumulative GPA")
+    imported_gpa = models.DecimalField(
+        max_digits=3, decimal_places=2, null=True, blank=True,
+        help_text="GPA from the student records import; gpa is always computed from graded enrollments"
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Active')
     emergency_contact = models.CharField(max_length=200)
     emergency_phone = models.CharField(max_length=20)
@@ -78,7 +156,7 @@ class StudentProfile(models.Model):
         return f"{self.student_id} - {self.user.get_full_name()}"
 
 
-class FacultyProfile(models.Model):
+class FacultyProfile(LoadDeferredTogetherMixin, models.Model):
     """Extended profile for faculty and professors"""
     RANK_CHOICES = [
         ('Full Professor', 'Full Professor'),
@@ -128,7 +206,7 @@ class FacultyProfile(models.Model):
         return f"{self.faculty_id} - {self.user.get_full_name()}"
 
 
-class StaffProfile(models.Model):
+class StaffProfile(LoadDeferredTogetherMixin, models.Model):
     """Extended profile for administrative staff"""
     STATUS_CHOICES = [
         ('Active', 'Active'),
@@ -152,3 +230,56 @@ class StaffProfile(models.Model):
 
     def __str__(self):
         return f"{self.staff_id} - {self.user.get_full_name()}"
+
+
+class ImportFingerprint(models.Model):
+    """Content hash of a CSV row recorded by an incremental ``import_data`` run"""
+    table = models.CharField(max_length=50, help_text="Source CSV file")
+    key = models.CharField(max_length=100, help_text="Row identifier within the CSV file")
+    digest = models.CharField(max_length=32)
+    imported_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['table', 'key']
+
+    def __str__(self):
+        return f"{self.table}:{self.key}"
+
+
+# Fields whose change invalidates the claims in issued tokens
+TOKEN_CLAIM_FIELDS = ('password', 'is_active', 'role', 'is_staff', 'is_superuser')
+
+
+def remember_token_claims(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Note whether a save changes anything issued tokens vouch for"""
+    instance._claims_changed = False
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_CLAIM_FIELDS):
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*TOKEN_CLAIM_FIELDS).first()
+    instance._claims_changed = previous is not None and any(
+        previous[field] != getattr(instance, field) for field in TOKEN_CLAIM_FIELDS
+    )
+
+
+def revoke_changed_tokens(sender, instance, created, **kwargs):
+    if getattr(instance, '_claims_changed', False):
+        instance.revoke_tokens()
+    elif not created:
+        transaction.on_commit(partial(user_rows.discard, instance.pk))
+
+
+def revoke_profile_tokens(sender, instance, created=True, **kwargs):
+    """Tokens list the user's profile ids"""
+    if created:
+        User(pk=instance.user_id).revoke_tokens()
+
+
+for model in (User, StatelessUser):
+    pre_save.connect(remember_token_claims, sender=model)
+    post_save.connect(revoke_changed_tokens, sender=model)
+
+for model in (StudentProfile, FacultyProfile, StaffProfile):
+    post_save.connect(revoke_profile_tokens, sender=model)
+    post_delete.connect(revoke_profile_tokens, sender=model)
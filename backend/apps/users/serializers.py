@@ -1,6 +1,10 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import get_user_model
 from .models import StudentProfile, FacultyProfile, StaffProfile
+from .tokens import VERSION_CLAIM, add_claims
 
 User = get_user_model()
 
@@ -22,9 +26,9 @@ class StudentProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudentProfile
         fields = ['id', 'user', 'student_id', 'enrollment_date', 'major',
-                  'year_level', 'gpa', 'status', 'emergency_contact',
+                  'year_level', 'gpa', 'imported_gpa', 'status', 'emergency_contact',
                   'emergency_phone', 'full_name']
-        read_only_fields = ['id', 'student_id']
+        read_only_fields = ['id', 'student_id', 'gpa', 'imported_gpa']
 
     def get_full_name(self, obj):
         return obj.user.get_full_name()
@@ -74,3 +78,47 @@ class UserDetailSerializer(serializers.ModelSerializer):
                   'role', 'date_of_birth', 'address', 'city', 'state', 'zip_code',
                   'student_profile', 'faculty_profile', 'staff_profile']
         read_only_fields = ['id', 'username', 'email', 'role']
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issue tokens carrying the claims StatelessJWTAuthentication reads"""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh tokens only while their version is current, re-stamping the
+    claims from the user's row. This is the one place a token is checked
+    against the database.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.select_related(*User.PROFILE_RELATIONS.values()).filter(
+            **{jwt_settings.USER_ID_FIELD: refresh.get(jwt_settings.USER_ID_CLAIM)}
+        ).first()
+        if (
+            user is None
+            or not jwt_settings.USER_AUTHENTICATION_RULE(user)
+            or refresh.get(VERSION_CLAIM, user.token_version) != user.token_version
+        ):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        add_claims(refresh, user)
+
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # The token_blacklist app is not installed
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
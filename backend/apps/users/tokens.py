@@ -0,0 +1,110 @@
+"""
+Claims and caches behind stateless JWT authentication.
+
+Access tokens carry the user's role, staff flags, profile ids and token
+version, so StatelessJWTAuthentication can rebuild the user without reading
+the user table. Bumping ``User.token_version`` revokes every token issued
+before; current versions are kept in the default cache so checking them
+needs no query either.
+"""
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+
+VERSION_CLAIM = 'ver'
+PROFILES_CLAIM = 'profiles'
+CLAIMS = ('role', 'is_staff', 'is_superuser', PROFILES_CLAIM, VERSION_CLAIM)
+
+# Cached version of users that no longer exist or are inactive
+NO_VERSION = -1
+
+
+def add_claims(token, user):
+    """Stamp ``token`` with what StatelessJWTAuthentication needs to rebuild ``user``"""
+    profiles = {}
+    for relation in user.PROFILE_RELATIONS.values():
+        try:
+            profiles[relation] = getattr(user, relation).pk
+        except ObjectDoesNotExist:
+            pass
+    token['role'] = user.role
+    token['is_staff'] = user.is_staff
+    token['is_superuser'] = user.is_superuser
+    token[PROFILES_CLAIM] = profiles
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def version_key(user_id):
+    return f'auth:token-version:{user_id}'
+
+
+def token_version(user_id):
+    """Current token version of an active user, or None"""
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = get_user_model().objects.filter(pk=user_id, is_active=True).values_list(
+            'token_version', flat=True
+        ).first()
+        if version is None:
+            version = NO_VERSION
+        cache.set(key, version, settings.JWT_TOKEN_VERSION_TIMEOUT)
+    return None if version == NO_VERSION else version
+
+
+def forget_token_version(user_id):
+    cache.delete(version_key(user_id))
+    user_rows.discard(user_id)
+
+
+class UserRowCache:
+    """
+    In-process LRU of user rows, keyed on user id and token version.
+
+    Holds the columns a token does not carry, for views that read the
+    caller's full row. Disabled unless ``JWT_USER_CACHE_SIZE`` is set.
+    Entries expire after ``JWT_USER_CACHE_TIMEOUT`` seconds since edits
+    made in other processes are not seen.
+    """
+
+    def __init__(self):
+        self.rows = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id, version):
+        if not settings.JWT_USER_CACHE_SIZE:
+            return None
+        key = (user_id, version)
+        with self.lock:
+            entry = self.rows.get(key)
+            if entry is None:
+                return None
+            row, expires = entry
+            if expires < time.monotonic():
+                del self.rows[key]
+                return None
+            self.rows.move_to_end(key)
+            return row
+
+    def set(self, user_id, version, row):
+        size = settings.JWT_USER_CACHE_SIZE
+        if not size:
+            return
+        with self.lock:
+            self.rows[(user_id, version)] = (row, time.monotonic() + settings.JWT_USER_CACHE_TIMEOUT)
+            self.rows.move_to_end((user_id, version))
+            while len(self.rows) > size:
+                self.rows.popitem(last=False)
+
+    def discard(self, user_id):
+        with self.lock:
+            for key in [key for key in self.rows if key[0] == user_id]:
+                del self.rows[key]
+
+
+user_rows = UserRowCache()
@@ -7,6 +7,7 @@ from .serializers import (
     UserSerializer, UserDetailSerializer, StudentProfileSerializer,
     FacultyProfileSerializer, StaffProfileSerializer
 )
+from apps.core.conditional import ConditionalGetMixin
 
 User = get_user_model()
 
@@ -21,11 +22,12 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return obj == request.user
 
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing user profiles"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = [StudentProfile, FacultyProfile, StaffProfile]
 
     def get_serializer_class(self):
         if self.action == 'retrieve' or self.action == 'me':
@@ -39,7 +41,7 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class StudentProfileViewSet(viewsets.ReadOnlyModelViewSet):
+class StudentProfileViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for student profiles"""
     queryset = StudentProfile.objects.select_related('user').all()
     serializer_class = StudentProfileSerializer
@@ -62,18 +64,17 @@ class StudentProfileViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            profile = StudentProfile.objects.select_related('user').get(user=request.user)
-            serializer = self.get_serializer(profile)
-            return Response(serializer.data)
-        except StudentProfile.DoesNotExist:
+        profile = request.profile
+        if not profile:
             return Response(
                 {'detail': 'Student profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = self.get_serializer(profile)
+        return Response(serializer.data)
 
 
-class FacultyProfileViewSet(viewsets.ReadOnlyModelViewSet):
+class FacultyProfileViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for faculty profiles"""
     queryset = FacultyProfile.objects.select_related('user').all()
     serializer_class = FacultyProfileSerializer
@@ -97,18 +98,17 @@ class FacultyProfileViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            profile = FacultyProfile.objects.select_related('user').get(user=request.user)
-            serializer = self.get_serializer(profile)
-            return Response(serializer.data)
-        except FacultyProfile.DoesNotExist:
+        profile = request.profile
+        if not profile:
             return Response(
                 {'detail': 'Faculty profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = self.get_serializer(profile)
+        return Response(serializer.data)
 
 
-class StaffProfileViewSet(viewsets.ReadOnlyModelViewSet):
+class StaffProfileViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for staff profiles"""
     queryset = StaffProfile.objects.select_related('user').all()
     serializer_class = StaffProfileSerializer
@@ -131,12 +131,11 @@ class StaffProfileViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            profile = StaffProfile.objects.select_related('user').get(user=request.user)
-            serializer = self.get_serializer(profile)
-            return Response(serializer.data)
-        except StaffProfile.DoesNotExist:
+        profile = request.profile
+        if not profile:
             return Response(
                 {'detail': 'Staff profile not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        serializer = self.get_serializer(profile)
+        return Response(serializer.data)
@@ -2,6 +2,7 @@
 Django settings for university portal project.
 """
 from pathlib import Path
+from urllib.parse import urlparse
 from datetime import timedelta
 from decouple import config
 import dj_database_url
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
     'drf_spectacular',
 
     # Local apps
+    'apps.core',
     'apps.users',
     'apps.academics',
     'apps.assessments',
@@ -48,6 +50,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.users.middleware.CurrentProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,6 +83,49 @@ DATABASES = {
         conn_health_checks=True,
     )
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # The registration race tests write from several connections at once,
+    # which an in-memory SQLite test database turns into "table is locked"
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+
+# Cache
+# CACHE_URL selects the backend: locmem:// (default, per process),
+# file:///var/tmp/portal-cache, or redis://host:6379/0 (requires the redis package)
+CACHE_URL = urlparse(config('CACHE_URL', default='locmem://'))
+if CACHE_URL.scheme == 'file':
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_URL.path,
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    }
+elif CACHE_URL.scheme in ('redis', 'rediss'):
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL.geturl(),
+    }
+else:
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'university-portal',
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    }
+CACHES = {'default': DEFAULT_CACHE}
+
+# Catalog endpoints (departments, courses, sections, buildings, rooms, books)
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = config('CATALOG_CACHE_TIMEOUT', default=300, cast=int)
+
+# The library type-ahead returns at most this many books, picked by rank among the first CANDIDATES matches
+LIBRARY_SEARCH_MAX_RESULTS = config('LIBRARY_SEARCH_MAX_RESULTS', default=200, cast=int)
+LIBRARY_SEARCH_CANDIDATES = config('LIBRARY_SEARCH_CANDIDATES', default=2000, cast=int)
+
+# Seconds between checks of the course suggest index against the database
+COURSE_SUGGEST_CHECK_INTERVAL = config('COURSE_SUGGEST_CHECK_INTERVAL', default=5, cast=float)
+
+# Room utilization counts these days and hours as the time a room is available
+ROOM_UTILIZATION_DAYS = config('ROOM_UTILIZATION_DAYS', default='MTWTHF')
+ROOM_UTILIZATION_DAY_START = config('ROOM_UTILIZATION_DAY_START', default='08:00')
+ROOM_UTILIZATION_DAY_END = config('ROOM_UTILIZATION_DAY_END', default='22:00')
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -116,7 +162,7 @@ CORS_ALLOW_CREDENTIALS = True
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -141,8 +187,17 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.ClaimsTokenRefreshSerializer',
 }
 
+# Seconds a user's token version is cached; revocations reach processes that
+# do not share CACHE_URL within this time
+JWT_TOKEN_VERSION_TIMEOUT = config('JWT_TOKEN_VERSION_TIMEOUT', default=60, cast=int)
+# In-process LRU of full user rows for views that read them (0 disables it)
+JWT_USER_CACHE_SIZE = config('JWT_USER_CACHE_SIZE', default=0, cast=int)
+JWT_USER_CACHE_TIMEOUT = config('JWT_USER_CACHE_TIMEOUT', default=30, cast=int)
+
 # API Documentation
 SPECTACULAR_SETTINGS = {
     'TITLE': 'University Portal API',
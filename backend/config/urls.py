@@ -22,4 +22,5 @@ urlpatterns = [
     path('api/library/', include('apps.library.urls')),
     path('api/services/', include('apps.services.urls')),
     path('api/facilities/', include('apps.facilities.urls')),
+    path('api/dashboard/', include('apps.dashboard.urls')),
 ]
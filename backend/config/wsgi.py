@@ -7,3 +7,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Build the course suggestion index before the worker takes its first request
+from apps.academics.suggest import course_index  # noqa: E402
+
+course_index.warm()
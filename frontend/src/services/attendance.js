@@ -7,8 +7,13 @@ export default {
   },
 
   // Get attendance summary
-  getMyAttendanceSummary() {
-    return apiClient.get('/attendance/records/my_summary/')
+  getMyAttendanceSummary(params) {
+    return apiClient.get('/attendance/records/my_summary/', { params })
+  },
+
+  // Faculty: Get attendance totals for a section
+  getSectionAttendanceSummary(sectionId) {
+    return apiClient.get('/attendance/records/section_summary/', { params: { section: sectionId } })
   },
 
   // Faculty: Mark attendance
@@ -16,6 +21,11 @@ export default {
     return apiClient.post('/attendance/records/', data)
   },
 
+  // Faculty: Take attendance for a whole section on one date
+  takeRollCall(sectionId, date, records) {
+    return apiClient.post('/attendance/records/bulk/', { section: sectionId, date, records })
+  },
+
   // Faculty: Update attendance
   updateAttendance(id, data) {
     return apiClient.patch(`/attendance/records/${id}/`, data)
@@ -0,0 +1,8 @@
+import apiClient from './api'
+
+export default {
+  // Get the student dashboard; params.include selects sections, e.g. 'grades,enrollments'
+  getStudentDashboard(params) {
+    return apiClient.get('/dashboard/student/', { params })
+  },
+}
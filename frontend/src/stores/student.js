@@ -4,6 +4,7 @@ import attendanceService from '@/services/attendance'
 import assessmentsService from '@/services/assessments'
 import libraryService from '@/services/library'
 import servicesService from '@/services/services'
+import dashboardService from '@/services/dashboard'
 
 export const useStudentStore = defineStore('student', {
   state: () => ({
@@ -123,15 +124,25 @@ export const useStudentStore = defineStore('student', {
     },
 
     async fetchAllData() {
-      await Promise.all([
-        this.fetchEnrollments(),
-        this.fetchGrades(),
-        this.fetchAttendance(),
-        this.fetchSubmissions(),
-        this.fetchLibraryCheckouts(),
-        this.fetchFinancialAid(),
-        this.fetchParkingPermits(),
-      ])
+      const sections = Object.keys(this.loading)
+      sections.forEach((section) => { this.loading[section] = true })
+      try {
+        // One request for every dashboard section
+        const response = await dashboardService.getStudentDashboard()
+        const data = response.data
+        this.enrollments = data.enrollments
+        this.grades = data.grades
+        this.attendance = data.attendance
+        this.attendanceSummary = data.attendance_summary
+        this.submissions = data.submissions
+        this.libraryCheckouts = data.checkouts
+        this.financialAid = data.financial_aid
+        this.parkingPermits = data.parking_permits
+      } catch (error) {
+        console.error('Failed to fetch dashboard:', error)
+      } finally {
+        sections.forEach((section) => { this.loading[section] = false })
+      }
     },
   },
 })